@@ -65,18 +65,64 @@ def ensure_commit(sha: str, *, pr_number: int, role: str) -> str:
     )
 
 
-def choose_diff_range(base_sha: str, head_sha: str) -> tuple[str, str]:
-    merge_base = subprocess.run(
-        ["git", "merge-base", base_sha, head_sha],
+def merge_base(first_sha: str, second_sha: str) -> str | None:
+    result = subprocess.run(
+        ["git", "merge-base", first_sha, second_sha],
         text=True,
         capture_output=True,
     )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
 
-    if merge_base.returncode == 0:
+def choose_diff_range(base_sha: str, head_sha: str) -> tuple[str, str]:
+    if merge_base(base_sha, head_sha) is not None:
         return f"{base_sha}...{head_sha}", "triple-dot"
     return f"{base_sha}..{head_sha}", "two-dot"
 
 
+def is_ancestor(ancestor_sha: str, sha: str) -> bool:
+    result = subprocess.run(
+        ["git", "merge-base", "--is-ancestor", ancestor_sha, sha],
+        text=True,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def choose_incremental_range(
+    since_sha: str, head_sha: str, *, base_sha: str, pr_number: int
+) -> str | None:
+    """Return the ``since..head`` range, or None when the interdiff is not usable.
+
+    A previously reviewed head that is missing or no longer an ancestor of the
+    new head (force-push, rebase) cannot produce a meaningful interdiff. Nor
+    can one whose fork point from the base differs from the new head's (the
+    base branch was merged in since): ``since..head`` would then also hold
+    the base branch's own changes.
+    """
+    try:
+        resolved_since = ensure_commit(since_sha, pr_number=pr_number, role="since")
+    except DiffExtractError as exc:
+        print(f"Warning: {exc}", file=sys.stderr)
+        return None
+
+    if not is_ancestor(resolved_since, head_sha):
+        print(
+            f"Warning: {since_sha} is not an ancestor of {head_sha} (force-push or rebase?).",
+            file=sys.stderr,
+        )
+        return None
+    if merge_base(base_sha, resolved_since) != merge_base(base_sha, head_sha):
+        print(
+            f"Warning: the merge base with {base_sha} moved since {since_sha} (base branch merged in?).",
+            file=sys.stderr,
+        )
+        return None
+    return f"{resolved_since}..{head_sha}"
+
+
 def write_diff(diff_text: str, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(diff_text, encoding="utf-8")
@@ -88,6 +134,16 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--head-sha", required=True)
     parser.add_argument("--pr-number", required=True, type=int)
     parser.add_argument("--output", required=True)
+    parser.add_argument(
+        "--since-sha",
+        default="",
+        help="Previously reviewed head SHA; extract only changes made since it when possible.",
+    )
+    parser.add_argument(
+        "--mode-output",
+        default="",
+        help="Optional file that receives the range mode used (incremental, triple-dot or two-dot).",
+    )
     return parser.parse_args()
 
 
@@ -105,10 +161,23 @@ def main() -> int:
         resolved_base = ensure_commit(base_sha, pr_number=args.pr_number, role="base")
         resolved_head = ensure_commit(head_sha, pr_number=args.pr_number, role="head")
 
-        diff_range, range_mode = choose_diff_range(resolved_base, resolved_head)
+        diff_range = None
+        since_sha = args.since_sha.strip()
+        if since_sha:
+            diff_range = choose_incremental_range(
+                since_sha, resolved_head, base_sha=resolved_base, pr_number=args.pr_number
+            )
+            if diff_range is None:
+                print("Warning: falling back to full PR diff.", file=sys.stderr)
+        if diff_range is not None:
+            range_mode = "incremental"
+        else:
+            diff_range, range_mode = choose_diff_range(resolved_base, resolved_head)
         diff = run_git(["diff", "--no-color", diff_range], check=True).stdout
 
         write_diff(diff, Path(args.output))
+        if args.mode_output:
+            write_diff(f"{range_mode}\n", Path(args.mode_output))
 
         if not diff.strip():
             print(
@@ -2,43 +2,51 @@
 
 import json
 import sys
-from core.diff.read_diff import read_diff, DiffReadError
-from core.diff.parse_diff import parse_diff
-from core.diff.filters import filter_diff_files
+from typing import Iterable, TextIO
+
+from core.diff.read_diff import open_diff_stream, DiffReadError
+from core.diff.parse_diff import iter_parse_diff
+from core.diff.filters import is_ignored_path
+from core.diff.types import DiffFile
 
 def main():
     try:
         # 1️⃣ read diff
-        raw = read_diff()
+        with open_diff_stream() as stream:
+            # 2️⃣ parse diff, skipping noisy files (lockfiles, vendor/...) unparsed
+            files = iter_parse_diff(stream, compact=True, ignore_path=is_ignored_path)
+
+            # 3️⃣ serialize to JSON, one file at a time
+            _write_json_array(files, sys.stdout)
     except DiffReadError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # 2️⃣ parse diff
-    files = parse_diff(raw)
-
-    # 3️⃣ filter noise
-    filtered_files = filter_diff_files(files)
-
-    # 4️⃣ serialize to JSON
-    output = [
-        {
-            "path": f.path,
-            "hunks": [
-                {
-                    "old_start": h.old_start,
-                    "old_length": h.old_length,
-                    "new_start": h.new_start,
-                    "new_length": h.new_length,
-                    "changes": [{"type": c.type.value, "content": c.content} for c in h.changes],
-                }
-                for h in f.hunks
-            ],
-        }
-        for f in filtered_files
-    ]
-
-    print(json.dumps(output, indent=2))
+
+def _file_to_json(f: DiffFile) -> dict:
+    return {
+        "path": f.path,
+        "hunks": [
+            {
+                "old_start": h.old_start,
+                "old_length": h.old_length,
+                "new_start": h.new_start,
+                "new_length": h.new_length,
+                "changes": [{"type": c.type.value, "content": c.content} for c in h.changes],
+            }
+            for h in f.hunks
+        ],
+    }
+
+
+def _write_json_array(files: Iterable[DiffFile], out: TextIO) -> None:
+    # Same bytes as json.dumps(list, indent=2), without holding the list.
+    first = True
+    for f in files:
+        item = json.dumps(_file_to_json(f), indent=2).replace("\n", "\n  ")
+        out.write(("[\n  " if first else ",\n  ") + item)
+        first = False
+    out.write("[]\n" if first else "\n]\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+# core/diff/compact.py
+
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Union, overload
+
+from core.diff.types import Change, ChangeType
+
+
+_CODE_TYPES = (ChangeType.ADD, ChangeType.REMOVE, ChangeType.CONTEXT)
+_TYPE_CODES = {change_type: code for code, change_type in enumerate(_CODE_TYPES)}
+
+# Offsets into the shared buffer; widened only when a hunk exceeds 4 GiB.
+_OFFSET_TYPECODE = "I"
+_WIDE_OFFSET_TYPECODE = "Q"
+_MAX_NARROW_OFFSET = 0xFFFFFFFF
+
+
+class CompactChanges(Sequence[Change]):
+    """
+    Read-only, array-backed sequence of hunk changes.
+
+    Stores one type-code byte per line plus a single content buffer shared
+    by all lines, and builds ``Change`` objects only when they are accessed.
+    Slices share the content buffer instead of copying it. A ``bytes``
+    buffer holds raw UTF-8 and is decoded one line at a time on access.
+
+    Per line this costs the content's UTF-8 size plus 5 bytes, against about
+    150 bytes of object overhead for a ``Change`` and its ``str``, so the
+    saving depends on line length: about 3x for typical 40-50 character
+    code lines and 5x or more for short ones.
+    """
+
+    __slots__ = ("_codes", "_offsets", "_content")
+
+    def __init__(self, codes: array, offsets: array, content: Union[str, bytes]) -> None:
+        if len(offsets) != len(codes) + 1:
+            raise ValueError("offsets must have exactly one more entry than codes")
+        self._codes = codes
+        self._offsets = offsets
+        self._content = content
+
+    @classmethod
+    def from_changes(cls, changes: Iterable[Change]) -> "CompactChanges":
+        builder = CompactChangesBuilder()
+        for change in changes:
+            builder.append(change.type, change.content)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @overload
+    def __getitem__(self, index: int) -> Change: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Change]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Change, Sequence[Change]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._codes))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            return CompactChanges(
+                self._codes[start:stop],
+                self._offsets[start : stop + 1],
+                self._content,
+            )
+
+        size = len(self._codes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("change index out of range")
+        return Change(
+            _CODE_TYPES[self._codes[index]],
+            _as_text(self._content[self._offsets[index] : self._offsets[index + 1]]),
+        )
+
+    def __iter__(self) -> Iterator[Change]:
+        content = self._content
+        offsets = self._offsets
+        for idx, code in enumerate(self._codes):
+            yield Change(_CODE_TYPES[code], _as_text(content[offsets[idx] : offsets[idx + 1]]))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CompactChanges, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompactChanges({list(self)!r})"
+
+
+class CompactChangesBuilder:
+    """
+    Accumulates hunk lines for a ``CompactChanges`` without creating
+    per-line ``Change`` objects.
+
+    Text lines are stored as UTF-8: a ``str`` buffer would be widened to 2
+    or 4 bytes per character by a single non-ASCII line in the hunk.
+    """
+
+    __slots__ = ("_codes", "_offsets", "_parts", "_size")
+
+    def __init__(self) -> None:
+        self._codes = array("B")
+        self._offsets = array(_OFFSET_TYPECODE, [0])
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def append(self, change_type: ChangeType, content: Union[str, bytes]) -> None:
+        if isinstance(content, str):
+            content = content.encode("utf-8", "surrogatepass")
+        self._size += len(content)
+        if self._size > _MAX_NARROW_OFFSET and self._offsets.typecode != _WIDE_OFFSET_TYPECODE:
+            self._offsets = array(_WIDE_OFFSET_TYPECODE, self._offsets)
+        self._codes.append(_TYPE_CODES[change_type])
+        self._offsets.append(self._size)
+        self._parts.append(content)
+
+    def build(self) -> CompactChanges:
+        return CompactChanges(self._codes, self._offsets, b"".join(self._parts))
+
+
+def _as_text(content: Union[str, bytes]) -> str:
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    return content
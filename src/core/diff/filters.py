@@ -1,7 +1,9 @@
 # core/diff/filters.py
 
 import fnmatch
-from typing import List
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from core.diff.types import DiffFile
 
@@ -18,23 +20,187 @@ IGNORE_PATTERNS = [
     "*.min.css",
 ]
 
+# .gitattributes entries that mark a path as not worth reviewing.
+GITATTRIBUTES_IGNORE_ATTRIBUTES = {
+    "linguist-generated",
+    "linguist-generated=true",
+    "-diff",
+    "binary",
+}
 
-def filter_diff_files(files: List[DiffFile]) -> List[DiffFile]:
+_DIRECTORY_SUFFIXES = ("/**", "/*", "/")
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_TRIE_END = ""
+
+
+def _directory_prefix(pattern: str) -> Optional[str]:
+    for suffix in _DIRECTORY_SUFFIXES:
+        if pattern.endswith(suffix):
+            directory = pattern[: -len(suffix)].strip("/")
+            if directory and not _GLOB_CHARS.search(directory):
+                return directory
+            return None
+    return None
+
+
+class PathMatcher:
+    """
+    Compiled, reusable matcher for ignore patterns.
+
+    Directory patterns such as ``vendor/*`` or ``build/`` are stored in a
+    prefix trie keyed by path segment; all other patterns are ``fnmatch``
+    globs folded into one combined regex. Each path is therefore checked
+    with one trie walk and at most one regex match, however many patterns
+    there are.
+    """
+
+    __slots__ = ("patterns", "_directory_trie", "_glob_regex")
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(pattern for pattern in patterns if pattern)
+        self._directory_trie: Dict[str, dict] = {}
+        globs: List[str] = []
+
+        for pattern in self.patterns:
+            directory = _directory_prefix(pattern)
+            if directory is None:
+                # A trailing slash still means "everything below", e.g. "*/generated/".
+                globs.append(pattern + "*" if pattern.endswith("/") else pattern)
+                continue
+            node = self._directory_trie
+            for segment in directory.split("/"):
+                node = node.setdefault(segment, {})
+            node[_TRIE_END] = {}
+
+        self._glob_regex = (
+            re.compile("|".join(fnmatch.translate(glob) for glob in globs)) if globs else None
+        )
+
+    def __call__(self, path: str) -> bool:
+        return self.matches(path)
+
+    def matches(self, path: str) -> bool:
+        """
+        Return True if ``path`` matches any pattern.
+        """
+        if self._directory_trie:
+            node = self._directory_trie
+            segments = path.split("/")
+            # The last segment is the file name; a directory must contain it.
+            for segment in segments[:-1]:
+                node = node.get(segment)
+                if node is None:
+                    break
+                if _TRIE_END in node:
+                    return True
+
+        return self._glob_regex is not None and self._glob_regex.match(path) is not None
+
+    def classify(self, paths: Iterable[str]) -> List[bool]:
+        """
+        Return one ignore decision per path, in input order.
+        """
+        matches = self.matches
+        return [matches(path) for path in paths]
+
+    @classmethod
+    def from_gitattributes(
+        cls,
+        text: str,
+        *,
+        base_patterns: Sequence[str] = IGNORE_PATTERNS,
+    ) -> "PathMatcher":
+        """
+        Build a matcher from ``base_patterns`` plus generated/no-diff
+        entries of a ``.gitattributes`` file.
+        """
+        return cls([*base_patterns, *parse_gitattributes(text)])
+
+
+DEFAULT_PATH_MATCHER = PathMatcher(IGNORE_PATTERNS)
+
+PathPredicate = Callable[[str], bool]
+
+
+def filter_diff_files(
+    files: Iterable[DiffFile],
+    ignore_path: Optional[PathPredicate] = None,
+) -> List[DiffFile]:
     """
     Remove files matching ignore patterns.
     """
-    filtered = []
+    return list(iter_filter_diff_files(files, ignore_path))
 
+
+def iter_filter_diff_files(
+    files: Iterable[DiffFile],
+    ignore_path: Optional[PathPredicate] = None,
+) -> Iterator[DiffFile]:
+    """
+    Lazily remove files matching ignore patterns from a stream of files.
+    """
+    ignore_path = ignore_path or is_ignored_path
     for file in files:
-        if _should_ignore(file.path):
+        if ignore_path(file.path):
+            continue
+        yield file
+
+
+def is_ignored_path(path: str) -> bool:
+    """
+    Return True if a file path matches one of the default ignore patterns.
+    """
+    return DEFAULT_PATH_MATCHER.matches(path)
+
+
+@lru_cache(maxsize=32)
+def _cached_path_matcher(patterns: tuple) -> PathMatcher:
+    return PathMatcher(patterns)
+
+
+def get_path_matcher(patterns: Sequence[str]) -> PathMatcher:
+    """
+    Return a compiled matcher for ``patterns``, reusing earlier compilations
+    of the same pattern list within the process.
+    """
+    return _cached_path_matcher(tuple(patterns))
+
+
+def parse_gitattributes(text: str) -> List[str]:
+    """
+    Extract ignore patterns from ``.gitattributes`` content.
+
+    Lines whose attributes include ``linguist-generated``, ``-diff`` or
+    ``binary`` are translated into patterns understood by ``PathMatcher``.
+    """
+    patterns: List[str] = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        pattern, *attributes = line.split()
+        if not GITATTRIBUTES_IGNORE_ATTRIBUTES.intersection(attributes):
             continue
-        filtered.append(file)
+        patterns.extend(_gitattributes_globs(pattern))
+    return patterns
 
-    return filtered
 
+def _gitattributes_globs(pattern: str) -> List[str]:
+    # gitattributes anchors patterns that contain a slash; bare names match at any depth.
+    if pattern.startswith("**/"):
+        pattern = pattern[3:]
+        anchored = False
+    else:
+        anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.lstrip("/")
+    if pattern.endswith("/**"):
+        pattern = pattern[:-1]
 
-def _should_ignore(path: str) -> bool:
-    for pattern in IGNORE_PATTERNS:
-        if fnmatch.fnmatch(path, pattern) or path.startswith(pattern.rstrip("/*")):
-            return True
-    return False
+    variants = [pattern]
+    if "/**/" in pattern:
+        # fnmatch '*' already spans '/', so only the zero-directory form is missing.
+        variants.append(pattern.replace("/**/", "/", 1))
+        variants[0] = pattern.replace("/**/", "/*/", 1)
+    if not anchored:
+        variants.extend(f"*/{variant}" for variant in list(variants))
+    return variants
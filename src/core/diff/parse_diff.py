@@ -1,8 +1,10 @@
 # core/diff/parse_diff.py
 
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Union
 
+from core.diff.compact import CompactChangesBuilder
+from core.diff.filters import PathPredicate
 from core.diff.types import DiffFile, DiffHunk, Change, ChangeType
 
 
@@ -11,35 +13,101 @@ HUNK_HEADER = re.compile(
     r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@"
 )
 
-
-def parse_diff(raw_diff: str) -> List[DiffFile]:
-    if not raw_diff.strip():
+LINE_PREFIXES = {
+    "+": ChangeType.ADD,
+    "-": ChangeType.REMOVE,
+    " ": ChangeType.CONTEXT,
+}
+BYTE_LINE_PREFIXES = {prefix.encode("ascii"): change_type for prefix, change_type in LINE_PREFIXES.items()}
+FILE_HEADER_PREFIX = "diff --git "
+BYTE_FILE_HEADER_PREFIX = FILE_HEADER_PREFIX.encode("ascii")
+BYTE_HEADER_PREFIXES = (BYTE_FILE_HEADER_PREFIX, b"@@ ")
+
+DiffLine = Union[str, bytes]
+
+
+def parse_diff(
+    raw_diff: str,
+    *,
+    compact: bool = False,
+    ignore_path: Optional[PathPredicate] = None,
+) -> List[DiffFile]:
+    if not raw_diff or raw_diff.isspace():
         return []
 
-    files: List[DiffFile] = []
+    return list(iter_parse_diff(_iter_text_lines(raw_diff), compact=compact, ignore_path=ignore_path))
+
+
+def iter_parse_diff(
+    stream: Iterable[DiffLine],
+    *,
+    compact: bool = False,
+    ignore_path: Optional[PathPredicate] = None,
+) -> Iterator[DiffFile]:
+    """
+    Parse a unified diff line by line, yielding each file once it is complete.
+
+    ``stream`` may be a text or binary file object, or any iterable of
+    lines. Only the file currently being parsed is held in memory, so peak
+    memory is bounded by the largest single file in the diff.
+
+    With ``compact=True`` each hunk stores its lines in a ``CompactChanges``
+    sequence instead of one ``Change`` object per line. Binary lines are
+    then kept as bytes and only decoded when a change is accessed; other
+    lines are decoded only if they may be a file or hunk header.
+
+    Files whose path matches ``ignore_path`` (e.g.
+    ``core.diff.filters.is_ignored_path``) are skipped up to the next
+    ``diff --git`` header without building hunks; by default every file is
+    kept.
+    """
     current_file = None
     current_hunks: List[DiffHunk] = []
 
-    current_hunk_lines = []
+    current_hunk_lines = _new_hunk_lines(compact)
     hunk_meta = None
+    skipping = False
+
+    for raw_line in stream:
+        if skipping:
+            header_prefix = FILE_HEADER_PREFIX if isinstance(raw_line, str) else BYTE_FILE_HEADER_PREFIX
+            if not raw_line.startswith(header_prefix):
+                continue
+
+        line = _strip_line_ending(raw_line)
+        is_bytes = isinstance(line, bytes)
+
+        if hunk_meta:
+            change_type = (BYTE_LINE_PREFIXES if is_bytes else LINE_PREFIXES).get(line[:1])
+            if change_type is not None:
+                if compact:
+                    current_hunk_lines.append(change_type, line[1:])
+                else:
+                    current_hunk_lines.append(Change(change_type, _decode(line[1:])))
+                continue
+
+        if is_bytes:
+            if not line.startswith(BYTE_HEADER_PREFIXES):
+                continue
+            line = _decode(line)
 
-    for line in raw_diff.splitlines():
         file_match = DIFF_FILE_HEADER.match(line)
         if file_match:
             if current_file:
                 if hunk_meta and current_hunk_lines:
                     current_hunks.append(_build_hunk(hunk_meta, current_hunk_lines))
-                files.append(
-                    DiffFile(
-                        path=current_file,
-                        hunks=current_hunks,
-                    )
+                yield DiffFile(
+                    path=current_file,
+                    hunks=current_hunks,
                 )
 
             current_file = file_match.group(2)
             current_hunks = []
-            current_hunk_lines = []
+            current_hunk_lines = _new_hunk_lines(compact)
             hunk_meta = None
+            skipping = ignore_path is not None and ignore_path(current_file)
+            if skipping:
+                current_file = None
             continue
 
         hunk_match = HUNK_HEADER.match(line)
@@ -53,38 +121,56 @@ def parse_diff(raw_diff: str) -> List[DiffFile]:
                 int(hunk_match.group(3)),
                 int(hunk_match.group(4) or 1),
             )
-            current_hunk_lines = []
+            current_hunk_lines = _new_hunk_lines(compact)
             continue
 
-        if hunk_meta:
-            if line.startswith("+"):
-                current_hunk_lines.append(
-                    Change(ChangeType.ADD, line[1:])
-                )
-            elif line.startswith("-"):
-                current_hunk_lines.append(
-                    Change(ChangeType.REMOVE, line[1:])
-                )
-            elif line.startswith(" "):
-                current_hunk_lines.append(
-                    Change(ChangeType.CONTEXT, line[1:])
-                )
-
     if current_file:
         if hunk_meta and current_hunk_lines:
             current_hunks.append(_build_hunk(hunk_meta, current_hunk_lines))
-        files.append(
-            DiffFile(
-                path=current_file,
-                hunks=current_hunks,
-            )
+        yield DiffFile(
+            path=current_file,
+            hunks=current_hunks,
         )
 
-    return files
+
+def _iter_text_lines(text: str) -> Iterator[str]:
+    # Slices one line at a time; splitlines() or StringIO would copy the whole diff.
+    start = 0
+    size = len(text)
+    while start < size:
+        end = text.find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _strip_line_ending(raw_line: DiffLine) -> DiffLine:
+    if isinstance(raw_line, bytearray):
+        raw_line = bytes(raw_line)
+    newline, carriage = ("\n", "\r") if isinstance(raw_line, str) else (b"\n", b"\r")
+    if raw_line.endswith(newline):
+        raw_line = raw_line[:-1]
+    if raw_line.endswith(carriage):
+        raw_line = raw_line[:-1]
+    return raw_line
+
+
+def _decode(line: DiffLine) -> str:
+    if isinstance(line, bytes):
+        return line.decode("utf-8", errors="replace")
+    return line
+
+
+def _new_hunk_lines(compact: bool):
+    return CompactChangesBuilder() if compact else []
 
 
 def _build_hunk(meta, changes):
     old_start, old_len, new_start, new_len = meta
+    if isinstance(changes, CompactChangesBuilder):
+        changes = changes.build()
     return DiffHunk(
         old_start=old_start,
         old_length=old_len,
@@ -1,7 +1,12 @@
 # core/diff/read_diff.py
 
+import mmap
+import os
 import sys
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO
+
+_UTF8_BOM = b"\xef\xbb\xbf"
 
 
 class DiffReadError(Exception):
@@ -48,3 +53,72 @@ def read_diff(
     raise DiffReadError(
         "No diff input provided. Use from_string, from_file, or pipe via stdin."
     )
+
+
+@contextmanager
+def open_diff_stream(*, from_file: Optional[str] = None) -> Iterator[TextIO]:
+    """
+    Open a raw git diff for line-by-line reading.
+
+    Unlike ``read_diff``, the diff is never loaded into one string; pair
+    this with ``iter_parse_diff`` to keep memory bounded on large diffs.
+
+    Priority:
+    1. from_file
+    2. stdin
+
+    Raises:
+        DiffReadError if no input is available or the file cannot be opened.
+    """
+
+    if from_file is not None:
+        try:
+            stream = open(from_file, "r", encoding="utf-8")
+        except OSError as e:
+            raise DiffReadError(f"Failed to read diff file: {e}") from e
+        with stream:
+            yield stream
+        return
+
+    if sys.stdin.isatty():
+        raise DiffReadError(
+            "No diff input provided. Use from_file or pipe via stdin."
+        )
+    yield sys.stdin
+
+
+@contextmanager
+def map_diff_file(from_file: str) -> Iterator[Iterator[bytes]]:
+    """
+    Memory-map a diff file and yield an iterator over its raw byte lines.
+
+    The file is never read into one string or decoded up front; each line
+    is sliced from the mapping on demand, and ``iter_parse_diff`` only
+    decodes what it keeps. A leading UTF-8 byte order mark is skipped.
+
+    Raises:
+        DiffReadError if the file cannot be opened or mapped.
+    """
+
+    try:
+        f = open(from_file, "rb")
+    except OSError as e:
+        raise DiffReadError(f"Failed to read diff file: {e}") from e
+
+    with f:
+        try:
+            # mmap rejects empty files, and an empty diff has no lines anyway.
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+        except (OSError, ValueError) as e:
+            raise DiffReadError(f"Failed to map diff file: {e}") from e
+
+        if mapped is None:
+            yield iter(())
+            return
+
+        try:
+            if mapped[:len(_UTF8_BOM)] == _UTF8_BOM:
+                mapped.seek(len(_UTF8_BOM))
+            yield iter(mapped.readline, b"")
+        finally:
+            mapped.close()
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 
 class ChangeType(str, Enum):
@@ -24,12 +24,15 @@ class Change:
 class DiffHunk:
     """
     A contiguous block of changes in a file.
+
+    ``changes`` is a list of ``Change`` objects, or a ``CompactChanges``
+    sequence when the diff was parsed with ``compact=True``.
     """
     old_start: int
     old_length: int
     new_start: int
     new_length: int
-    changes: List[Change]
+    changes: Sequence[Change]
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,170 @@
+"""Process-wide registry of lazily constructed, cached model adapters."""
+
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from core.review.model_adapter import ModelAdapter
+
+# A factory returns None when its adapter is not configured in this process.
+AdapterFactory = Callable[[], Optional[ModelAdapter]]
+
+
+class AdapterRegistry:
+    """Adapter factories by name, with the first successful instance cached.
+
+    An adapter is only built when it is requested, and then reused so SDK
+    clients and their connection pools stay warm across reviews. Factories
+    that report "not configured" are retried on the next lookup, so setting
+    the env later still works; a cached instance is kept until
+    ``invalidate`` is called. ``available`` skips factories that raise
+    ``ValueError`` (misconfigured) so listing adapters never fails.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, AdapterFactory] = {}
+        self._instances: Dict[str, ModelAdapter] = {}
+        # Names whose factory is running; a wrapper factory's failed lookup lists
+        # available adapters, which must not call that factory again.
+        self._building: Set[str] = set()
+        # Re-entrant so wrapper factories can look up the adapters they wrap.
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: AdapterFactory) -> None:
+        """Add or replace the factory for ``name`` and drop its cached instance."""
+
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> ModelAdapter:
+        with self._lock:
+            adapter = self._instances.get(name)
+            if adapter is not None:
+                return adapter
+
+            factory = self._factories.get(name)
+            adapter = self._build(name, factory) if factory is not None else None
+            if adapter is None:
+                known = ", ".join(self.available())
+                raise ValueError(f"Unknown adapter '{name}'. Known adapters: {known}")
+            self._instances[name] = adapter
+            return adapter
+
+    def available(self) -> List[str]:
+        """Return sorted names of adapters that are configured in this process."""
+
+        with self._lock:
+            names = []
+            for name, factory in list(self._factories.items()):
+                if name not in self._instances:
+                    if name in self._building:
+                        continue
+                    try:
+                        adapter = self._build(name, factory)
+                    except ValueError:
+                        continue
+                    if adapter is None:
+                        continue
+                    self._instances[name] = adapter
+                names.append(name)
+            return sorted(names)
+
+    def _build(self, name: str, factory: AdapterFactory) -> Optional[ModelAdapter]:
+        self._building.add(name)
+        try:
+            return factory()
+        finally:
+            self._building.discard(name)
+
+    def cached(self) -> Dict[str, ModelAdapter]:
+        """Return the adapters built so far, without constructing any."""
+
+        with self._lock:
+            return dict(self._instances)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop cached instances (all, or only ``name``) so they are rebuilt from config."""
+
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+def _fake_factory() -> Optional[ModelAdapter]:
+    from core.review.adapters.fake import FakeModelAdapter
+
+    return FakeModelAdapter()
+
+
+def _with_resilience(adapter: ModelAdapter, env_prefix: str) -> ModelAdapter:
+    from core.review.adapters.circuit_breaker import with_circuit_breaker
+    from core.review.adapters.rate_limit import with_rate_limit
+    from core.review.adapters.retry import with_retry
+
+    # Retries sit outside the limiter so every attempt is counted against the limits;
+    # the breaker is outermost so an open circuit skips retries and waiting alike.
+    return with_circuit_breaker(with_retry(with_rate_limit(adapter, env_prefix), env_prefix), env_prefix)
+
+
+def _openai_factory() -> Optional[ModelAdapter]:
+    from core.review.adapters.openai_adapter import AdapterConfigError, OpenAIModelAdapter
+
+    try:
+        adapter = OpenAIModelAdapter.from_env()
+    except AdapterConfigError:
+        # OpenAI adapter is optional in local/test runs.
+        return None
+    return _with_resilience(adapter, "OPENAI")
+
+
+def _openai_compat_factory() -> Optional[ModelAdapter]:
+    from core.review.adapters.openai_compat_adapter import AdapterConfigError, OpenAICompatModelAdapter
+
+    try:
+        adapter = OpenAICompatModelAdapter.from_env()
+    except AdapterConfigError:
+        # OpenAI-compatible adapter is optional in local/test runs.
+        return None
+    return _with_resilience(adapter, "OPENAI_COMPAT")
+
+
+def _ollama_factory() -> Optional[ModelAdapter]:
+    from core.review.adapters.ollama_adapter import AdapterConfigError, OllamaModelAdapter
+
+    try:
+        adapter = OllamaModelAdapter.from_env()
+    except AdapterConfigError:
+        # Ollama adapter is optional in local/test runs.
+        return None
+    return _with_resilience(adapter, "OLLAMA")
+
+
+def _hedged_factory() -> Optional[ModelAdapter]:
+    from core.review.adapters.hedged import HedgedModelAdapter
+
+    # Not configured unless HEDGE_PRIMARY_ADAPTER and HEDGE_SECONDARY_ADAPTER name two adapters.
+    return HedgedModelAdapter.from_env(get_adapter)
+
+
+ADAPTER_REGISTRY = AdapterRegistry()
+ADAPTER_REGISTRY.register("fake", _fake_factory)
+ADAPTER_REGISTRY.register("openai", _openai_factory)
+ADAPTER_REGISTRY.register("openai-compat", _openai_compat_factory)
+ADAPTER_REGISTRY.register("ollama", _ollama_factory)
+ADAPTER_REGISTRY.register("hedged", _hedged_factory)
+
+
+def register_adapter(name: str, factory: AdapterFactory) -> None:
+    ADAPTER_REGISTRY.register(name, factory)
+
+
+def get_adapter(name: str) -> ModelAdapter:
+    return ADAPTER_REGISTRY.get(name)
+
+
+def invalidate_adapters(name: Optional[str] = None) -> None:
+    """Forget cached adapters after their env configuration changed."""
+
+    ADAPTER_REGISTRY.invalidate(name)
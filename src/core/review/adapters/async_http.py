@@ -0,0 +1,172 @@
+"""Minimal asyncio HTTP/1.1 client for JSON adapter requests.
+
+Each request opens its own connection and sends ``Connection: close``: the
+keep-alive pool in ``http_pool`` is thread-based, and asyncio streams are
+bound to the event loop that opened them, so there is nothing safe to share
+between reviews run with separate ``asyncio.run`` calls.
+
+Connections are always direct: unlike ``http_pool`` this client does not
+honour ``https_proxy``/``http_proxy``, so reviews that must go through a
+proxy should use the synchronous entry points.
+"""
+
+import asyncio
+import json
+import ssl
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Tuple
+from urllib.parse import urlsplit
+
+from core.review.adapters.http_pool import check_status
+
+_MAX_HEADER_BYTES = 64 * 1024
+
+
+class _Response:
+    """Status, headers and body reader of one HTTP response."""
+
+    def __init__(
+        self,
+        status: int,
+        headers: Dict[str, str],
+        reader: asyncio.StreamReader,
+        timeout: float,
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self._reader = reader
+        self._timeout = timeout
+
+    async def iter_body(self) -> AsyncIterator[bytes]:
+        """Yield decoded body bytes as they arrive (chunked or length-delimited)."""
+
+        if "chunked" in self.headers.get("transfer-encoding", "").lower():
+            while True:
+                size_line = await self._read(self._reader.readline())
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailer section ends with an empty line.
+                    while (await self._read(self._reader.readline())).strip():
+                        pass
+                    return
+                data = await self._read(self._reader.readexactly(size))
+                await self._read(self._reader.readexactly(2))
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                data = await self._read(self._reader.read(min(remaining, 65536)))
+                if not data:
+                    raise ConnectionError("Connection closed before the response body was complete.")
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await self._read(self._reader.read(65536))
+                if not data:
+                    return
+                yield data
+
+    async def read(self) -> bytes:
+        return b"".join([data async for data in self.iter_body()])
+
+    async def _read(self, awaitable: Any) -> Any:
+        return await asyncio.wait_for(awaitable, self._timeout)
+
+
+@asynccontextmanager
+async def _open_request(url: str, payload: Dict[str, Any], *, timeout: float) -> AsyncIterator[_Response]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme '{scheme}'.")
+    if not parts.hostname:
+        raise ValueError(f"URL has no host: '{url}'")
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    body = json.dumps(payload).encode("utf-8")
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            parts.hostname,
+            port,
+            ssl=ssl.create_default_context() if scheme == "https" else None,
+            limit=_MAX_HEADER_BYTES,
+        ),
+        timeout,
+    )
+    try:
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        writer.write(
+            (
+                f"POST {target} HTTP/1.1\r\n"
+                f"Host: {host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await asyncio.wait_for(writer.drain(), timeout)
+        status, headers = await asyncio.wait_for(_read_head(reader), timeout)
+        yield _Response(status, headers, reader, timeout)
+    finally:
+        # Closing mid-body is how a streamed generation is cancelled.
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, ssl.SSLError):
+            pass
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    status_line = (await reader.readline()).decode("latin-1").strip()
+    fields = status_line.split(" ", 2)
+    if len(fields) < 2 or not fields[0].startswith("HTTP/") or not fields[1].isdigit():
+        raise ConnectionError(f"Malformed HTTP status line: {status_line!r}")
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if not line.strip():
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(fields[1]), headers
+
+
+async def apost_json(url: str, payload: Dict[str, Any], *, timeout: float) -> Any:
+    """Async counterpart of ``http_pool.post_json``."""
+
+    async with _open_request(url, payload, timeout=timeout) as response:
+        body = await response.read()
+    check_status(url, response.status, body, response.headers)
+    return json.loads(body.decode("utf-8", errors="replace"))
+
+
+@asynccontextmanager
+async def astream_json_lines(
+    url: str,
+    payload: Dict[str, Any],
+    *,
+    timeout: float,
+) -> AsyncIterator[AsyncIterator[Any]]:
+    """Async counterpart of ``http_pool.stream_json_lines``."""
+
+    async with _open_request(url, payload, timeout=timeout) as response:
+        if not 200 <= response.status < 300:
+            check_status(url, response.status, await response.read(), response.headers)
+        yield _aiter_json_lines(response)
+
+
+async def _aiter_json_lines(response: _Response) -> AsyncIterator[Any]:
+    pending = b""
+    async for data in response.iter_body():
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line.decode("utf-8", errors="replace"))
+    if pending.strip():
+        yield json.loads(pending.decode("utf-8", errors="replace"))
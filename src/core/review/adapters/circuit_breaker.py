@@ -0,0 +1,206 @@
+"""Per-adapter circuit breaker so a dead endpoint fails fast.
+
+After ``failure_threshold`` consecutive transient failures (timeouts,
+connection errors, 5xx) the circuit opens and calls fail immediately with
+``CircuitOpenError`` instead of each waiting out the adapter timeout. After
+``cooldown_seconds`` one probe call is let through (half-open): success
+closes the circuit, failure opens it for another cool-down.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from core.review.adapters.errors import is_transient_error
+from core.review.model_adapter import ModelAdapter, agenerate
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 30.0
+FAILURE_THRESHOLD_ENV_SUFFIX = "_CIRCUIT_FAILURE_THRESHOLD"
+COOLDOWN_ENV_SUFFIX = "_CIRCUIT_COOLDOWN_SECONDS"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an adapter whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open state machine shared by every call to one adapter."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be > 0")
+        if cooldown_seconds <= 0:
+            raise ValueError("cooldown_seconds must be > 0")
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self, name: str = "adapter") -> None:
+        """Let a call through, or raise ``CircuitOpenError`` while the circuit is open."""
+
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.rejected += 1
+            failures = self.consecutive_failures
+            retry_in = max(0.0, self._opened_at + self.cooldown_seconds - self._clock())
+        raise CircuitOpenError(
+            f"Adapter '{name}' circuit is open after {failures} consecutive failures; "
+            f"failing fast (next probe in {retry_in:.0f}s)."
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._probe_in_flight = False
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            probe_failed = self._probe_in_flight
+            self._probe_in_flight = False
+            tripped = self._state == CLOSED and self.consecutive_failures >= self.failure_threshold
+            if probe_failed or tripped:
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.times_opened += 1
+
+    def record_abort(self) -> None:
+        """Forget an interrupted call (e.g. a cancelled hedge) without judging the endpoint."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "failure_threshold": self.failure_threshold,
+                "cooldown_seconds": self.cooldown_seconds,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+        return self._state
+
+
+class CircuitBreakerModelAdapter:
+    """Adapter wrapper that routes every call through a ``CircuitBreaker``.
+
+    Only transient failures count against the circuit; an endpoint that
+    answers with a permanent error (bad request, empty output) is alive.
+    Other attributes are read from the wrapped adapter.
+    """
+
+    metrics_key = "circuit"
+
+    def __init__(self, inner: ModelAdapter, breaker: CircuitBreaker) -> None:
+        self.inner = inner
+        self.breaker = breaker
+        self.name = inner.name
+
+    def __getattr__(self, item: str) -> Any:
+        if item == "inner":
+            raise AttributeError(item)
+        return getattr(self.inner, item)
+
+    def generate_review(self, prompt: str) -> str:
+        self.breaker.before_call(self.name)
+        try:
+            output = self.inner.generate_review(prompt)
+        except Exception as exc:
+            self._record_error(exc)
+            raise
+        except BaseException:
+            self.breaker.record_abort()
+            raise
+        self.breaker.record_success()
+        return output
+
+    async def agenerate_review(self, prompt: str) -> str:
+        self.breaker.before_call(self.name)
+        try:
+            output = await agenerate(self.inner, prompt)
+        except Exception as exc:
+            self._record_error(exc)
+            raise
+        except BaseException:
+            # asyncio.CancelledError: the caller gave up, the endpoint did not fail.
+            self.breaker.record_abort()
+            raise
+        self.breaker.record_success()
+        return output
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.breaker.snapshot()
+
+    def _record_error(self, exc: Exception) -> None:
+        if is_transient_error(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+
+def with_circuit_breaker(adapter: ModelAdapter, env_prefix: str) -> ModelAdapter:
+    """Wrap ``adapter`` in a breaker from ``<env_prefix>_CIRCUIT_*`` env (threshold ``0`` disables it)."""
+
+    threshold_env = env_prefix + FAILURE_THRESHOLD_ENV_SUFFIX
+    cooldown_env = env_prefix + COOLDOWN_ENV_SUFFIX
+    threshold_raw = os.getenv(threshold_env, "").strip()
+    cooldown_raw = os.getenv(cooldown_env, "").strip()
+
+    failure_threshold = DEFAULT_FAILURE_THRESHOLD
+    if threshold_raw:
+        try:
+            failure_threshold = int(threshold_raw)
+        except ValueError as exc:
+            raise ValueError(f"{threshold_env} must be an integer.") from exc
+        if failure_threshold < 0:
+            raise ValueError(f"{threshold_env} must be >= 0.")
+    if failure_threshold == 0:
+        return adapter
+
+    cooldown_seconds = DEFAULT_COOLDOWN_SECONDS
+    if cooldown_raw:
+        try:
+            cooldown_seconds = float(cooldown_raw)
+        except ValueError as exc:
+            raise ValueError(f"{cooldown_env} must be a number.") from exc
+        if cooldown_seconds <= 0:
+            raise ValueError(f"{cooldown_env} must be > 0.")
+
+    breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown_seconds=cooldown_seconds)
+    return CircuitBreakerModelAdapter(adapter, breaker)
@@ -0,0 +1,105 @@
+"""Classify adapter failures by the provider errors they were raised from.
+
+Adapters wrap SDK and HTTP errors in their own ``AdapterRuntimeError``
+(``raise ... from exc``), so these helpers walk the cause chain.
+"""
+
+import email.utils
+import http.client
+import re
+import time
+import urllib.error
+from typing import Iterator, Optional
+
+# Statuses worth retrying: request timeout, rate limit and gateway/server hiccups.
+TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Provider wording for prompts that exceed the model context (OpenAI, Ollama, vLLM, ...).
+_CONTEXT_LENGTH_PATTERN = re.compile(
+    r"context[ _-]?(?:length|window|size|overflow)|maximum context|too many tokens|prompt is too long"
+    r"|input is too long|token limit|exceeds? (?:the )?max(?:imum)? (?:number of )?(?:input )?tokens",
+    re.IGNORECASE,
+)
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """Return the HTTP status carried by ``exc`` or the exceptions it was raised from."""
+
+    for item in exception_chain(exc):
+        for attr in ("status_code", "status", "code"):
+            value = getattr(item, attr, None)
+            if isinstance(value, int) and not isinstance(value, bool) and 100 <= value <= 599:
+                return value
+    return None
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    if error_status(exc) == 429:
+        return True
+    return any("ratelimit" in type(item).__name__.lower() for item in exception_chain(exc))
+
+
+def is_context_length_error(exc: BaseException) -> bool:
+    """Return True when ``exc`` says the prompt did not fit the model context."""
+
+    if error_status(exc) == 413:
+        return True
+    return any(_CONTEXT_LENGTH_PATTERN.search(str(item)) for item in exception_chain(exc))
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures a later identical request may not hit (timeouts, 5xx, 429)."""
+
+    status = error_status(exc)
+    if status is not None:
+        return status in TRANSIENT_STATUSES
+    for item in exception_chain(exc):
+        if isinstance(item, (TimeoutError, ConnectionError, http.client.HTTPException)):
+            return True
+        if isinstance(item, urllib.error.URLError) and not isinstance(item, urllib.error.HTTPError):
+            return True
+        # SDK and asyncio errors such as openai.APITimeoutError, APIConnectionError,
+        # RateLimitError or asyncio.IncompleteReadError.
+        name = type(item).__name__.lower()
+        if any(word in name for word in ("timeout", "connection", "ratelimit", "incompleteread")):
+            return True
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Return the server's ``Retry-After`` (seconds or HTTP date) from ``exc``'s response headers."""
+
+    for item in exception_chain(exc):
+        headers = getattr(item, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(item, "response", None), "headers", None)
+        if headers is None:
+            continue
+        raw_ms = headers.get("retry-after-ms")
+        if raw_ms:
+            try:
+                return max(0.0, float(raw_ms) / 1000.0)
+            except ValueError:
+                pass
+        raw = headers.get("retry-after")
+        if not raw:
+            continue
+        try:
+            return max(0.0, float(raw))
+        except ValueError:
+            pass
+        try:
+            when = email.utils.parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            continue
+        return max(0.0, when.timestamp() - time.time())
+    return None
+
+
+def exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
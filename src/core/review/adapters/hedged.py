@@ -0,0 +1,264 @@
+"""Hedged requests: race a slow primary adapter against a secondary one.
+
+``HedgedModelAdapter`` sends each prompt to the primary adapter and, when
+no answer has arrived after a delay derived from the primary's recent
+latency percentile, sends the same prompt to the secondary adapter. The
+first successful answer wins; the other request is cancelled (async) or
+ignored (sync).
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from core.review.model_adapter import ModelAdapter, agenerate
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_DELAY_SECONDS = 10.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 200
+
+PRIMARY_ENV = "HEDGE_PRIMARY_ADAPTER"
+SECONDARY_ENV = "HEDGE_SECONDARY_ADAPTER"
+PERCENTILE_ENV = "HEDGE_PERCENTILE"
+DELAY_ENV = "HEDGE_DELAY_SECONDS"
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies with nearest-rank percentiles."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        if window <= 0:
+            raise ValueError("window must be > 0")
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(rank) - 1]
+
+
+class HedgedModelAdapter:
+    """Composite adapter that hedges slow primary calls with a secondary adapter.
+
+    Until ``min_samples`` primary latencies are known the hedge fires after
+    ``delay_seconds``; afterwards it fires at the primary's ``percentile``
+    latency, so only the slowest few percent of calls are duplicated.
+    """
+
+    metrics_key = "hedge"
+
+    def __init__(
+        self,
+        primary: ModelAdapter,
+        secondary: ModelAdapter,
+        *,
+        percentile: float = DEFAULT_PERCENTILE,
+        delay_seconds: float = DEFAULT_DELAY_SECONDS,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        window: int = DEFAULT_WINDOW,
+        name: str = "hedged",
+    ) -> None:
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be in (0, 100]")
+        if delay_seconds < 0:
+            raise ValueError("delay_seconds must be >= 0")
+        if min_samples <= 0:
+            raise ValueError("min_samples must be > 0")
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile
+        self.delay_seconds = delay_seconds
+        self.min_samples = min_samples
+        self.name = name
+        self.latencies = LatencyTracker(window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+
+    @classmethod
+    def from_env(cls, get_adapter: Any) -> Optional["HedgedModelAdapter"]:
+        """Build from ``HEDGE_*`` env; returns None when no primary/secondary is configured.
+
+        ``get_adapter`` resolves adapter names (the registry lookup).
+        """
+
+        primary_name = os.getenv(PRIMARY_ENV, "").strip()
+        secondary_name = os.getenv(SECONDARY_ENV, "").strip()
+        if not primary_name or not secondary_name:
+            return None
+        if "hedged" in (primary_name, secondary_name):
+            raise ValueError("The hedged adapter cannot hedge itself.")
+
+        percentile = DEFAULT_PERCENTILE
+        delay_seconds = DEFAULT_DELAY_SECONDS
+        for env_name, label in ((PERCENTILE_ENV, "percentile"), (DELAY_ENV, "delay")):
+            raw = os.getenv(env_name, "").strip()
+            if not raw:
+                continue
+            try:
+                value = float(raw)
+            except ValueError as exc:
+                raise ValueError(f"{env_name} must be a number.") from exc
+            if label == "percentile":
+                if not 0 < value <= 100:
+                    raise ValueError(f"{env_name} must be in (0, 100].")
+                percentile = value
+            else:
+                if value < 0:
+                    raise ValueError(f"{env_name} must be >= 0.")
+                delay_seconds = value
+
+        adapters = []
+        for env_name, name in ((PRIMARY_ENV, primary_name), (SECONDARY_ENV, secondary_name)):
+            try:
+                adapters.append(get_adapter(name))
+            except ValueError as exc:
+                raise ValueError(f"{env_name} names an unavailable adapter: {exc}") from exc
+        return cls(*adapters, percentile=percentile, delay_seconds=delay_seconds)
+
+    @property
+    def model(self) -> str:
+        return "{}|{}".format(getattr(self.primary, "model", ""), getattr(self.secondary, "model", ""))
+
+    @property
+    def max_prompt_tokens(self) -> Optional[int]:
+        # The prompt has to fit whichever adapter ends up answering.
+        limits = [
+            limit
+            for limit in (
+                getattr(self.primary, "max_prompt_tokens", None),
+                getattr(self.secondary, "max_prompt_tokens", None),
+            )
+            if limit is not None
+        ]
+        return min(limits) if limits else None
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before sending the secondary request."""
+
+        if len(self.latencies) < self.min_samples:
+            return self.delay_seconds
+        observed = self.latencies.percentile(self.percentile)
+        return self.delay_seconds if observed is None else observed
+
+    def generate_review(self, prompt: str) -> str:
+        self._count("requests")
+        results: "queue.Queue[Tuple[str, Optional[str], Optional[BaseException]]]" = queue.Queue()
+        self._start_thread("primary", self.primary, prompt, results)
+
+        try:
+            outcome = results.get(timeout=self.hedge_delay())
+        except queue.Empty:
+            outcome = None
+        if outcome is not None and outcome[2] is None:
+            return outcome[1] or ""
+
+        # Primary is slow or already failed: race (or fail over to) the secondary.
+        self._count("hedged")
+        self._start_thread("secondary", self.secondary, prompt, results)
+        pending = 1 if outcome is not None else 2
+        first_error = outcome[2] if outcome is not None else None
+        while pending:
+            source, output, error = results.get()
+            pending -= 1
+            if error is None:
+                if source == "secondary":
+                    self._count("secondary_wins")
+                return output or ""
+            first_error = first_error or error
+        assert first_error is not None
+        raise first_error
+
+    async def agenerate_review(self, prompt: str) -> str:
+        import asyncio
+
+        self._count("requests")
+        started = time.monotonic()
+        primary = asyncio.ensure_future(agenerate(self.primary, prompt))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done and primary.exception() is None:
+            self.latencies.record(time.monotonic() - started)
+            return primary.result()
+
+        self._count("hedged")
+        secondary = asyncio.ensure_future(agenerate(self.secondary, prompt))
+        pending = {secondary} if done else {primary, secondary}
+        first_error = primary.exception() if done else None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if task is primary and error is None:
+                        self.latencies.record(time.monotonic() - started)
+                    if error is None:
+                        if task is secondary:
+                            self._count("secondary_wins")
+                        return task.result()
+                    first_error = first_error or error
+        finally:
+            for task in pending:
+                task.cancel()
+            if primary in pending:
+                # Count the abandoned primary at its elapsed time so slow calls still raise the percentile.
+                self.latencies.record(time.monotonic() - started)
+        assert first_error is not None
+        raise first_error
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "primary": self.primary.name,
+                "secondary": self.secondary.name,
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "secondary_wins": self.secondary_wins,
+                "hedge_delay_seconds": self.hedge_delay(),
+            }
+
+    def _start_thread(
+        self,
+        source: str,
+        adapter: ModelAdapter,
+        prompt: str,
+        results: "queue.Queue[Tuple[str, Optional[str], Optional[BaseException]]]",
+    ) -> None:
+        def run() -> None:
+            started = time.monotonic()
+            try:
+                output = adapter.generate_review(prompt)
+            except BaseException as exc:
+                results.put((source, None, exc))
+                return
+            if source == "primary":
+                # Recorded even when the secondary already won, so slow calls count.
+                self.latencies.record(time.monotonic() - started)
+            results.put((source, output, None))
+
+        # Daemon thread: a losing request that never returns must not block exit.
+        threading.Thread(target=run, name=f"hedged-{source}", daemon=True).start()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -0,0 +1,372 @@
+"""Thread-safe keep-alive HTTP connection pools for adapter requests."""
+
+import base64
+import http.client
+import io
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+DEFAULT_POOL_SIZE = 8
+POOL_SIZE_ENV = "PR_REVIEW_HTTP_POOL_SIZE"
+
+# Errors that mean a reused keep-alive connection was closed by the server.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+PoolKey = Tuple[str, str, int, Optional[str]]
+
+
+class HttpConnectionPool:
+    """Bounded pool of keep-alive connections to one ``scheme://host:port``.
+
+    At most ``max_size`` connections exist at once; callers beyond that
+    wait for a connection to be released. Idle connections are reused
+    most-recently-released first so the warmest socket is picked.
+
+    With a ``proxy`` URL, https requests are tunnelled through it with
+    ``CONNECT`` and plain http requests are sent to it with absolute
+    targets, as ``urllib.request`` does.
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        *,
+        max_size: int = DEFAULT_POOL_SIZE,
+        proxy: Optional[str] = None,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme '{scheme}'.")
+
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_size = max_size
+        self.proxy = proxy
+        self._proxy_address: Optional[Tuple[str, int]] = None
+        self._proxy_headers: Dict[str, str] = {}
+        if proxy is not None:
+            self._proxy_address, self._proxy_headers = _parse_proxy(proxy)
+        self.connections_created = 0
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send a request and yield the open response.
+
+        The connection returns to the pool if the body was read to the end
+        and the server allows keep-alive; otherwise it is closed.
+        """
+
+        self._slots.acquire()
+        conn = None
+        try:
+            conn, response = self._send(method, path, body, headers or {}, timeout)
+            try:
+                yield response
+            finally:
+                reusable = response.isclosed() and not response.will_close
+                if not reusable:
+                    response.close()
+                    conn.close()
+                    conn = None
+        finally:
+            if conn is not None:
+                with self._lock:
+                    self._idle.append(conn)
+            self._slots.release()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+    ) -> Tuple[int, bytes]:
+        """Send a request and return ``(status, body)``."""
+
+        with self.stream(method, path, body=body, headers=headers, timeout=timeout) as response:
+            return response.status, response.read()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        if self._proxy_address is not None and self.scheme == "http":
+            # Plain http goes to the proxy itself, which needs the absolute URL.
+            host = f"[{self.host}]" if ":" in self.host else self.host
+            path = f"http://{host}:{self.port}{path}"
+            headers = {**self._proxy_headers, **headers}
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is not None:
+            try:
+                return conn, self._exchange(conn, method, path, body, headers, timeout)
+            except _STALE_CONNECTION_ERRORS:
+                # The server dropped the idle connection; retry once on a fresh one.
+                conn.close()
+            except BaseException:
+                conn.close()
+                raise
+
+        conn = self._new_connection(timeout)
+        try:
+            return conn, self._exchange(conn, method, path, body, headers, timeout)
+        except BaseException:
+            conn.close()
+            raise
+
+    @staticmethod
+    def _exchange(
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> http.client.HTTPResponse:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.request(method, path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_created += 1
+        if self._proxy_address is None:
+            if self.scheme == "https":
+                return http.client.HTTPSConnection(self.host, self.port, timeout=timeout)
+            return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+        proxy_host, proxy_port = self._proxy_address
+        if self.scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=timeout)
+            conn.set_tunnel(self.host, self.port, headers=self._proxy_headers)
+            return conn
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout)
+
+
+class HttpPoolManager:
+    """Per-host registry of ``HttpConnectionPool`` instances.
+
+    Proxies come from the environment (``https_proxy``, ``http_proxy``,
+    ``no_proxy``) or system settings via ``urllib.request.getproxies``,
+    so the pool reaches the same hosts ``urlopen`` would.
+    """
+
+    def __init__(self, *, max_size: int = DEFAULT_POOL_SIZE) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self.max_size = max_size
+        self._pools: Dict[PoolKey, HttpConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool_for(self, url: str) -> Tuple[HttpConnectionPool, str]:
+        """Return the pool for ``url`` and the request target (path plus query)."""
+
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if not parts.hostname:
+            raise ValueError(f"URL has no host: '{url}'")
+        port = parts.port or (443 if scheme == "https" else 80)
+        proxy = _proxy_for(scheme, parts.hostname)
+        key = (scheme, parts.hostname, port, proxy)
+
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HttpConnectionPool(scheme, parts.hostname, port, max_size=self.max_size, proxy=proxy)
+                self._pools[key] = pool
+
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        return pool, target
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+    ) -> Iterator[http.client.HTTPResponse]:
+        pool, target = self.pool_for(url)
+        with pool.stream(method, target, body=body, headers=headers, timeout=timeout) as response:
+            yield response
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+    ) -> Tuple[int, bytes]:
+        pool, target = self.pool_for(url)
+        return pool.request(method, target, body=body, headers=headers, timeout=timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+_SHARED_MANAGER: Optional[HttpPoolManager] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_http_pool() -> HttpPoolManager:
+    """Return the process-wide pool manager, sized by ``PR_REVIEW_HTTP_POOL_SIZE``."""
+
+    global _SHARED_MANAGER
+    with _SHARED_LOCK:
+        if _SHARED_MANAGER is None:
+            _SHARED_MANAGER = HttpPoolManager(max_size=_pool_size_from_env())
+        return _SHARED_MANAGER
+
+
+def reset_http_pool() -> None:
+    """Close and drop the process-wide pool manager (e.g. after config changes)."""
+
+    global _SHARED_MANAGER
+    with _SHARED_LOCK:
+        manager, _SHARED_MANAGER = _SHARED_MANAGER, None
+    if manager is not None:
+        manager.close()
+
+
+def check_status(url: str, status: int, body: bytes, headers: Optional[Mapping[str, str]] = None) -> None:
+    """Raise ``urllib.error.HTTPError`` for non-2xx responses, like ``urlopen`` did.
+
+    ``headers`` are kept on the error so retries can honour ``Retry-After``.
+    """
+
+    if 200 <= status < 300:
+        return
+    message = http.client.HTTPMessage()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    reason = body[:200].decode("utf-8", errors="replace")
+    raise urllib.error.HTTPError(url, status, reason, message, io.BytesIO(body))
+
+
+def post_json(url: str, payload: Dict[str, Any], *, timeout: float) -> Any:
+    """POST ``payload`` as JSON over the shared pool and decode the JSON reply."""
+
+    with get_http_pool().stream(
+        "POST",
+        url,
+        body=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        timeout=timeout,
+    ) as response:
+        body = response.read()
+    check_status(url, response.status, body, response.headers)
+    return json.loads(body.decode("utf-8", errors="replace"))
+
+
+@contextmanager
+def stream_json_lines(url: str, payload: Dict[str, Any], *, timeout: float) -> Iterator[Iterator[Any]]:
+    """POST ``payload`` and yield an iterator over NDJSON reply objects.
+
+    Leaving the block before the stream ends closes the connection, which
+    also tells the server to stop generating.
+    """
+
+    with get_http_pool().stream(
+        "POST",
+        url,
+        body=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        timeout=timeout,
+    ) as response:
+        if not 200 <= response.status < 300:
+            check_status(url, response.status, response.read(), response.headers)
+        yield _iter_json_lines(response)
+
+
+def _iter_json_lines(response: http.client.HTTPResponse) -> Iterator[Any]:
+    for raw_line in iter(response.readline, b""):
+        line = raw_line.strip()
+        if line:
+            yield json.loads(line.decode("utf-8", errors="replace"))
+
+
+def _proxy_for(scheme: str, host: str) -> Optional[str]:
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return proxy
+
+
+def _parse_proxy(proxy: str) -> Tuple[Tuple[str, int], Dict[str, str]]:
+    """Return the ``(host, port)`` of ``proxy`` and its ``Proxy-Authorization`` header, if any."""
+
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not parts.hostname:
+        raise ValueError(f"Proxy URL has no host: '{proxy}'")
+    port = parts.port or (443 if parts.scheme.lower() == "https" else 80)
+
+    headers: Dict[str, str] = {}
+    if parts.username is not None:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    return (parts.hostname, port), headers
+
+
+def _pool_size_from_env() -> int:
+    raw = os.getenv(POOL_SIZE_ENV, "").strip()
+    if not raw:
+        return DEFAULT_POOL_SIZE
+    try:
+        size = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{POOL_SIZE_ENV} must be an integer.") from exc
+    if size <= 0:
+        raise ValueError(f"{POOL_SIZE_ENV} must be > 0.")
+    return size
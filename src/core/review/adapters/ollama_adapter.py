@@ -1,10 +1,14 @@
 """Ollama adapter with strict environment configuration validation."""
 
-import json
 import os
-import urllib.request
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+
+from core.review.adapters.http_pool import post_json, stream_json_lines
+from core.review.output_normalizer import StreamingReviewAccumulator
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
 
 
 class AdapterConfigError(Exception):
@@ -22,6 +26,9 @@ class OllamaModelAdapter:
     base_url: str
     model: str
     timeout_seconds: int = 30
+    max_prompt_tokens: Optional[int] = None
+    stream: bool = False
+    max_output_chars: Optional[int] = None
     name: str = "ollama"
 
     @classmethod
@@ -29,6 +36,7 @@ class OllamaModelAdapter:
         base_url = os.getenv("OLLAMA_BASE_URL", "").strip()
         model = os.getenv("OLLAMA_MODEL", "").strip()
         timeout_raw = os.getenv("OLLAMA_TIMEOUT_SECONDS", "").strip()
+        max_prompt_raw = os.getenv("OLLAMA_MAX_PROMPT_TOKENS", "").strip()
 
         if not base_url:
             raise AdapterConfigError("OLLAMA_BASE_URL is required for ollama adapter.")
@@ -44,35 +52,165 @@ class OllamaModelAdapter:
         if timeout_seconds <= 0:
             raise AdapterConfigError("OLLAMA_TIMEOUT_SECONDS must be > 0.")
 
-        return cls(base_url=base_url, model=model, timeout_seconds=timeout_seconds)
+        max_prompt_tokens = None
+        if max_prompt_raw:
+            try:
+                max_prompt_tokens = int(max_prompt_raw)
+            except ValueError as exc:
+                raise AdapterConfigError("OLLAMA_MAX_PROMPT_TOKENS must be an integer.") from exc
+            if max_prompt_tokens <= 0:
+                raise AdapterConfigError("OLLAMA_MAX_PROMPT_TOKENS must be > 0.")
+
+        stream, max_output_chars = stream_settings_from_env()
+
+        return cls(
+            base_url=base_url,
+            model=model,
+            timeout_seconds=timeout_seconds,
+            max_prompt_tokens=max_prompt_tokens,
+            stream=stream,
+            max_output_chars=max_output_chars,
+        )
 
     def generate_review(self, prompt: str) -> str:
-        if not prompt.strip():
-            raise AdapterRuntimeError("Prompt must not be empty.")
+        payload = self._payload(prompt)
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-        }
-        request = urllib.request.Request(
-            url=self._generate_url(),
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+        try:
+            if self.stream:
+                text: Optional[str] = generate_streaming(
+                    self._generate_url(),
+                    payload,
+                    timeout=self.timeout_seconds,
+                    max_output_chars=self.max_output_chars,
+                )
+            else:
+                # Pooled keep-alive connections avoid a TCP handshake per chunk prompt.
+                data = post_json(self._generate_url(), payload, timeout=self.timeout_seconds)
+                text = data.get("response")
+        except Exception as exc:  # pragma: no cover - defensive wrapper
+            raise AdapterRuntimeError(f"Ollama request failed: {exc}") from exc
+
+        return self._response_text(text)
+
+    async def agenerate_review(self, prompt: str) -> str:
+        # Imported here so sync reviews do not pay for asyncio and ssl at startup.
+        from core.review.adapters.async_http import apost_json
+
+        payload = self._payload(prompt)
 
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
-                body = response.read().decode("utf-8", errors="replace")
-            data = json.loads(body)
+            if self.stream:
+                text: Optional[str] = await agenerate_streaming(
+                    self._generate_url(),
+                    payload,
+                    timeout=self.timeout_seconds,
+                    max_output_chars=self.max_output_chars,
+                )
+            else:
+                data = await apost_json(self._generate_url(), payload, timeout=self.timeout_seconds)
+                text = data.get("response")
         except Exception as exc:  # pragma: no cover - defensive wrapper
             raise AdapterRuntimeError(f"Ollama request failed: {exc}") from exc
 
-        text: Optional[str] = data.get("response")
+        return self._response_text(text)
+
+    def _payload(self, prompt: str) -> Dict[str, Any]:
+        if not prompt.strip():
+            raise AdapterRuntimeError("Prompt must not be empty.")
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": self.stream,
+        }
+
+    @staticmethod
+    def _response_text(text: Any) -> str:
         if isinstance(text, str) and text.strip():
             return text.strip()
         raise AdapterRuntimeError("Ollama response did not contain text output.")
 
     def _generate_url(self) -> str:
         return f"{self.base_url.rstrip('/')}/api/generate"
+
+
+def stream_settings_from_env() -> Tuple[bool, Optional[int]]:
+    """Read ``OLLAMA_STREAM`` and ``OLLAMA_MAX_OUTPUT_CHARS`` (shared with the compat fallback)."""
+
+    stream = os.getenv("OLLAMA_STREAM", "").strip().lower() in _TRUE_VALUES
+    max_output_raw = os.getenv("OLLAMA_MAX_OUTPUT_CHARS", "").strip()
+
+    max_output_chars = None
+    if max_output_raw:
+        try:
+            max_output_chars = int(max_output_raw)
+        except ValueError as exc:
+            raise AdapterConfigError("OLLAMA_MAX_OUTPUT_CHARS must be an integer.") from exc
+        if max_output_chars <= 0:
+            raise AdapterConfigError("OLLAMA_MAX_OUTPUT_CHARS must be > 0.")
+    return stream, max_output_chars
+
+
+def generate_streaming(
+    url: str,
+    payload: Dict[str, Any],
+    *,
+    timeout: float,
+    max_output_chars: Optional[int] = None,
+) -> str:
+    """Consume an Ollama NDJSON generate stream, stopping as soon as the review is usable.
+
+    The request is abandoned (closing the connection, which cancels the
+    generation server-side) once the findings section is complete or
+    ``max_output_chars`` characters have arrived. ``timeout`` bounds the
+    whole stream, as it bounds a non-streaming request: a model that keeps
+    sending tokens past it raises ``TimeoutError``.
+    """
+
+    deadline = time.monotonic() + timeout
+    accumulator = StreamingReviewAccumulator(max_chars=max_output_chars)
+    with stream_json_lines(url, {**payload, "stream": True}, timeout=timeout) as events:
+        for event in events:
+            if _consume_event(event, accumulator):
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Ollama stream did not finish within {timeout}s.")
+    return accumulator.text()
+
+
+async def agenerate_streaming(
+    url: str,
+    payload: Dict[str, Any],
+    *,
+    timeout: float,
+    max_output_chars: Optional[int] = None,
+) -> str:
+    """Async counterpart of ``generate_streaming``."""
+
+    import asyncio
+
+    from core.review.adapters.async_http import astream_json_lines
+
+    accumulator = StreamingReviewAccumulator(max_chars=max_output_chars)
+
+    async def consume() -> None:
+        async with astream_json_lines(url, {**payload, "stream": True}, timeout=timeout) as events:
+            async for event in events:
+                if _consume_event(event, accumulator):
+                    break
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except asyncio.TimeoutError as exc:
+        raise TimeoutError(f"Ollama stream did not finish within {timeout}s.") from exc
+    return accumulator.text()
+
+
+def _consume_event(event: Dict[str, Any], accumulator: StreamingReviewAccumulator) -> bool:
+    """Feed one stream event; return True once the stream can be closed."""
+
+    if event.get("error"):
+        raise AdapterRuntimeError(f"Ollama stream error: {event['error']}")
+    piece = event.get("response")
+    if isinstance(piece, str) and accumulator.feed(piece):
+        return True
+    return bool(event.get("done"))
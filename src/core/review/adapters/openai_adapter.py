@@ -2,7 +2,7 @@
 
 import os
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 class AdapterConfigError(Exception):
@@ -22,6 +22,8 @@ class OpenAIModelAdapter:
     timeout_seconds: int = 30
     max_output_tokens: int = 1200
     client: Optional[Any] = None
+    max_prompt_tokens: Optional[int] = None
+    async_client: Optional[Any] = None
     name: str = "openai"
 
     @classmethod
@@ -29,6 +31,7 @@ class OpenAIModelAdapter:
         api_key = os.getenv("OPENAI_API_KEY", "").strip()
         model = os.getenv("OPENAI_MODEL", "").strip() or "gpt-4.1-mini"
         timeout_raw = os.getenv("OPENAI_TIMEOUT_SECONDS", "").strip()
+        max_prompt_raw = os.getenv("OPENAI_MAX_PROMPT_TOKENS", "").strip()
 
         if not api_key:
             raise AdapterConfigError("OPENAI_API_KEY is required for openai adapter.")
@@ -42,33 +45,61 @@ class OpenAIModelAdapter:
         if timeout_seconds <= 0:
             raise AdapterConfigError("OPENAI_TIMEOUT_SECONDS must be > 0.")
 
+        max_prompt_tokens = None
+        if max_prompt_raw:
+            try:
+                max_prompt_tokens = int(max_prompt_raw)
+            except ValueError as exc:
+                raise AdapterConfigError("OPENAI_MAX_PROMPT_TOKENS must be an integer.") from exc
+            if max_prompt_tokens <= 0:
+                raise AdapterConfigError("OPENAI_MAX_PROMPT_TOKENS must be > 0.")
+
         return cls(
             api_key=api_key,
             model=model,
             timeout_seconds=timeout_seconds,
+            max_prompt_tokens=max_prompt_tokens,
         )
 
     def generate_review(self, prompt: str) -> str:
-        if not prompt.strip():
-            raise AdapterRuntimeError("Prompt must not be empty.")
-
+        request = self._request_kwargs(prompt)
         client = self._get_client()
 
         try:
-            response = client.responses.create(
-                model=self.model,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": prompt}],
-                    }
-                ],
-                max_output_tokens=self.max_output_tokens,
-                timeout=self.timeout_seconds,
-            )
+            response = client.responses.create(**request)
+        except Exception as exc:  # pragma: no cover - defensive wrapper
+            raise AdapterRuntimeError(f"OpenAI request failed: {exc}") from exc
+
+        return self._response_text(response)
+
+    async def agenerate_review(self, prompt: str) -> str:
+        request = self._request_kwargs(prompt)
+        client = self._get_async_client()
+
+        try:
+            response = await client.responses.create(**request)
         except Exception as exc:  # pragma: no cover - defensive wrapper
             raise AdapterRuntimeError(f"OpenAI request failed: {exc}") from exc
 
+        return self._response_text(response)
+
+    def _request_kwargs(self, prompt: str) -> Dict[str, Any]:
+        if not prompt.strip():
+            raise AdapterRuntimeError("Prompt must not be empty.")
+
+        return {
+            "model": self.model,
+            "input": [
+                {
+                    "role": "user",
+                    "content": [{"type": "input_text", "text": prompt}],
+                }
+            ],
+            "max_output_tokens": self.max_output_tokens,
+            "timeout": self.timeout_seconds,
+        }
+
+    def _response_text(self, response: Any) -> str:
         text = self._extract_text(response)
         if not text:
             raise AdapterRuntimeError("OpenAI response did not contain text output.")
@@ -89,6 +120,20 @@ class OpenAIModelAdapter:
         self.client = OpenAI(api_key=self.api_key)
         return self.client
 
+    def _get_async_client(self) -> Any:
+        if self.async_client is not None:
+            return self.async_client
+
+        try:
+            from openai import AsyncOpenAI
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise AdapterConfigError(
+                "openai package is not installed. Install it to use openai adapter."
+            ) from exc
+
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
+        return self.async_client
+
     @staticmethod
     def _extract_text(response: Any) -> str:
         # Preferred SDK field.
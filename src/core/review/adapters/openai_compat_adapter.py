@@ -1,12 +1,22 @@
 """OpenAI-compatible adapter skeleton with env validation."""
 
+import http.client
 import json
 import os
 import re
+import sys
 import urllib.error
-import urllib.request
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from core.review.adapters.http_pool import post_json
+from core.review.adapters.ollama_adapter import AdapterConfigError as OllamaAdapterConfigError
+from core.review.adapters.ollama_adapter import AdapterRuntimeError as OllamaAdapterRuntimeError
+from core.review.adapters.ollama_adapter import (
+    agenerate_streaming,
+    generate_streaming,
+    stream_settings_from_env,
+)
 
 
 class AdapterConfigError(Exception):
@@ -27,6 +37,8 @@ class OpenAICompatModelAdapter:
     timeout_seconds: int = 30
     max_output_tokens: int = 1200
     client: Optional[Any] = None
+    max_prompt_tokens: Optional[int] = None
+    async_client: Optional[Any] = None
     name: str = "openai-compat"
 
     @classmethod
@@ -35,6 +47,7 @@ class OpenAICompatModelAdapter:
         model = os.getenv("OPENAI_COMPAT_MODEL", "").strip()
         api_key = os.getenv("OPENAI_COMPAT_API_KEY", "").strip()
         timeout_raw = os.getenv("OPENAI_COMPAT_TIMEOUT_SECONDS", "").strip()
+        max_prompt_raw = os.getenv("OPENAI_COMPAT_MAX_PROMPT_TOKENS", "").strip()
 
         if not base_url:
             raise AdapterConfigError("OPENAI_COMPAT_BASE_URL is required for openai-compat adapter.")
@@ -50,31 +63,36 @@ class OpenAICompatModelAdapter:
         if timeout_seconds <= 0:
             raise AdapterConfigError("OPENAI_COMPAT_TIMEOUT_SECONDS must be > 0.")
 
+        max_prompt_tokens = None
+        if max_prompt_raw:
+            try:
+                max_prompt_tokens = int(max_prompt_raw)
+            except ValueError as exc:
+                raise AdapterConfigError("OPENAI_COMPAT_MAX_PROMPT_TOKENS must be an integer.") from exc
+            if max_prompt_tokens <= 0:
+                raise AdapterConfigError("OPENAI_COMPAT_MAX_PROMPT_TOKENS must be > 0.")
+
+        if cls._is_ollama_fallback_enabled():
+            # Fail at startup, not on the first empty response, when the fallback stream is misconfigured.
+            try:
+                stream_settings_from_env()
+            except OllamaAdapterConfigError as exc:
+                raise AdapterConfigError(str(exc)) from exc
+
         return cls(
             base_url=base_url,
             model=model,
             api_key=api_key,
             timeout_seconds=timeout_seconds,
+            max_prompt_tokens=max_prompt_tokens,
         )
 
     def generate_review(self, prompt: str) -> str:
-        if not prompt.strip():
-            raise AdapterRuntimeError("Prompt must not be empty.")
-
+        request = self._request_kwargs(prompt)
         client = self._get_client()
 
         try:
-            response = client.responses.create(
-                model=self.model,
-                input=[
-                    {
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": prompt}],
-                    }
-                ],
-                max_output_tokens=self.max_output_tokens,
-                timeout=self.timeout_seconds,
-            )
+            response = client.responses.create(**request)
         except Exception as exc:
             if not self._is_expected_client_error(exc):
                 raise
@@ -95,6 +113,48 @@ class OpenAICompatModelAdapter:
 
         return text
 
+    async def agenerate_review(self, prompt: str) -> str:
+        request = self._request_kwargs(prompt)
+        client = self._get_async_client()
+
+        try:
+            response = await client.responses.create(**request)
+        except Exception as exc:
+            if not self._is_expected_client_error(exc):
+                raise
+            safe_detail = self._sanitize_error_text(str(exc))
+            raise AdapterRuntimeError(f"OpenAI-compatible request failed: {safe_detail}") from exc
+
+        text = self._extract_text(response)
+        if not text and self._is_ollama_fallback_enabled():
+            try:
+                text = await self._agenerate_with_ollama(prompt)
+            except Exception as exc:
+                if not self._is_expected_fallback_error(exc):
+                    raise
+                safe_detail = self._sanitize_error_text(str(exc))
+                raise AdapterRuntimeError(f"Ollama fallback request failed: {safe_detail}") from exc
+        if not text:
+            raise AdapterRuntimeError("OpenAI-compatible response did not contain text output.")
+
+        return text
+
+    def _request_kwargs(self, prompt: str) -> Dict[str, Any]:
+        if not prompt.strip():
+            raise AdapterRuntimeError("Prompt must not be empty.")
+
+        return {
+            "model": self.model,
+            "input": [
+                {
+                    "role": "user",
+                    "content": [{"type": "input_text", "text": prompt}],
+                }
+            ],
+            "max_output_tokens": self.max_output_tokens,
+            "timeout": self.timeout_seconds,
+        }
+
     def _get_client(self) -> Any:
         if self.client is not None:
             return self.client
@@ -106,10 +166,26 @@ class OpenAICompatModelAdapter:
                 "openai package is not installed. Install it to use openai-compat adapter."
             ) from exc
 
-        api_key = self.api_key or os.getenv("OPENAI_API_KEY", "").strip() or "openai-compat-no-key"
-        self.client = OpenAI(api_key=api_key, base_url=self.base_url)
+        self.client = OpenAI(api_key=self._client_api_key(), base_url=self.base_url)
         return self.client
 
+    def _get_async_client(self) -> Any:
+        if self.async_client is not None:
+            return self.async_client
+
+        try:
+            from openai import AsyncOpenAI
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise AdapterConfigError(
+                "openai package is not installed. Install it to use openai-compat adapter."
+            ) from exc
+
+        self.async_client = AsyncOpenAI(api_key=self._client_api_key(), base_url=self.base_url)
+        return self.async_client
+
+    def _client_api_key(self) -> str:
+        return self.api_key or os.getenv("OPENAI_API_KEY", "").strip() or "openai-compat-no-key"
+
     def _is_expected_client_error(self, exc: Exception) -> bool:
         if isinstance(exc, (TimeoutError, ConnectionError, OSError)):
             return True
@@ -127,17 +203,21 @@ class OpenAICompatModelAdapter:
 
     @staticmethod
     def _is_expected_fallback_error(exc: Exception) -> bool:
-        return isinstance(
-            exc,
-            (
-                TimeoutError,
-                ConnectionError,
-                OSError,
-                urllib.error.URLError,
-                urllib.error.HTTPError,
-                json.JSONDecodeError,
-            ),
+        expected: Tuple[type, ...] = (
+            TimeoutError,
+            ConnectionError,
+            OSError,
+            urllib.error.URLError,
+            urllib.error.HTTPError,
+            http.client.HTTPException,
+            json.JSONDecodeError,
+            OllamaAdapterRuntimeError,
         )
+        # asyncio is only loaded by async reviews; without it none of its errors can occur.
+        asyncio = sys.modules.get("asyncio")
+        if asyncio is not None:
+            expected += (asyncio.TimeoutError, asyncio.IncompleteReadError)
+        return isinstance(exc, expected)
 
     def _sanitize_error_text(self, text: str) -> str:
         sanitized = text
@@ -159,20 +239,43 @@ class OpenAICompatModelAdapter:
         return raw in {"1", "true", "yes", "on"}
 
     def _generate_with_ollama(self, prompt: str) -> str:
-        payload = {
+        stream, max_output_chars = stream_settings_from_env()
+        payload = self._ollama_payload(prompt, stream)
+        if stream:
+            return generate_streaming(
+                self._ollama_generate_url(),
+                payload,
+                timeout=self.timeout_seconds,
+                max_output_chars=max_output_chars,
+            ).strip()
+        data = post_json(self._ollama_generate_url(), payload, timeout=self.timeout_seconds)
+        return self._ollama_response_text(data)
+
+    async def _agenerate_with_ollama(self, prompt: str) -> str:
+        from core.review.adapters.async_http import apost_json
+
+        stream, max_output_chars = stream_settings_from_env()
+        payload = self._ollama_payload(prompt, stream)
+        if stream:
+            text = await agenerate_streaming(
+                self._ollama_generate_url(),
+                payload,
+                timeout=self.timeout_seconds,
+                max_output_chars=max_output_chars,
+            )
+            return text.strip()
+        data = await apost_json(self._ollama_generate_url(), payload, timeout=self.timeout_seconds)
+        return self._ollama_response_text(data)
+
+    def _ollama_payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        return {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
         }
-        request = urllib.request.Request(
-            url=self._ollama_generate_url(),
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
-            body = response.read().decode("utf-8", errors="replace")
-        data = json.loads(body)
+
+    @staticmethod
+    def _ollama_response_text(data: Any) -> str:
         text = data.get("response", "")
         if isinstance(text, str):
             return text.strip()
@@ -0,0 +1,275 @@
+"""Client-side rate limiting for model adapters.
+
+``RateLimitedModelAdapter`` wraps any adapter with request-per-minute and
+token-per-minute token buckets plus a concurrency cap, all held by one
+``AdapterRateLimiter`` shared by every review that uses the adapter. A
+provider 429 pauses the limiter (honouring ``Retry-After``) and the prompt
+is queued again instead of failing the chunk.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core.review.adapters.errors import is_rate_limit_error, retry_after_seconds
+from core.review.model_adapter import ModelAdapter, agenerate
+from core.review.tokens import estimate_tokens
+
+RPM_ENV_SUFFIX = "_RPM"
+TPM_ENV_SUFFIX = "_TPM"
+MAX_CONCURRENCY_ENV_SUFFIX = "_MAX_CONCURRENCY"
+DEFAULT_MAX_REQUEUES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+_ASYNC_SLOT_POLL_SECONDS = 0.01
+
+
+class TokenBucket:
+    """Bucket of ``capacity`` tokens refilled evenly over ``period`` seconds.
+
+    ``reserve`` debits immediately and returns how long the caller must
+    wait, so concurrent callers are served in arrival order without holding
+    a lock while they sleep.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0, *, clock: Callable[[], float] = time.monotonic):
+        if capacity <= 0 or period <= 0:
+            raise ValueError("capacity and period must be > 0")
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens and return the seconds until they are available."""
+
+        # Requests larger than the bucket would never fit; charge a full bucket instead.
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class AdapterRateLimiter:
+    """Request, token and concurrency limits for one adapter, shared across reviews."""
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_requeues: int = DEFAULT_MAX_REQUEUES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        for label, value in (
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+            ("max_concurrency", max_concurrency),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{label} must be > 0")
+        if max_requeues < 0:
+            raise ValueError("max_requeues must be >= 0")
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_requeues = max_requeues
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.requests = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def from_env(cls, prefix: str) -> Optional["AdapterRateLimiter"]:
+        """Read ``<prefix>_RPM``, ``<prefix>_TPM`` and ``<prefix>_MAX_CONCURRENCY``.
+
+        Returns None when none of them is set.
+        """
+
+        values: Dict[str, Optional[int]] = {}
+        for suffix in (RPM_ENV_SUFFIX, TPM_ENV_SUFFIX, MAX_CONCURRENCY_ENV_SUFFIX):
+            env_name = prefix + suffix
+            raw = os.getenv(env_name, "").strip()
+            value = None
+            if raw:
+                try:
+                    value = int(raw)
+                except ValueError as exc:
+                    raise ValueError(f"{env_name} must be an integer.") from exc
+                if value <= 0:
+                    raise ValueError(f"{env_name} must be > 0.")
+            values[suffix] = value
+
+        if not any(value is not None for value in values.values()):
+            return None
+        return cls(
+            requests_per_minute=values[RPM_ENV_SUFFIX],
+            tokens_per_minute=values[TPM_ENV_SUFFIX],
+            max_concurrency=values[MAX_CONCURRENCY_ENV_SUFFIX],
+        )
+
+    def delay_for(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` tokens; return the seconds to wait first."""
+
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None and tokens > 0:
+            delay = max(delay, self._tokens.reserve(tokens))
+        with self._lock:
+            self.requests += 1
+            delay = max(delay, self._paused_until - self._clock())
+            self.waited_seconds += max(0.0, delay)
+        return delay
+
+    def wait(self, seconds: float) -> None:
+        self._sleep(seconds)
+
+    def charge(self, tokens: int) -> None:
+        """Debit tokens only known after the call (model output) without waiting."""
+
+        if self._tokens is not None and tokens > 0:
+            self._tokens.reserve(tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds`` after the provider rate-limited us."""
+
+        with self._lock:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        if self._slots is None:
+            yield
+            return
+        self._slots.acquire()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    async def aslot_acquire(self) -> None:
+        # The semaphore is shared with worker threads and other event loops,
+        # so poll it instead of blocking the loop.
+        import asyncio
+
+        if self._slots is None:
+            return
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(_ASYNC_SLOT_POLL_SECONDS)
+
+    def aslot_release(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "max_concurrency": self.max_concurrency,
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "waited_seconds": self.waited_seconds,
+            }
+
+
+class RateLimitedModelAdapter:
+    """Adapter wrapper that enforces an ``AdapterRateLimiter`` around every call.
+
+    Other attributes (``model``, ``max_prompt_tokens``, ...) are read from the
+    wrapped adapter, so prompt planning and cache keys are unchanged.
+    """
+
+    metrics_key = "rate_limit"
+    # Provider 429s are re-queued here, so an outer retry layer leaves them alone.
+    handles_rate_limits = True
+
+    def __init__(self, inner: ModelAdapter, limiter: AdapterRateLimiter) -> None:
+        self.inner = inner
+        self.limiter = limiter
+        self.name = inner.name
+
+    def __getattr__(self, item: str) -> Any:
+        if item == "inner":
+            raise AttributeError(item)
+        return getattr(self.inner, item)
+
+    def generate_review(self, prompt: str) -> str:
+        prompt_tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            delay = self.limiter.delay_for(prompt_tokens)
+            if delay > 0:
+                self.limiter.wait(delay)
+            try:
+                with self.limiter.slot():
+                    output = self.inner.generate_review(prompt)
+            except Exception as exc:
+                attempt = self._requeue_or_raise(exc, attempt)
+                continue
+            self.limiter.charge(estimate_tokens(output))
+            return output
+
+    async def agenerate_review(self, prompt: str) -> str:
+        import asyncio
+
+        prompt_tokens = estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            delay = self.limiter.delay_for(prompt_tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.limiter.aslot_acquire()
+            try:
+                output = await agenerate(self.inner, prompt)
+            except Exception as exc:
+                attempt = self._requeue_or_raise(exc, attempt)
+                continue
+            finally:
+                self.limiter.aslot_release()
+            self.limiter.charge(estimate_tokens(output))
+            return output
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.limiter.snapshot()
+
+    def _requeue_or_raise(self, exc: Exception, attempt: int) -> int:
+        """Pause the limiter and return the next attempt number, or re-raise ``exc``."""
+
+        if not is_rate_limit_error(exc) or attempt >= self.limiter.max_requeues:
+            raise exc
+        backoff = min(DEFAULT_BACKOFF_SECONDS * (2**attempt), MAX_BACKOFF_SECONDS)
+        retry_after = retry_after_seconds(exc)
+        self.limiter.pause(retry_after if retry_after is not None else backoff)
+        return attempt + 1
+
+
+def with_rate_limit(adapter: ModelAdapter, env_prefix: str) -> ModelAdapter:
+    """Wrap ``adapter`` when ``<env_prefix>_RPM``/``_TPM``/``_MAX_CONCURRENCY`` are set."""
+
+    limiter = AdapterRateLimiter.from_env(env_prefix)
+    if limiter is None:
+        return adapter
+    return RateLimitedModelAdapter(adapter, limiter)
@@ -0,0 +1,182 @@
+"""Retry transient adapter failures with jittered exponential backoff.
+
+``RetryingModelAdapter`` wraps any adapter so a single timeout, dropped
+connection, 5xx or 429 from the provider does not fail the whole full-diff
+attempt or drop a chunk's findings. Attempts are bounded, ``Retry-After``
+is honoured, and an optional deadline caps the total time spent per prompt.
+When the wrapped adapter is rate limited, 429s are left to the limiter so
+they are not retried by both layers.
+"""
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from core.review.adapters.errors import is_rate_limit_error, is_transient_error, retry_after_seconds
+from core.review.model_adapter import ModelAdapter, agenerate
+
+MAX_ATTEMPTS_ENV_SUFFIX = "_MAX_ATTEMPTS"
+RETRY_DEADLINE_ENV_SUFFIX = "_RETRY_DEADLINE_SECONDS"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to retry one prompt."""
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30.0
+    deadline_seconds: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.max_attempts <= 0:
+            raise ValueError("max_attempts must be > 0")
+        if self.base_delay_seconds < 0 or self.max_delay_seconds < self.base_delay_seconds:
+            raise ValueError("retry delays must satisfy 0 <= base_delay_seconds <= max_delay_seconds")
+        if self.deadline_seconds is not None and self.deadline_seconds <= 0:
+            raise ValueError("deadline_seconds must be > 0")
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "RetryPolicy":
+        """Read ``<prefix>_MAX_ATTEMPTS`` and ``<prefix>_RETRY_DEADLINE_SECONDS`` over the defaults."""
+
+        attempts_env = prefix + MAX_ATTEMPTS_ENV_SUFFIX
+        deadline_env = prefix + RETRY_DEADLINE_ENV_SUFFIX
+        attempts_raw = os.getenv(attempts_env, "").strip()
+        deadline_raw = os.getenv(deadline_env, "").strip()
+
+        max_attempts = cls.max_attempts
+        if attempts_raw:
+            try:
+                max_attempts = int(attempts_raw)
+            except ValueError as exc:
+                raise ValueError(f"{attempts_env} must be an integer.") from exc
+            if max_attempts <= 0:
+                raise ValueError(f"{attempts_env} must be > 0.")
+
+        deadline_seconds = None
+        if deadline_raw:
+            try:
+                deadline_seconds = float(deadline_raw)
+            except ValueError as exc:
+                raise ValueError(f"{deadline_env} must be a number.") from exc
+            if deadline_seconds <= 0:
+                raise ValueError(f"{deadline_env} must be > 0.")
+
+        return cls(max_attempts=max_attempts, deadline_seconds=deadline_seconds)
+
+    def backoff(self, failures: int, rng: Callable[[], float] = random.random) -> float:
+        """Return the "full jitter" delay after ``failures`` failed attempts."""
+
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (failures - 1)))
+        return ceiling * rng()
+
+
+class RetryingModelAdapter:
+    """Adapter wrapper that retries transient failures according to a ``RetryPolicy``.
+
+    Other attributes are read from the wrapped adapter, so prompt planning
+    and cache keys are unchanged.
+    """
+
+    metrics_key = "retry"
+
+    def __init__(
+        self,
+        inner: ModelAdapter,
+        policy: RetryPolicy,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+        retry_rate_limits: Optional[bool] = None,
+    ) -> None:
+        self.inner = inner
+        self.policy = policy
+        if retry_rate_limits is None:
+            # Checked on the type: instance lookups are forwarded to the wrapped adapter.
+            retry_rate_limits = not getattr(type(inner), "handles_rate_limits", False)
+        self.retry_rate_limits = retry_rate_limits
+        self.name = inner.name
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.gave_up = 0
+
+    def __getattr__(self, item: str) -> Any:
+        if item == "inner":
+            raise AttributeError(item)
+        return getattr(self.inner, item)
+
+    def generate_review(self, prompt: str) -> str:
+        deadline = self._deadline()
+        failures = 0
+        while True:
+            try:
+                return self.inner.generate_review(prompt)
+            except Exception as exc:
+                failures += 1
+                delay = self._next_delay(exc, failures, deadline)
+            self._sleep(delay)
+
+    async def agenerate_review(self, prompt: str) -> str:
+        import asyncio
+
+        deadline = self._deadline()
+        failures = 0
+        while True:
+            try:
+                if deadline is None:
+                    return await agenerate(self.inner, prompt)
+                # The remaining budget also bounds the attempt itself.
+                remaining = max(0.0, deadline - self._clock())
+                return await asyncio.wait_for(agenerate(self.inner, prompt), remaining)
+            except Exception as exc:
+                failures += 1
+                delay = self._next_delay(exc, failures, deadline)
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_attempts": self.policy.max_attempts,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+            }
+
+    def _deadline(self) -> Optional[float]:
+        if self.policy.deadline_seconds is None:
+            return None
+        return self._clock() + self.policy.deadline_seconds
+
+    def _next_delay(self, exc: Exception, failures: int, deadline: Optional[float]) -> float:
+        """Return how long to wait before the next attempt, or re-raise ``exc`` to give up."""
+
+        if not is_transient_error(exc) or (not self.retry_rate_limits and is_rate_limit_error(exc)):
+            raise exc
+        retry_after = retry_after_seconds(exc)
+        delay = retry_after if retry_after is not None else self.policy.backoff(failures, self._rng)
+        out_of_attempts = failures >= self.policy.max_attempts
+        out_of_time = deadline is not None and self._clock() + delay >= deadline
+        with self._lock:
+            if out_of_attempts or out_of_time:
+                self.gave_up += 1
+            else:
+                self.retries += 1
+        if out_of_attempts or out_of_time:
+            raise exc
+        return delay
+
+
+def with_retry(adapter: ModelAdapter, env_prefix: str) -> ModelAdapter:
+    """Wrap ``adapter`` in the retry policy configured by ``<env_prefix>_MAX_ATTEMPTS`` and friends."""
+
+    policy = RetryPolicy.from_env(env_prefix)
+    if policy.max_attempts == 1:
+        return adapter
+    return RetryingModelAdapter(adapter, policy)
@@ -0,0 +1,363 @@
+"""Batch review of many diffs listed in a JSONL manifest, in one process.
+
+Each manifest line is a JSON object with ``diff_path`` (relative paths
+resolve against the manifest directory) and any ``ReviewJob`` field such as
+``repository``, ``base_ref``, ``head_ref``, ``pr_title`` or ``pr_body``.
+Optional ``id`` names the item and ``previous_review_path`` points to an
+earlier review to merge. All items share one adapter registry, cache,
+memo and worker pool.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from core.review.cache import CACHE_DIR_ENV, DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, ReviewCache
+from core.review.cli import EXIT_FATAL, EXIT_OK, EXIT_RECOVERABLE
+from core.review.jobs import JobResult, ReviewJob, ReviewJobRunner
+from core.review.memo import MEMO_DIR_ENV, ReviewMemo
+
+DEFAULT_WORKERS = 4
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One manifest entry: a ready job, or the reason it could not be built."""
+
+    item_id: str
+    job: Optional[ReviewJob] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def read_manifest(path: str, *, defaults: Optional[Dict[str, Any]] = None) -> Iterator[BatchItem]:
+    """Yield manifest items lazily; malformed entries become failed items, not errors."""
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    seen = set()
+    with open(path, "r", encoding="utf-8-sig") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            default_id = f"line-{line_no}"
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield BatchItem(default_id, error=f"Invalid manifest line {line_no}: {exc}")
+                continue
+            if not isinstance(data, dict):
+                yield BatchItem(default_id, error=f"Manifest line {line_no} must be a JSON object.")
+                continue
+
+            item_id = data.pop("id", default_id)
+            if not isinstance(item_id, str) or not item_id.strip():
+                yield BatchItem(default_id, error=f"Manifest line {line_no} has an invalid 'id'.")
+                continue
+            if item_id in seen:
+                yield BatchItem(item_id, error=f"Duplicate manifest id '{item_id}' on line {line_no}.")
+                continue
+            seen.add(item_id)
+
+            try:
+                job = _job_from_entry(data, base_dir, defaults or {})
+            except (OSError, ValueError) as exc:
+                yield BatchItem(item_id, error=str(exc))
+                continue
+            yield BatchItem(item_id, job=job)
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    runner: ReviewJobRunner,
+    *,
+    results: TextIO,
+    output_dir: Optional[str] = None,
+) -> BatchSummary:
+    """Review ``items`` on ``runner`` and write one JSONL result record per item.
+
+    Records keep manifest order. Only a small window of jobs beyond the
+    worker count is read ahead, so memory stays bounded on large manifests.
+    With ``output_dir`` each review is written to ``<id>.md`` there and the
+    record holds its path; otherwise the record holds the markdown itself.
+    Ids that sanitize to the same file name (``a/b``, ``a b``, ``a_b``) get
+    ``-2``, ``-3``, ... suffixes in manifest order instead of overwriting
+    each other.
+    """
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    summary = BatchSummary()
+    started = time.monotonic()
+    window = runner.workers * 2
+    pending: Deque[Tuple[BatchItem, Optional["Future[JobResult]"]]] = deque()
+    used_names: Set[str] = set()
+
+    def emit_oldest() -> None:
+        item, future = pending.popleft()
+        if future is None:
+            result = JobResult(markdown=None, error=item.error, elapsed_seconds=0.0)
+        else:
+            result = future.result()
+        _write_record(item.item_id, result, results=results, output_dir=output_dir, used_names=used_names)
+        summary.total += 1
+        if result.ok:
+            summary.succeeded += 1
+        else:
+            summary.failed += 1
+
+    for item in items:
+        pending.append((item, runner.submit_result(item.job) if item.job is not None else None))
+        while len(pending) > window:
+            emit_oldest()
+    while pending:
+        emit_oldest()
+
+    summary.elapsed_seconds = time.monotonic() - started
+    return summary
+
+
+def _job_from_entry(data: Dict[str, Any], base_dir: str, defaults: Dict[str, Any]) -> ReviewJob:
+    entry = dict(data)
+    diff_path = entry.pop("diff_path", None)
+    previous_path = entry.pop("previous_review_path", None)
+
+    if "diff" not in entry:
+        if not isinstance(diff_path, str) or not diff_path:
+            raise ValueError("Manifest entry must include 'diff_path' (or an inline 'diff').")
+        entry["diff"] = _read_text(base_dir, diff_path, encoding="utf-8")
+    if previous_path is not None:
+        if not isinstance(previous_path, str) or not previous_path:
+            raise ValueError("'previous_review_path' must be a non-empty string.")
+        entry["previous_markdown"] = _read_text(base_dir, previous_path, encoding="utf-8-sig")
+
+    return ReviewJob.from_dict({**defaults, **entry})
+
+
+def _read_text(base_dir: str, path: str, *, encoding: str) -> str:
+    with open(os.path.join(base_dir, path), "r", encoding=encoding) as handle:
+        return handle.read()
+
+
+def _output_filename(item_id: str, used_names: Set[str]) -> str:
+    stem = _UNSAFE_FILENAME_CHARS.sub("_", item_id)
+    name, suffix = f"{stem}.md", 1
+    # Case-folded so names stay distinct on case-insensitive file systems too.
+    while name.casefold() in used_names:
+        suffix += 1
+        name = f"{stem}-{suffix}.md"
+    used_names.add(name.casefold())
+    return name
+
+
+def _write_record(
+    item_id: str,
+    result: JobResult,
+    *,
+    results: TextIO,
+    output_dir: Optional[str],
+    used_names: Set[str],
+) -> None:
+    record: Dict[str, Any] = {
+        "id": item_id,
+        "status": "ok" if result.ok else "error",
+        "elapsed_seconds": round(result.elapsed_seconds, 3),
+    }
+    if not result.ok:
+        record["error"] = result.error
+    elif output_dir:
+        output_path = os.path.join(output_dir, _output_filename(item_id, used_names))
+        with open(output_path, "w", encoding="utf-8") as handle:
+            handle.write(result.markdown or "")
+        record["output_path"] = output_path
+    else:
+        record["markdown"] = result.markdown
+    results.write(json.dumps(record, ensure_ascii=False) + "\n")
+    results.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Review every diff listed in a JSONL manifest.")
+    parser.add_argument("manifest", help="JSONL manifest; one review item per line.")
+    parser.add_argument(
+        "--output-dir",
+        default="",
+        help="Write each review to <output-dir>/<id>.md instead of inlining markdown in the results.",
+    )
+    parser.add_argument(
+        "--results",
+        default="-",
+        help="Path of the JSONL results stream (default: stdout).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Maximum number of reviews processed at once.",
+    )
+    parser.add_argument(
+        "--adapter",
+        default="fake",
+        help="Default review adapter for items that do not set 'adapter' (default: fake).",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=["auto", "raw", "parsed-json"],
+        default="auto",
+        help="Default input mode for items that do not set 'input_format'.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of fallback chunk reviews per item sent to the adapter at once.",
+    )
+    parser.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        default=None,
+        help="Default prompt token limit (default: adapter setting).",
+    )
+    parser.add_argument(
+        "--deadline-seconds",
+        type=float,
+        default=None,
+        help="Default per-item review time budget; unfinished chunks are skipped and reported.",
+    )
+    parser.add_argument(
+        "--chunk-planner",
+        choices=["greedy", "bin-pack"],
+        default="greedy",
+        help="Default fallback chunk planner.",
+    )
+    parser.add_argument(
+        "--chunk-order",
+        choices=["diff", "risk"],
+        default="diff",
+        help="Default fallback chunk order (risk reviews the riskiest code first).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv(CACHE_DIR_ENV, ""),
+        help=f"Directory for the on-disk review cache (default: ${CACHE_DIR_ENV}; unset disables caching).",
+    )
+    parser.add_argument(
+        "--memo-dir",
+        default=os.getenv(MEMO_DIR_ENV, ""),
+        help=f"Directory for per-piece review memo (default: ${MEMO_DIR_ENV}).",
+    )
+    parser.add_argument(
+        "--cache-ttl-seconds",
+        type=int,
+        default=DEFAULT_TTL_SECONDS,
+        help="Age after which cached review output is discarded.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Cache size above which least recently used entries are evicted.",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as exc:
+        return int(exc.code)
+
+    if args.workers <= 0:
+        print("Error: --workers must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if args.max_concurrency <= 0:
+        print("Error: --max-concurrency must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if args.max_prompt_tokens is not None and args.max_prompt_tokens <= 0:
+        print("Error: --max-prompt-tokens must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if args.deadline_seconds is not None and args.deadline_seconds <= 0:
+        print("Error: --deadline-seconds must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if args.cache_ttl_seconds <= 0 or args.cache_max_mb <= 0:
+        print("Error: --cache-ttl-seconds and --cache-max-mb must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if not os.path.isfile(args.manifest):
+        print(f"Error: manifest not found: {args.manifest}", file=sys.stderr)
+        return EXIT_FATAL
+
+    defaults = {
+        "adapter": args.adapter,
+        "input_format": args.input_format,
+        "max_concurrency": args.max_concurrency,
+        "max_prompt_tokens": args.max_prompt_tokens,
+        "deadline_seconds": args.deadline_seconds,
+        "chunk_planner": args.chunk_planner,
+        "chunk_order": args.chunk_order,
+    }
+    max_bytes = args.cache_max_mb * 1024 * 1024
+    try:
+        cache = (
+            ReviewCache(args.cache_dir, ttl_seconds=args.cache_ttl_seconds, max_bytes=max_bytes)
+            if args.cache_dir
+            else None
+        )
+        memo = (
+            ReviewMemo(ReviewCache(args.memo_dir, ttl_seconds=args.cache_ttl_seconds, max_bytes=max_bytes))
+            if args.memo_dir
+            else None
+        )
+        results = sys.stdout if args.results == "-" else open(args.results, "w", encoding="utf-8")
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RECOVERABLE
+
+    runner = ReviewJobRunner(workers=args.workers, cache=cache, memo=memo)
+    try:
+        summary = run_batch(
+            read_manifest(args.manifest, defaults=defaults),
+            runner,
+            results=results,
+            output_dir=args.output_dir or None,
+        )
+    except OSError as exc:
+        print(f"Error: batch review failed ({exc})", file=sys.stderr)
+        return EXIT_RECOVERABLE
+    finally:
+        runner.close()
+        if results is not sys.stdout:
+            results.close()
+
+    print(
+        f"Batch: {summary.total} item(s), {summary.succeeded} succeeded, {summary.failed} failed "
+        f"in {summary.elapsed_seconds:.1f}s",
+        file=sys.stderr,
+    )
+    if cache is not None:
+        stats = cache.stats
+        print(
+            f"Review cache: {stats.hits} hit(s), {stats.misses} miss(es), {stats.evictions} eviction(s)",
+            file=sys.stderr,
+        )
+    return EXIT_OK if summary.failed == 0 else EXIT_RECOVERABLE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""On-disk, content-addressed cache of raw model output keyed by prompt hash."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.review.model_adapter import ModelAdapter, agenerate
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CACHE_DIR_ENV = "PR_REVIEW_CACHE_DIR"
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+class ReviewCache:
+    """Directory of JSON entries with TTL expiry and size-based LRU eviction.
+
+    Entries live at ``<directory>/<key[:2]>/<key>.json``. Reads refresh the
+    entry's mtime, so the oldest mtime is the least recently used entry.
+    Writes go through a temporary file and ``os.replace`` so concurrent
+    processes never observe a partial entry.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be > 0")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def make_key(adapter_name: str, model: str, prompt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (adapter_name, model, prompt):
+            encoded = part.encode("utf-8")
+            # Length-prefix each part so ("ab", "c") and ("a", "bc") differ.
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.stats.misses += 1
+                return None
+
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                self._remove(path, stat.st_size)
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    entry = json.load(handle)
+                output = entry["output"]
+            except (OSError, ValueError, KeyError, TypeError):
+                # Corrupt or concurrently removed entries behave like misses.
+                self.stats.misses += 1
+                return None
+
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self.stats.hits += 1
+            return output
+
+    def put(self, key: str, output: str, *, metadata: Optional[Dict[str, str]] = None) -> None:
+        path = self._path(key)
+        payload = json.dumps(
+            {"key": key, "created_at": time.time(), "metadata": metadata or {}, "output": output},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        # tempfile is only needed on writes; importing it lazily keeps CLI startup fast.
+        import tempfile
+
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(payload)
+                os.replace(tmp_name, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+
+            self._total_bytes += len(payload) - previous
+            self.stats.writes += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, size, _ in self._entries():
+                self._remove(path, size)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        entries: List[Tuple[Path, int, float]] = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, *, keep: Path) -> None:
+        now = time.time()
+        # Expired entries go first, then least recently used ones.
+        entries = sorted(
+            self._entries(),
+            key=lambda entry: (now - entry[2] <= self.ttl_seconds, entry[2]),
+        )
+        for path, size, _ in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path, size)
+            self.stats.evictions += 1
+
+    def _remove(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._total_bytes -= size
+
+
+def generate_with_cache(adapter: ModelAdapter, prompt: str, cache: Optional[ReviewCache]) -> str:
+    """Return ``adapter.generate_review(prompt)``, served from ``cache`` when possible."""
+
+    if cache is None:
+        return adapter.generate_review(prompt)
+
+    key, metadata = _cache_key(adapter, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    output = adapter.generate_review(prompt)
+    cache.put(key, output, metadata=metadata)
+    return output
+
+
+async def agenerate_with_cache(adapter: ModelAdapter, prompt: str, cache: Optional[ReviewCache]) -> str:
+    """Async counterpart of ``generate_with_cache`` built on ``agenerate``."""
+
+    if cache is None:
+        return await agenerate(adapter, prompt)
+
+    key, metadata = _cache_key(adapter, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    output = await agenerate(adapter, prompt)
+    cache.put(key, output, metadata=metadata)
+    return output
+
+
+def _cache_key(adapter: ModelAdapter, prompt: str) -> Tuple[str, Dict[str, str]]:
+    adapter_name = getattr(adapter, "name", "")
+    model = str(getattr(adapter, "model", ""))
+    return ReviewCache.make_key(adapter_name, model, prompt), {"adapter": adapter_name, "model": model}
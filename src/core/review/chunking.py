@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import posixpath
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from core.diff.types import Change, DiffFile, DiffHunk
+from core.review.prompt_builder import format_change, format_hunk_header
+from core.review.tokens import TokenEstimator, estimate_tokens
+
+TRUNCATION_MARKER = " ...[truncated]"
+
+CHUNK_PLANNERS = ("greedy", "bin-pack")
+
+# Prefix of findings carried over from a previous review of the same PR.
+CARRIED_OVER_LABEL = "(carried over from the previous review; not re-verified)"
 
 
 def chunk_diff_files(files: List[DiffFile], max_changes_per_chunk: int = 200) -> List[List[DiffFile]]:
@@ -47,6 +57,98 @@ def chunk_diff_files(files: List[DiffFile], max_changes_per_chunk: int = 200) ->
     return chunks or [[]]
 
 
+def chunk_diff_files_by_tokens(
+    files: List[DiffFile],
+    max_prompt_tokens: int,
+    *,
+    header_tokens: int = 0,
+    estimator: TokenEstimator = estimate_tokens,
+) -> List[List[DiffFile]]:
+    """Split parsed diff files into deterministic chunks by estimated prompt tokens.
+
+    Every prompt line is estimated on its own and a chunk's cost is the sum
+    of those estimates plus ``header_tokens`` (the fixed prompt text from
+    ``build_prompt_header_lines``), so no chunk exceeds ``max_prompt_tokens``.
+
+    Strategy:
+    - Keep file order as provided.
+    - Pack consecutive files (or file pieces) until the budget is full.
+    - Split large files by hunk and oversized hunks by change lines.
+    - Truncate a single change line only when it cannot fit on its own.
+    """
+
+    budget = max_prompt_tokens - header_tokens
+    if budget <= 0:
+        raise ValueError("max_prompt_tokens must be larger than the prompt header")
+
+    if not files:
+        return [[]]
+
+    chunks: List[List[DiffFile]] = []
+    current: List[DiffFile] = []
+    current_tokens = 0
+
+    for file_obj in files:
+        for piece, piece_tokens in _split_file_by_tokens(file_obj, budget, estimator):
+            if current and current_tokens + piece_tokens > budget:
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def pack_diff_files(files: List[DiffFile], max_changes_per_chunk: int = 200) -> List[List[DiffFile]]:
+    """Bin-pack parsed diff files into as few chunks as possible by change count.
+
+    Same splitting rules and budget as ``chunk_diff_files``, but pieces are
+    placed with ``_bin_pack`` instead of in file order.
+    """
+
+    if max_changes_per_chunk <= 0:
+        raise ValueError("max_changes_per_chunk must be > 0")
+
+    if not files:
+        return [[]]
+
+    pieces = [
+        (piece, _file_change_count(piece))
+        for file_obj in files
+        for piece in _split_file(file_obj, max_changes_per_chunk)
+    ]
+    return _bin_pack(pieces, max_changes_per_chunk)
+
+
+def pack_diff_files_by_tokens(
+    files: List[DiffFile],
+    max_prompt_tokens: int,
+    *,
+    header_tokens: int = 0,
+    estimator: TokenEstimator = estimate_tokens,
+) -> List[List[DiffFile]]:
+    """Bin-pack parsed diff files into as few chunks as possible by prompt tokens.
+
+    Same splitting rules and budget as ``chunk_diff_files_by_tokens``, but
+    pieces are placed with ``_bin_pack`` instead of in file order.
+    """
+
+    budget = max_prompt_tokens - header_tokens
+    if budget <= 0:
+        raise ValueError("max_prompt_tokens must be larger than the prompt header")
+
+    if not files:
+        return [[]]
+
+    pieces = [piece for file_obj in files for piece in _split_file_by_tokens(file_obj, budget, estimator)]
+    return _bin_pack(pieces, budget)
+
+
 def build_change_summary(files: List[DiffFile], max_files: int = 8) -> List[str]:
     """Build deterministic, neutral change-summary bullets from parsed diff."""
 
@@ -123,8 +225,17 @@ def merge_chunk_markdowns(
     change_summary_lines: Optional[List[str]] = None,
     summary_prefix: Optional[str] = None,
     intent_summary: Optional[str] = None,
+    previous_markdown: Optional[str] = None,
+    skipped_chunks: int = 0,
 ) -> str:
-    """Merge chunk-level markdown results into one deterministic review."""
+    """Merge chunk-level markdown results into one deterministic review.
+
+    ``previous_markdown`` is an earlier review of the same PR (incremental
+    mode); its findings are kept after the new ones, minus duplicates, and
+    marked as not re-verified against the current code.
+    ``skipped_chunks`` counts chunks left unreviewed at the review deadline
+    and is reported in the summary when non-zero.
+    """
 
     findings: List[str] = []
     seen: set[str] = set()
@@ -137,11 +248,26 @@ def merge_chunk_markdowns(
             seen.add(normalized)
             findings.append(finding)
 
+    carried_over = 0
+    if previous_markdown:
+        for finding in previous_findings(previous_markdown):
+            normalized = _dedupe_key(_strip_carried_over_label(finding))
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            findings.append(finding)
+            carried_over += 1
+
     chunk_count = len(markdowns)
+    reviewed = f"Reviewed {chunk_count} chunk(s)"
+    if skipped_chunks:
+        reviewed += f"; skipped {skipped_chunks} chunk(s) at the review deadline"
     if findings:
-        stats = f"Reviewed {chunk_count} chunk(s). Kept {len(findings)} unique finding(s)."
+        stats = f"{reviewed}. Kept {len(findings)} unique finding(s)."
     else:
-        stats = f"Reviewed {chunk_count} chunk(s). No actionable findings after filtering."
+        stats = f"{reviewed}. No actionable findings after filtering."
+    if carried_over:
+        stats += f" Carried over {carried_over} finding(s) from the previous review."
     summary = f"{summary_prefix} {stats}".strip() if summary_prefix else stats
 
     out: List[str] = [
@@ -173,6 +299,31 @@ def merge_chunk_markdowns(
     return "\n".join(out).rstrip() + "\n"
 
 
+def previous_findings(previous_markdown: str) -> List[str]:
+    """Return the unique findings of an earlier review, in their original order.
+
+    Each is prefixed with ``CARRIED_OVER_LABEL``: an incremental diff does not
+    show whether the code a finding points at still exists or was fixed.
+    """
+
+    findings: List[str] = []
+    seen: set[str] = set()
+    for finding in _extract_findings(previous_markdown):
+        finding = _strip_carried_over_label(finding)
+        normalized = _dedupe_key(finding)
+        if normalized not in seen:
+            seen.add(normalized)
+            findings.append(f"{CARRIED_OVER_LABEL} {finding}")
+    return findings
+
+
+def _strip_carried_over_label(finding: str) -> str:
+    # A previous review may itself have carried findings over.
+    while finding.startswith(CARRIED_OVER_LABEL):
+        finding = finding[len(CARRIED_OVER_LABEL):].lstrip()
+    return finding
+
+
 def _split_file(file_obj: DiffFile, max_changes_per_chunk: int) -> List[DiffFile]:
     if not file_obj.hunks:
         return [file_obj]
@@ -211,39 +362,197 @@ def _split_hunk(hunk: DiffHunk, max_changes_per_chunk: int) -> List[DiffHunk]:
 
     while idx < len(hunk.changes):
         block = hunk.changes[idx : idx + max_changes_per_chunk]
-        block_old_start = cursor_old
-        block_new_start = cursor_new
-        old_len = 0
-        new_len = 0
-
-        for change in block:
-            if change.type.value == "add":
-                new_len += 1
-                cursor_new += 1
-            elif change.type.value == "remove":
-                old_len += 1
-                cursor_old += 1
-            else:
-                old_len += 1
-                new_len += 1
-                cursor_old += 1
-                cursor_new += 1
-
-        parts.append(
-            DiffHunk(
-                old_start=block_old_start,
-                old_length=old_len,
-                new_start=block_new_start,
-                new_length=new_len,
-                changes=list(block),
-            )
-        )
+        part = _hunk_part(block, cursor_old, cursor_new)
+        parts.append(part)
+        cursor_old = part.old_start + part.old_length
+        cursor_new = part.new_start + part.new_length
 
         idx += max_changes_per_chunk
 
     return parts
 
 
+def _hunk_part(block: Sequence[Change], old_start: int, new_start: int) -> DiffHunk:
+    old_len = 0
+    new_len = 0
+    for change in block:
+        if change.type.value == "add":
+            new_len += 1
+        elif change.type.value == "remove":
+            old_len += 1
+        else:
+            old_len += 1
+            new_len += 1
+
+    return DiffHunk(
+        old_start=old_start,
+        old_length=old_len,
+        new_start=new_start,
+        new_length=new_len,
+        changes=block,
+    )
+
+
+def _split_file_by_tokens(
+    file_obj: DiffFile,
+    budget: int,
+    estimator: TokenEstimator,
+) -> List[Tuple[DiffFile, int]]:
+    # "FILE: <path>" plus the blank line that closes every file block.
+    overhead = estimator(f"FILE: {file_obj.path}\n") + estimator("\n")
+    if overhead >= budget:
+        raise ValueError(f"max_prompt_tokens is too small to hold file '{file_obj.path}'")
+
+    if not file_obj.hunks:
+        return [(file_obj, overhead)]
+
+    pieces: List[Tuple[DiffFile, int]] = []
+    current_hunks: List[DiffHunk] = []
+    current_tokens = overhead
+
+    for hunk in file_obj.hunks:
+        for hunk_part, hunk_tokens in _split_hunk_by_tokens(hunk, budget - overhead, estimator):
+            if current_hunks and current_tokens + hunk_tokens > budget:
+                piece = DiffFile(path=file_obj.path, hunks=current_hunks, language=file_obj.language)
+                pieces.append((piece, current_tokens))
+                current_hunks = []
+                current_tokens = overhead
+
+            current_hunks.append(hunk_part)
+            current_tokens += hunk_tokens
+
+    if current_hunks:
+        piece = DiffFile(path=file_obj.path, hunks=current_hunks, language=file_obj.language)
+        pieces.append((piece, current_tokens))
+
+    return pieces
+
+
+def _split_hunk_by_tokens(
+    hunk: DiffHunk,
+    budget: int,
+    estimator: TokenEstimator,
+) -> List[Tuple[DiffHunk, int]]:
+    costs = [estimator(format_change(change) + "\n") for change in hunk.changes]
+    whole = estimator(format_hunk_header(hunk) + "\n") + sum(costs)
+    if whole <= budget:
+        return [(hunk, whole)]
+
+    # Sub-hunk headers never carry larger numbers than this one.
+    widest = DiffHunk(
+        old_start=hunk.old_start + hunk.old_length,
+        old_length=hunk.old_length,
+        new_start=hunk.new_start + hunk.new_length,
+        new_length=hunk.new_length,
+        changes=[],
+    )
+    header_bound = estimator(format_hunk_header(widest) + "\n")
+    line_budget = budget - header_bound
+    if line_budget <= 0:
+        raise ValueError("max_prompt_tokens is too small to hold a hunk header")
+
+    parts: List[Tuple[DiffHunk, int]] = []
+    cursor_old = hunk.old_start
+    cursor_new = hunk.new_start
+    idx = 0
+    total = len(costs)
+
+    while idx < total:
+        end = idx
+        block_tokens = 0
+        while end < total and block_tokens + costs[end] <= line_budget:
+            block_tokens += costs[end]
+            end += 1
+
+        if end == idx:
+            # A single line larger than the whole budget: keep a truncated copy.
+            block: Sequence[Change] = [_truncate_change(hunk.changes[idx], line_budget, estimator)]
+            block_tokens = estimator(format_change(block[0]) + "\n")
+            end = idx + 1
+        else:
+            block = hunk.changes[idx:end]
+
+        part = _hunk_part(block, cursor_old, cursor_new)
+        parts.append((part, estimator(format_hunk_header(part) + "\n") + block_tokens))
+        cursor_old = part.old_start + part.old_length
+        cursor_new = part.new_start + part.new_length
+        idx = end
+
+    return parts
+
+
+def _truncate_change(change: Change, budget: int, estimator: TokenEstimator) -> Change:
+    def cost(length: int) -> int:
+        truncated = Change(change.type, change.content[:length] + TRUNCATION_MARKER)
+        return estimator(format_change(truncated) + "\n")
+
+    if cost(0) > budget:
+        raise ValueError("max_prompt_tokens is too small to hold a single diff line")
+
+    low, high = 0, len(change.content)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if cost(mid) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return Change(change.type, change.content[:low] + TRUNCATION_MARKER)
+
+
+def _bin_pack(pieces: List[Tuple[DiffFile, int]], budget: int) -> List[List[DiffFile]]:
+    """Deterministic first-fit-decreasing packing, grouped by directory.
+
+    Pieces are placed largest first (ties broken by path, then input order).
+    Each piece goes into the first open chunk that already holds a piece from
+    the same directory and has room, else into the first chunk with room,
+    else into a new chunk. Pieces of one file that land in the same chunk
+    are merged back into a single file entry.
+    """
+
+    order = sorted(range(len(pieces)), key=lambda idx: (-pieces[idx][1], pieces[idx][0].path, idx))
+    bins: List[List[int]] = []
+    bin_sizes: List[int] = []
+    bin_dirs: List[set] = []
+
+    for idx in order:
+        piece, size = pieces[idx]
+        directory = posixpath.dirname(piece.path)
+        target = None
+        for bin_idx, used in enumerate(bin_sizes):
+            if used + size > budget:
+                continue
+            if directory in bin_dirs[bin_idx]:
+                target = bin_idx
+                break
+            if target is None:
+                target = bin_idx
+
+        if target is None:
+            bins.append([])
+            bin_sizes.append(0)
+            bin_dirs.append(set())
+            target = len(bins) - 1
+
+        bins[target].append(idx)
+        bin_sizes[target] += size
+        bin_dirs[target].add(directory)
+
+    # Restore input order inside and across chunks so output reads like the diff.
+    ordered_bins = sorted((sorted(members) for members in bins), key=lambda members: members[0])
+    return [_merge_pieces([pieces[idx][0] for idx in members]) for members in ordered_bins]
+
+
+def _merge_pieces(pieces: List[DiffFile]) -> List[DiffFile]:
+    merged: Dict[str, DiffFile] = {}
+    for piece in pieces:
+        existing = merged.get(piece.path)
+        if existing is None:
+            merged[piece.path] = DiffFile(path=piece.path, hunks=list(piece.hunks), language=piece.language)
+        else:
+            existing.hunks.extend(piece.hunks)
+    return list(merged.values())
+
+
 def _file_change_count(file_obj: DiffFile) -> int:
     return sum(len(hunk.changes) for hunk in file_obj.hunks)
 
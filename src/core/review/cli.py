@@ -2,19 +2,43 @@
 
 import argparse
 import json
+import os
 import sys
-from typing import Any, List
-
-from core.diff.filters import filter_diff_files
-from core.diff.parse_diff import parse_diff
-from core.diff.read_diff import DiffReadError, read_diff
+from itertools import chain
+from typing import Any, ContextManager, Iterable, Iterator, List, Optional, Tuple, Union
+
+from core.diff.filters import (
+    IGNORE_PATTERNS,
+    PathMatcher,
+    filter_diff_files,
+    get_path_matcher,
+    is_ignored_path,
+    parse_gitattributes,
+)
+from core.diff.parse_diff import iter_parse_diff
+from core.diff.read_diff import DiffReadError, map_diff_file, open_diff_stream
 from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
-from core.review.pipeline import run_review
+from core.review.cache import CACHE_DIR_ENV, DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, ReviewCache
+from core.review.memo import MEMO_DIR_ENV, ReviewMemo
 
 EXIT_OK = 0
 EXIT_RECOVERABLE = 1
 EXIT_FATAL = 2
 
+InputLine = Union[str, bytes]
+
+
+def run_review(files: List[DiffFile], **kwargs: Any) -> str:
+    """Call ``core.review.pipeline.run_review``, importing the pipeline on first use.
+
+    The pipeline is imported lazily so ``--help`` and argument errors stay
+    fast; adapters are imported by the registry only when requested.
+    """
+
+    from core.review.pipeline import run_review as pipeline_run_review
+
+    return pipeline_run_review(files, **kwargs)
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate AI review markdown from diff input.")
@@ -71,6 +95,82 @@ def build_parser() -> argparse.ArgumentParser:
         default="on",
         help="Fallback behavior when full-diff review fails.",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of fallback chunk reviews sent to the adapter at once.",
+    )
+    parser.add_argument(
+        "--chunk-planner",
+        choices=["greedy", "bin-pack"],
+        default="greedy",
+        help="How fallback chunks are formed: in diff order, or bin-packed to minimise model calls.",
+    )
+    parser.add_argument(
+        "--chunk-order",
+        choices=["diff", "risk"],
+        default="diff",
+        help="Order of fallback chunk reviews: diff order, or riskiest code first (auth, exec, SQL, ...).",
+    )
+    parser.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        default=None,
+        help="Prompt token limit used to skip full-diff review that cannot fit (default: adapter setting).",
+    )
+    parser.add_argument(
+        "--deadline-seconds",
+        type=float,
+        default=None,
+        help="Overall review time budget; chunks that cannot finish in time are skipped and reported.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv(CACHE_DIR_ENV, ""),
+        help=f"Directory for the on-disk review cache (default: ${CACHE_DIR_ENV}; unset disables caching).",
+    )
+    parser.add_argument(
+        "--memo-dir",
+        default=os.getenv(MEMO_DIR_ENV, ""),
+        help=(
+            f"Directory for per-piece review memo (default: ${MEMO_DIR_ENV}); "
+            "unchanged file pieces reuse earlier findings."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the review cache and piece memo even when directories are configured.",
+    )
+    parser.add_argument(
+        "--cache-ttl-seconds",
+        type=int,
+        default=DEFAULT_TTL_SECONDS,
+        help="Age after which cached review output is discarded.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Cache size above which least recently used entries are evicted.",
+    )
+    parser.add_argument(
+        "--previous-review",
+        default="",
+        help="Markdown of the previous review; its findings are merged in (for incremental diffs).",
+    )
+    parser.add_argument(
+        "--ignore-pattern",
+        action="append",
+        default=None,
+        help="Extra path glob to skip in addition to the built-in ignore patterns (repeatable).",
+    )
+    parser.add_argument(
+        "--gitattributes",
+        default="",
+        help="Path to a .gitattributes file; linguist-generated, -diff and binary entries are skipped.",
+    )
     return parser
 
 
@@ -85,18 +185,68 @@ def main(argv: List[str] | None = None) -> int:
         print("Error: --max-changes-per-chunk must be > 0", file=sys.stderr)
         return EXIT_FATAL
 
+    if args.max_concurrency <= 0:
+        print("Error: --max-concurrency must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    if args.max_prompt_tokens is not None and args.max_prompt_tokens <= 0:
+        print("Error: --max-prompt-tokens must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    if args.deadline_seconds is not None and args.deadline_seconds <= 0:
+        print("Error: --deadline-seconds must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    if args.cache_ttl_seconds <= 0:
+        print("Error: --cache-ttl-seconds must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    if args.cache_max_mb <= 0:
+        print("Error: --cache-max-mb must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    cache = None
+    memo = None
     try:
-        input_text = _read_input_text(args.from_file)
-    except DiffReadError as exc:
-        print(f"Error: {exc}", file=sys.stderr)
+        if args.cache_dir and not args.no_cache:
+            cache = _open_review_store(args.cache_dir, args)
+        if args.memo_dir and not args.no_cache:
+            memo = ReviewMemo(_open_review_store(args.memo_dir, args))
+    except OSError as exc:
+        print(f"Error: failed to open review cache directory ({exc})", file=sys.stderr)
         return EXIT_RECOVERABLE
 
-    if not input_text.strip():
-        print("Error: empty input", file=sys.stderr)
+    previous_markdown = None
+    if args.previous_review:
+        try:
+            with open(args.previous_review, "r", encoding="utf-8-sig") as handle:
+                previous_markdown = handle.read()
+        except OSError as exc:
+            print(f"Error: failed to read --previous-review file ({exc})", file=sys.stderr)
+            return EXIT_RECOVERABLE
+
+    try:
+        path_matcher = _build_path_matcher(args.ignore_pattern or [], args.gitattributes)
+    except OSError as exc:
+        print(f"Error: failed to read --gitattributes file ({exc})", file=sys.stderr)
         return EXIT_RECOVERABLE
 
     try:
-        files = _load_diff_files(input_text, input_format=args.input_format)
+        with _open_input_lines(args.from_file) as stream:
+            first_line, lines = _split_first_content_line(stream)
+            if not first_line:
+                print("Error: empty input", file=sys.stderr)
+                return EXIT_RECOVERABLE
+
+            files = _load_diff_files(
+                first_line,
+                lines,
+                input_format=args.input_format,
+                path_matcher=path_matcher,
+            )
+    except DiffReadError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RECOVERABLE
     except ValueError as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return EXIT_RECOVERABLE
@@ -115,36 +265,122 @@ def main(argv: List[str] | None = None) -> int:
             pr_body=args.pr_body,
             max_changes_per_chunk=args.max_changes_per_chunk,
             fallback_enabled=(args.fallback_mode == "on"),
+            max_concurrency=args.max_concurrency,
+            max_prompt_tokens=args.max_prompt_tokens,
+            deadline_seconds=args.deadline_seconds,
+            chunk_planner=args.chunk_planner,
+            chunk_order=args.chunk_order,
+            cache=cache,
+            memo=memo,
+            previous_markdown=previous_markdown,
         )
     except Exception as exc:
         print(f"Error: review generation failed ({exc})", file=sys.stderr)
         return EXIT_RECOVERABLE
 
+    if cache is not None:
+        stats = cache.stats
+        print(
+            f"Review cache: {stats.hits} hit(s), {stats.misses} miss(es), {stats.evictions} eviction(s)",
+            file=sys.stderr,
+        )
+    if memo is not None:
+        print(f"Review memo: {memo.reused} piece(s) reused, {memo.reviewed} reviewed", file=sys.stderr)
+
     print(output, end="")
     return EXIT_OK
 
 
-def _read_input_text(from_file: str) -> str:
+def _open_review_store(directory: str, args: argparse.Namespace) -> ReviewCache:
+    return ReviewCache(
+        directory,
+        ttl_seconds=args.cache_ttl_seconds,
+        max_bytes=args.cache_max_mb * 1024 * 1024,
+    )
+
+
+def _build_path_matcher(extra_patterns: List[str], gitattributes_path: str) -> Optional[PathMatcher]:
+    """Return a matcher for user-supplied ignore rules, or None to use the defaults."""
+
+    patterns = list(extra_patterns)
+    if gitattributes_path:
+        with open(gitattributes_path, "r", encoding="utf-8") as handle:
+            patterns.extend(parse_gitattributes(handle.read()))
+    if not patterns:
+        return None
+    return get_path_matcher([*IGNORE_PATTERNS, *patterns])
+
+
+def load_diff_text(
+    text: str,
+    *,
+    input_format: str = "auto",
+    path_matcher: Optional[PathMatcher] = None,
+) -> List[DiffFile]:
+    """Parse in-memory review input (raw diff or parsed JSON) like the CLI does.
+
+    Raises:
+        ValueError for empty or malformed input.
+    """
+
+    # Match ``map_diff_file``, which skips a UTF-8 BOM at the start of input files.
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    first_line, lines = _split_first_content_line(text.splitlines(keepends=True))
+    if not first_line:
+        raise ValueError("empty input")
+    return _load_diff_files(first_line, lines, input_format=input_format, path_matcher=path_matcher)
+
+
+def _open_input_lines(from_file: str) -> ContextManager[Iterable[InputLine]]:
+    # Files are memory-mapped so lines stay undecoded bytes until parsing keeps them.
     if from_file:
-        return read_diff(from_file=from_file)
-    return read_diff()
+        return map_diff_file(from_file)
+    return open_diff_stream()
+
+
+def _split_first_content_line(lines: Iterable[InputLine]) -> Tuple[InputLine, Iterator[InputLine]]:
+    """Return the first non-blank line and an iterator over the rest.
+
+    Leading blank lines carry no meaning for either input format, so they
+    are dropped instead of buffered.
+    """
+
+    remaining = iter(lines)
+    for line in remaining:
+        if line.strip():
+            return line, remaining
+    return "", remaining
 
 
-def _load_diff_files(input_text: str, *, input_format: str) -> List[DiffFile]:
+def _load_diff_files(
+    first_line: InputLine,
+    lines: Iterator[InputLine],
+    *,
+    input_format: str,
+    path_matcher: Optional[PathMatcher] = None,
+) -> List[DiffFile]:
     mode = input_format
     if mode == "auto":
-        mode = "parsed-json" if _looks_like_json(input_text) else "raw"
+        first_text = first_line.decode("utf-8", errors="replace") if isinstance(first_line, bytes) else first_line
+        mode = "parsed-json" if _looks_like_json(first_text) else "raw"
 
     if mode == "raw":
-        files = parse_diff(input_text)
-        return filter_diff_files(files)
+        # Ignored files (lockfiles, vendor/...) are skipped during parsing.
+        ignore_path = path_matcher or is_ignored_path
+        return list(iter_parse_diff(chain([first_line], lines), compact=True, ignore_path=ignore_path))
 
     if mode == "parsed-json":
         try:
-            data = json.loads(input_text)
+            # Joins with an empty value of the input's own type (str or bytes).
+            data = json.loads(first_line[:0].join(chain([first_line], lines)))
         except json.JSONDecodeError as exc:
             raise ValueError(f"Invalid parsed JSON input: {exc}") from exc
-        return _files_from_json(data)
+        files = _files_from_json(data)
+        # Parsed JSON is already filtered upstream; only user-supplied rules apply here.
+        if path_matcher is not None:
+            files = filter_diff_files(files, path_matcher)
+        return files
 
     raise ValueError(f"Unsupported input format: {input_format}")
 
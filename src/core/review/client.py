@@ -0,0 +1,236 @@
+"""Thin CLI client that submits review jobs to a running review server."""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from core.diff.read_diff import DiffReadError, read_diff
+from core.review.cli import EXIT_FATAL, EXIT_OK, EXIT_RECOVERABLE
+
+SERVER_URL_ENV = "PR_REVIEW_SERVER_URL"
+SERVER_SOCKET_ENV = "PR_REVIEW_SERVER_SOCKET"
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+DEFAULT_TIMEOUT_SECONDS = 600
+
+
+class ReviewServerError(Exception):
+    """Raised when the review server rejects a job or cannot be reached."""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def request_server(
+    method: str,
+    path: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    url: str = DEFAULT_SERVER_URL,
+    socket_path: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """Send one request to the review server and return its decoded JSON reply."""
+
+    if socket_path:
+        conn: http.client.HTTPConnection = _UnixHTTPConnection(socket_path, timeout)
+    else:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Review server URL must be http://host:port, got '{url}'.")
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        raw = response.read()
+    except (OSError, http.client.HTTPException) as exc:
+        raise ReviewServerError(f"review server unavailable ({exc})") from exc
+    finally:
+        conn.close()
+
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ReviewServerError(f"invalid review server reply ({exc})", response.status) from exc
+    if not 200 <= response.status < 300:
+        raise ReviewServerError(str(data.get("error", f"HTTP {response.status}")), response.status)
+    return data
+
+
+def submit_review(
+    job: Dict[str, Any],
+    *,
+    url: str = DEFAULT_SERVER_URL,
+    socket_path: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+) -> str:
+    """Submit a review job (``core.review.jobs.ReviewJob`` fields) and return its markdown."""
+
+    data = request_server("POST", "/review", job, url=url, socket_path=socket_path, timeout=timeout)
+    markdown = data.get("markdown")
+    if not isinstance(markdown, str):
+        raise ReviewServerError("review server reply did not contain markdown")
+    return markdown
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Submit a review job to a running review server.")
+    parser.add_argument(
+        "--server",
+        default=os.getenv(SERVER_URL_ENV, "") or DEFAULT_SERVER_URL,
+        help=f"Review server URL (default: ${SERVER_URL_ENV} or {DEFAULT_SERVER_URL}).",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.getenv(SERVER_SOCKET_ENV, ""),
+        help=f"UNIX socket of the review server, used instead of --server (default: ${SERVER_SOCKET_ENV}).",
+    )
+    parser.add_argument(
+        "--timeout-seconds",
+        type=float,
+        default=DEFAULT_TIMEOUT_SECONDS,
+        help="How long to wait for the review.",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=["auto", "raw", "parsed-json"],
+        default="auto",
+        help="Input mode: raw git diff, parsed JSON, or auto-detect.",
+    )
+    parser.add_argument("--from-file", default="", help="Read input from file path instead of stdin.")
+    parser.add_argument("--adapter", default="fake", help="Review adapter name (default: fake).")
+    parser.add_argument("--repository", default="", help="Repository identifier shown in prompt context.")
+    parser.add_argument("--base-ref", default="", help="Base ref shown in prompt context.")
+    parser.add_argument("--head-ref", default="", help="Head ref shown in prompt context.")
+    parser.add_argument("--pr-title", default="", help="Pull request title shown in prompt and intent.")
+    parser.add_argument("--pr-body", default="", help="Pull request description shown in prompt and intent.")
+    parser.add_argument(
+        "--max-changes-per-chunk",
+        type=int,
+        default=200,
+        help="Maximum number of diff changes per chunk.",
+    )
+    parser.add_argument(
+        "--fallback-mode",
+        choices=["on", "off"],
+        default="on",
+        help="Fallback behavior when full-diff review fails.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of fallback chunk reviews sent to the adapter at once.",
+    )
+    parser.add_argument(
+        "--chunk-planner",
+        choices=["greedy", "bin-pack"],
+        default="greedy",
+        help="How fallback chunks are formed: in diff order, or bin-packed to minimise model calls.",
+    )
+    parser.add_argument(
+        "--chunk-order",
+        choices=["diff", "risk"],
+        default="diff",
+        help="Order of fallback chunk reviews: diff order, or riskiest code first (auth, exec, SQL, ...).",
+    )
+    parser.add_argument(
+        "--max-prompt-tokens",
+        type=int,
+        default=None,
+        help="Prompt token limit used to skip full-diff review that cannot fit (default: adapter setting).",
+    )
+    parser.add_argument(
+        "--deadline-seconds",
+        type=float,
+        default=None,
+        help="Overall review time budget; chunks that cannot finish in time are skipped and reported.",
+    )
+    parser.add_argument(
+        "--previous-review",
+        default="",
+        help="Markdown of the previous review; its findings are merged in (for incremental diffs).",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as exc:
+        return int(exc.code)
+
+    try:
+        diff = read_diff(from_file=args.from_file or None)
+        previous_markdown = None
+        if args.previous_review:
+            with open(args.previous_review, "r", encoding="utf-8-sig") as handle:
+                previous_markdown = handle.read()
+    except (DiffReadError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RECOVERABLE
+
+    job = {
+        "diff": diff,
+        "input_format": args.input_format,
+        "adapter": args.adapter,
+        "repository": args.repository,
+        "base_ref": args.base_ref,
+        "head_ref": args.head_ref,
+        "pr_title": args.pr_title,
+        "pr_body": args.pr_body,
+        "max_changes_per_chunk": args.max_changes_per_chunk,
+        "fallback_enabled": args.fallback_mode == "on",
+        "max_concurrency": args.max_concurrency,
+        "max_prompt_tokens": args.max_prompt_tokens,
+        "deadline_seconds": args.deadline_seconds,
+        "chunk_planner": args.chunk_planner,
+        "chunk_order": args.chunk_order,
+        "previous_markdown": previous_markdown,
+    }
+
+    try:
+        output = submit_review(
+            job,
+            url=args.server,
+            socket_path=args.socket or None,
+            timeout=args.timeout_seconds,
+        )
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_FATAL
+    except ReviewServerError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return EXIT_RECOVERABLE
+
+    print(output, end="")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
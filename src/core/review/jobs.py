@@ -0,0 +1,218 @@
+"""Review jobs run by the long-running review server and batch mode."""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+from core.review.cache import ReviewCache
+from core.review.chunking import CHUNK_PLANNERS
+from core.review.cli import load_diff_text
+from core.review.memo import ReviewMemo
+from core.review.pipeline import run_review
+from core.review.risk import CHUNK_ORDERS
+
+INPUT_FORMATS = ("auto", "raw", "parsed-json")
+
+
+@dataclass(frozen=True)
+class ReviewJob:
+    """One review request: diff input, PR metadata and pipeline options."""
+
+    diff: str
+    input_format: str = "auto"
+    adapter: str = "fake"
+    repository: str = ""
+    base_ref: str = ""
+    head_ref: str = ""
+    pr_title: str = ""
+    pr_body: str = ""
+    max_changes_per_chunk: int = 200
+    fallback_enabled: bool = True
+    max_concurrency: int = 1
+    max_prompt_tokens: Optional[int] = None
+    deadline_seconds: Optional[float] = None
+    chunk_planner: str = "greedy"
+    chunk_order: str = "diff"
+    previous_markdown: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ReviewJob":
+        """Build a job from decoded JSON, raising ``ValueError`` for invalid fields."""
+
+        if not isinstance(data, dict):
+            raise ValueError("Review job must be a JSON object.")
+
+        known = {item.name: item for item in fields(cls)}
+        unknown = sorted(set(data) - set(known))
+        if unknown:
+            raise ValueError(f"Unknown review job field(s): {', '.join(unknown)}")
+        if not isinstance(data.get("diff"), str) or not data["diff"].strip():
+            raise ValueError("Review job must include non-empty string 'diff'.")
+
+        for name, value in data.items():
+            if value is None and name in _OPTIONAL_FIELDS:
+                continue
+            expected = _FIELD_TYPES[name]
+            # bool is an int subclass; do not accept true/false for numbers.
+            if not isinstance(value, expected) or (expected is not bool and isinstance(value, bool)):
+                raise ValueError(f"Review job field '{name}' has an invalid type.")
+
+        job = cls(**data)
+        if job.input_format not in INPUT_FORMATS:
+            raise ValueError(f"input_format must be one of: {', '.join(INPUT_FORMATS)}")
+        if job.chunk_planner not in CHUNK_PLANNERS:
+            raise ValueError(f"chunk_planner must be one of: {', '.join(CHUNK_PLANNERS)}")
+        if job.chunk_order not in CHUNK_ORDERS:
+            raise ValueError(f"chunk_order must be one of: {', '.join(CHUNK_ORDERS)}")
+        if job.max_changes_per_chunk <= 0:
+            raise ValueError("max_changes_per_chunk must be > 0")
+        if job.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be > 0")
+        if job.max_prompt_tokens is not None and job.max_prompt_tokens <= 0:
+            raise ValueError("max_prompt_tokens must be > 0")
+        if job.deadline_seconds is not None and job.deadline_seconds <= 0:
+            raise ValueError("deadline_seconds must be > 0")
+        return job
+
+
+_FIELD_TYPES: Dict[str, Any] = {
+    "diff": str,
+    "input_format": str,
+    "adapter": str,
+    "repository": str,
+    "base_ref": str,
+    "head_ref": str,
+    "pr_title": str,
+    "pr_body": str,
+    "max_changes_per_chunk": int,
+    "fallback_enabled": bool,
+    "max_concurrency": int,
+    "max_prompt_tokens": int,
+    "deadline_seconds": (int, float),
+    "chunk_planner": str,
+    "chunk_order": str,
+    "previous_markdown": str,
+}
+_OPTIONAL_FIELDS = {"max_prompt_tokens", "deadline_seconds", "previous_markdown"}
+
+
+@dataclass(frozen=True)
+class JobResult:
+    """Outcome of one job: markdown on success, error text on failure."""
+
+    markdown: Optional[str]
+    error: Optional[str]
+    elapsed_seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ReviewJobRunner:
+    """Bounded worker pool that runs review jobs against warm, shared state.
+
+    Adapters come from the process-wide registry, so SDK clients and HTTP
+    pools are reused across jobs; ``cache`` and ``memo`` are shared too.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        cache: Optional[ReviewCache] = None,
+        memo: Optional[ReviewMemo] = None,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be > 0")
+        self.workers = workers
+        self.cache = cache
+        self.memo = memo
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-job")
+
+    def submit(self, job: ReviewJob) -> "Future[str]":
+        with self._lock:
+            self.submitted += 1
+        return self._executor.submit(self._run, job)
+
+    def submit_result(self, job: ReviewJob) -> "Future[JobResult]":
+        """Like ``submit``, but the future resolves to a ``JobResult`` instead of raising."""
+
+        with self._lock:
+            self.submitted += 1
+        return self._executor.submit(self._run_result, job)
+
+    def run(self, job: ReviewJob) -> str:
+        """Run ``job`` on the pool and wait for its markdown."""
+
+        return self.submit(job).result()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "in_flight": self.submitted - finished,
+                "average_seconds": (self.total_seconds / finished) if finished else None,
+                "cache": self.cache.stats.as_dict() if self.cache is not None else None,
+                "memo": (
+                    {"reused": self.memo.reused, "reviewed": self.memo.reviewed}
+                    if self.memo is not None
+                    else None
+                ),
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run_result(self, job: ReviewJob) -> JobResult:
+        started = time.monotonic()
+        try:
+            markdown = self._run(job)
+        except Exception as exc:
+            error = str(exc) or type(exc).__name__
+            return JobResult(markdown=None, error=error, elapsed_seconds=time.monotonic() - started)
+        return JobResult(markdown=markdown, error=None, elapsed_seconds=time.monotonic() - started)
+
+    def _run(self, job: ReviewJob) -> str:
+        started = time.monotonic()
+        try:
+            files = load_diff_text(job.diff, input_format=job.input_format)
+            markdown = run_review(
+                files,
+                adapter_name=job.adapter,
+                repository=job.repository,
+                base_ref=job.base_ref,
+                head_ref=job.head_ref,
+                pr_title=job.pr_title,
+                pr_body=job.pr_body,
+                max_changes_per_chunk=job.max_changes_per_chunk,
+                fallback_enabled=job.fallback_enabled,
+                max_concurrency=job.max_concurrency,
+                max_prompt_tokens=job.max_prompt_tokens,
+                deadline_seconds=job.deadline_seconds,
+                chunk_planner=job.chunk_planner,
+                chunk_order=job.chunk_order,
+                cache=self.cache,
+                memo=self.memo,
+                previous_markdown=job.previous_markdown,
+            )
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+                self.total_seconds += time.monotonic() - started
+            raise
+        with self._lock:
+            self.completed += 1
+            self.total_seconds += time.monotonic() - started
+        return markdown
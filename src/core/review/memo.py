@@ -0,0 +1,61 @@
+"""Per-piece memo of reviewed diff content, reused across pushes to a PR."""
+
+import hashlib
+import threading
+from typing import Any, List, Optional
+
+from core.diff.types import DiffFile
+from core.review.cache import ReviewCache
+from core.review.model_adapter import ModelAdapter
+
+MEMO_DIR_ENV = "PR_REVIEW_MEMO_DIR"
+
+# Bump when the stored markdown or the key layout changes meaning.
+_MEMO_VERSION = b"piece-memo-v1"
+
+
+class ReviewMemo:
+    """Reviewed markdown per diff piece, keyed by content rather than position.
+
+    The key covers the adapter, model, file path and every change line of
+    the piece (context lines included) but not hunk line numbers, so a piece
+    shifted by edits elsewhere in the file still hits. PR title, body and
+    refs are deliberately excluded: a description-only edit reuses everything.
+    """
+
+    def __init__(self, cache: ReviewCache) -> None:
+        self.cache = cache
+        self.reused = 0
+        self.reviewed = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(adapter: ModelAdapter, files: List[DiffFile]) -> str:
+        digest = hashlib.sha256(_MEMO_VERSION)
+        for part in (getattr(adapter, "name", ""), str(getattr(adapter, "model", ""))):
+            _update(digest, part)
+        for file_obj in files:
+            _update(digest, "F" + file_obj.path)
+            for hunk in file_obj.hunks:
+                _update(digest, "H")
+                for change in hunk.changes:
+                    _update(digest, change.type.value[0] + change.content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        markdown = self.cache.get(key)
+        if markdown is not None:
+            with self._lock:
+                self.reused += 1
+        return markdown
+
+    def put(self, key: str, markdown: str) -> None:
+        with self._lock:
+            self.reviewed += 1
+        self.cache.put(key, markdown, metadata={"kind": "piece"})
+
+
+def _update(digest: Any, text: str) -> None:
+    encoded = text.encode("utf-8")
+    digest.update(len(encoded).to_bytes(8, "big"))
+    digest.update(encoded)
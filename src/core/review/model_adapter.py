@@ -9,4 +9,27 @@ class ModelAdapter(Protocol):
     name: str
 
     def generate_review(self, prompt: str) -> str:
-        """Return markdown review text for a given prompt."""
+        """Return markdown review text for a given prompt."""
+
+
+class AsyncModelAdapter(ModelAdapter, Protocol):
+    """Model adapter that can also generate reviews without blocking the event loop.
+
+    ``agenerate_review`` is optional: adapters without it are run in a
+    worker thread by ``agenerate``.
+    """
+
+    async def agenerate_review(self, prompt: str) -> str:
+        """Return markdown review text for a given prompt."""
+
+
+async def agenerate(adapter: ModelAdapter, prompt: str) -> str:
+    """Await ``adapter.agenerate_review`` when available, else run ``generate_review`` in a thread."""
+
+    # Imported here: asyncio is slow to import and sync-only callers never need it.
+    import asyncio
+
+    native = getattr(adapter, "agenerate_review", None)
+    if native is not None:
+        return await native(prompt)
+    return await asyncio.to_thread(adapter.generate_review, prompt)
@@ -1,6 +1,14 @@
 ﻿"""Normalize model output into stable PR-comment markdown."""
 
-from typing import List
+import re
+from typing import List, Optional
+
+# Streaming stop detection: any heading level, "Findings" in any case, and
+# "-", "*", "+" or numbered list markers (followed by whitespace, so "**bold**"
+# is not a bullet).
+_HEADING_PATTERN = re.compile(r"(#{1,6})\s+(.*?)\s*#*$")
+_FINDINGS_TITLE_PATTERN = re.compile(r"\**\s*findings\b", re.IGNORECASE)
+_BULLET_PATTERN = re.compile(r"(?:[-*+]|\d+[.)])\s+(.*)$")
 
 
 def normalize_review_markdown(raw: str) -> str:
@@ -36,6 +44,87 @@ def normalize_review_markdown(raw: str) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
+class StreamingReviewAccumulator:
+    """Collect streamed model output and detect when it can stop early.
+
+    Text is scanned line by line as it arrives. Generation can stop once the
+    findings section is complete: after a ``- No issues found.`` bullet, or
+    at the next heading of the same or a higher level than the findings
+    heading (``## Findings``, ``### findings:``, ...). Findings may wrap or
+    span several paragraphs; anything else is kept until the stream ends or
+    ``max_chars`` characters arrived. The heading that signalled completion
+    is dropped.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None) -> None:
+        if max_chars is not None and max_chars <= 0:
+            raise ValueError("max_chars must be > 0")
+        self.max_chars = max_chars
+        self.stop_reason: Optional[str] = None
+        self._parts: List[str] = []
+        self._pending = ""
+        self._line_start = 0
+        self._kept_chars = 0
+        self._total_chars = 0
+        self._findings_level: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self.stop_reason is not None
+
+    def feed(self, piece: str) -> bool:
+        """Add streamed text; return True once generation can stop."""
+
+        if self.done or not piece:
+            return self.done
+
+        if self.max_chars is not None and self._total_chars + len(piece) >= self.max_chars:
+            self._append(piece[: self.max_chars - self._total_chars])
+            if not self.done:
+                self._finish("max_chars", self._total_chars)
+            return True
+
+        self._append(piece)
+        return self.done
+
+    def text(self) -> str:
+        return "".join(self._parts)[: self._kept_chars if self.done else None]
+
+    def _append(self, piece: str) -> None:
+        self._parts.append(piece)
+        self._total_chars += len(piece)
+        self._pending += piece
+        while not self.done:
+            newline = self._pending.find("\n")
+            if newline < 0:
+                break
+            line = self._pending[:newline]
+            self._pending = self._pending[newline + 1 :]
+            self._scan_line(line, self._line_start)
+            self._line_start += newline + 1
+
+    def _scan_line(self, line: str, line_start: int) -> None:
+        stripped = line.strip()
+        heading = _HEADING_PATTERN.match(stripped)
+        if heading:
+            level = len(heading.group(1))
+            if _FINDINGS_TITLE_PATTERN.match(heading.group(2)):
+                self._findings_level = level
+            elif self._findings_level is not None and level <= self._findings_level:
+                self._finish("findings_complete", line_start)
+            return
+
+        if self._findings_level is None:
+            return
+        bullet = _BULLET_PATTERN.match(stripped)
+        if bullet and bullet.group(1).strip().rstrip(".").lower() == "no issues found":
+            self._finish("findings_complete", line_start + len(line) + 1)
+
+    def _finish(self, reason: str, kept_chars: int) -> None:
+        self.stop_reason = reason
+        self._kept_chars = kept_chars
+
+
 def _extract_summary(text: str) -> str:
     section = _extract_section(text, "summary")
     if section:
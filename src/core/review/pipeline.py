@@ -1,69 +1,149 @@
 ﻿"""Simple review pipeline for local execution and tests."""
 
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.diff.types import DiffFile
-from core.review.adapters.fake import FakeModelAdapter
-from core.review.adapters.ollama_adapter import (
-    AdapterConfigError as OllamaAdapterConfigError,
-    OllamaModelAdapter,
-)
-from core.review.adapters.openai_adapter import AdapterConfigError, OpenAIModelAdapter
-from core.review.adapters.openai_compat_adapter import (
-    AdapterConfigError as OpenAICompatAdapterConfigError,
-    OpenAICompatModelAdapter,
-)
+from core.review.adapter_registry import get_adapter
+from core.review.adapters.errors import is_context_length_error
+from core.review.cache import ReviewCache, agenerate_with_cache, generate_with_cache
 from core.review.chunking import (
+    CHUNK_PLANNERS,
     build_change_summary,
     build_intent_summary,
     build_pr_summary,
     chunk_diff_files,
+    chunk_diff_files_by_tokens,
     merge_chunk_markdowns,
+    pack_diff_files,
+    pack_diff_files_by_tokens,
+    previous_findings,
 )
+from core.review.memo import ReviewMemo
 from core.review.model_adapter import ModelAdapter
 from core.review.noise_filter import filter_review_markdown
 from core.review.output_normalizer import normalize_review_markdown
+from core.review.preflight import (
+    DEFAULT_SAFETY_RATIO,
+    PREFLIGHT_STATS,
+    PreflightDecision,
+    adapter_prompt_limit,
+    predict_full_review,
+)
 from core.review.prompt_builder import build_review_prompt
+from core.review.risk import CHUNK_ORDERS, HunkScores, order_chunks_by_risk, order_files_by_risk
+from core.review.tokens import estimate_header_tokens
 
 LOGGER = logging.getLogger(__name__)
 
 
-def _adapter_registry() -> Dict[str, ModelAdapter]:
-    registry: Dict[str, ModelAdapter] = {
-        "fake": FakeModelAdapter(),
-    }
+def run_review(
+    files: List[DiffFile],
+    *,
+    adapter_name: str = "fake",
+    repository: str = "",
+    base_ref: str = "",
+    head_ref: str = "",
+    max_changes_per_chunk: int = 200,
+    fallback_enabled: bool = True,
+    adapter_override: Optional[ModelAdapter] = None,
+    pr_title: str = "",
+    pr_body: str = "",
+    max_concurrency: int = 1,
+    max_prompt_tokens: Optional[int] = None,
+    chunk_planner: str = "greedy",
+    cache: Optional[ReviewCache] = None,
+    memo: Optional[ReviewMemo] = None,
+    previous_markdown: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    chunk_order: str = "diff",
+) -> str:
+    """Run review generation with full-diff then fallback orchestration.
 
-    try:
-        registry["openai"] = OpenAIModelAdapter.from_env()
-    except AdapterConfigError:
-        # OpenAI adapter is optional in local/test runs.
-        pass
+    ``max_concurrency`` bounds how many fallback chunk prompts are sent to
+    the adapter at once; merged findings keep chunk order regardless.
 
-    try:
-        registry["openai-compat"] = OpenAICompatModelAdapter.from_env()
-    except OpenAICompatAdapterConfigError:
-        # OpenAI-compatible adapter is optional in local/test runs.
-        pass
+    ``max_prompt_tokens`` overrides the adapter's own prompt limit. When a
+    limit is known and the estimated full prompt exceeds it, the full-diff
+    attempt is skipped and the review goes straight to chunked mode, where
+    chunks are packed by estimated tokens instead of ``max_changes_per_chunk``.
 
-    try:
-        registry["ollama"] = OllamaModelAdapter.from_env()
-    except OllamaAdapterConfigError:
-        # Ollama adapter is optional in local/test runs.
-        pass
+    ``chunk_planner`` selects how fallback chunks are formed: ``"greedy"``
+    keeps diff order (per file when no prompt limit is known), while
+    ``"bin-pack"`` packs pieces across files to minimise the number of calls.
 
-    return registry
+    When ``cache`` is given, raw model output is reused for prompts already
+    sent to the same adapter and model.
 
+    When ``memo`` is given and the review falls back to chunks, chunks are
+    planned per file and stored findings are reused for every piece whose
+    content is unchanged since an earlier run; only new or changed pieces
+    are sent to the adapter.
 
-def get_adapter(name: str) -> ModelAdapter:
-    registry = _adapter_registry()
-    if name not in registry:
-        known = ", ".join(sorted(registry.keys()))
-        raise ValueError(f"Unknown adapter '{name}'. Known adapters: {known}")
-    return registry[name]
+    ``previous_markdown`` is the review of an earlier head of the same PR
+    when ``files`` only hold the changes made since then; its findings are
+    merged after the new ones.
 
+    ``deadline_seconds`` caps the whole review. Fallback chunks are not
+    started once the deadline is too close to finish them (judged by the
+    slowest chunk so far), and model calls still running when it passes are
+    abandoned and counted as skipped; the merged review then covers the
+    chunks that completed and states how many were skipped.
 
-def run_review(
+    ``chunk_order`` is ``"diff"`` (planner order) or ``"risk"``: fallback
+    chunks are then reviewed, and their findings merged, riskiest first
+    (see ``core.review.risk``), so a deadline skips the least risky code.
+    """
+
+    review = _prepare_review(
+        files,
+        adapter_name=adapter_name,
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        max_changes_per_chunk=max_changes_per_chunk,
+        fallback_enabled=fallback_enabled,
+        adapter_override=adapter_override,
+        pr_title=pr_title,
+        pr_body=pr_body,
+        max_concurrency=max_concurrency,
+        max_prompt_tokens=max_prompt_tokens,
+        chunk_planner=chunk_planner,
+        cache=cache,
+        memo=memo,
+        previous_markdown=previous_markdown,
+        deadline_seconds=deadline_seconds,
+        chunk_order=chunk_order,
+    )
+
+    # Step 1: try single full-diff review first, unless it is predicted to overflow.
+    if review.attempt_full_review():
+        try:
+            full_output = _call_until(
+                lambda: _review_one_payload(files, adapter=review.adapter, **review.prompt_options),
+                review.deadline,
+            )
+        except Exception as exc:
+            review.full_review_failed(exc)
+        else:
+            return review.full_review_markdown(full_output)
+
+    # Step 2: fallback to chunk reviews.
+    chunk_results, skipped_chunks = _review_chunks(
+        review.plan_chunks(),
+        adapter=review.adapter,
+        max_concurrency=max_concurrency,
+        memo=memo,
+        deadline=review.deadline,
+        **review.prompt_options,
+    )
+    return review.chunked_review_markdown(chunk_results, skipped_chunks)
+
+
+async def arun_review(
     files: List[DiffFile],
     *,
     adapter_name: str = "fake",
@@ -75,70 +155,272 @@ def run_review(
     adapter_override: Optional[ModelAdapter] = None,
     pr_title: str = "",
     pr_body: str = "",
+    max_concurrency: int = 1,
+    max_prompt_tokens: Optional[int] = None,
+    chunk_planner: str = "greedy",
+    cache: Optional[ReviewCache] = None,
+    memo: Optional[ReviewMemo] = None,
+    previous_markdown: Optional[str] = None,
+    deadline_seconds: Optional[float] = None,
+    chunk_order: str = "diff",
 ) -> str:
-    """Run review generation with full-diff then fallback orchestration."""
+    """Async counterpart of ``run_review`` with the same options and output.
 
-    adapter = adapter_override if adapter_override is not None else get_adapter(adapter_name)
-    change_summary_lines = build_change_summary(files)
-    summary_prefix = build_pr_summary(files)
-    intent_summary = build_intent_summary(pr_title, pr_body)
+    Fallback chunk prompts are scheduled concurrently on the running event
+    loop, at most ``max_concurrency`` at a time. Adapters with an
+    ``agenerate_review`` method are awaited directly; others run in a
+    worker thread. With ``deadline_seconds`` the full-diff call and
+    in-flight chunk calls are cancelled when the deadline passes.
+    """
 
-    # Step 1: try single full-diff review first.
-    try:
-        full_output = _review_one_payload(
-            files,
-            adapter=adapter,
-            repository=repository,
-            base_ref=base_ref,
-            head_ref=head_ref,
-            pr_title=pr_title,
-            pr_body=pr_body,
-        )
-        return merge_chunk_markdowns(
-            [full_output],
-            change_summary_lines=change_summary_lines,
-            summary_prefix=summary_prefix,
-            intent_summary=intent_summary,
+    review = _prepare_review(
+        files,
+        adapter_name=adapter_name,
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        max_changes_per_chunk=max_changes_per_chunk,
+        fallback_enabled=fallback_enabled,
+        adapter_override=adapter_override,
+        pr_title=pr_title,
+        pr_body=pr_body,
+        max_concurrency=max_concurrency,
+        max_prompt_tokens=max_prompt_tokens,
+        chunk_planner=chunk_planner,
+        cache=cache,
+        memo=memo,
+        previous_markdown=previous_markdown,
+        deadline_seconds=deadline_seconds,
+        chunk_order=chunk_order,
+    )
+
+    if review.attempt_full_review():
+        try:
+            full_output = await _await_until(
+                _areview_one_payload(files, adapter=review.adapter, **review.prompt_options),
+                review.deadline,
+            )
+        except Exception as exc:
+            review.full_review_failed(exc)
+        else:
+            return review.full_review_markdown(full_output)
+
+    chunk_results, skipped_chunks = await _areview_chunks(
+        review.plan_chunks(),
+        adapter=review.adapter,
+        max_concurrency=max_concurrency,
+        memo=memo,
+        deadline=review.deadline,
+        **review.prompt_options,
+    )
+    return review.chunked_review_markdown(chunk_results, skipped_chunks)
+
+
+@dataclass
+class _PreparedReview:
+    """State shared by ``run_review`` and ``arun_review`` around their model calls."""
+
+    files: List[DiffFile]
+    adapter: ModelAdapter
+    preflight: PreflightDecision
+    prompt_limit: Optional[int]
+    deadline: Optional[float]
+    prompt_options: Dict[str, Any]
+    fallback_enabled: bool
+    chunk_planner: str
+    chunk_order: str
+    per_file: bool
+    max_changes_per_chunk: int
+    change_summary_lines: List[str]
+    summary_prefix: str
+    intent_summary: str
+    previous_markdown: Optional[str]
+
+    def attempt_full_review(self) -> bool:
+        """Return whether to send the full diff; records the skip when it is predicted to overflow."""
+
+        if not self.fallback_enabled:
+            return True
+        if not _deadline_allows(self.deadline, 0.0):
+            LOGGER.info("Skipping full-diff review: the review deadline has passed.")
+            return False
+        if self.preflight.fits:
+            return True
+        PREFLIGHT_STATS.record(self.preflight, full_review_succeeded=None)
+        LOGGER.info(
+            "Skipping full-diff review: estimated %d prompt tokens exceeds limit %d.",
+            self.preflight.estimated_tokens,
+            self.preflight.max_prompt_tokens,
         )
-    except Exception as exc:
-        if not fallback_enabled:
+        return False
+
+    def full_review_failed(self, exc: Exception) -> None:
+        # Only a context overflow says the size prediction was wrong.
+        overflowed = is_context_length_error(exc)
+        PREFLIGHT_STATS.record(self.preflight, full_review_succeeded=False if overflowed else None)
+        if not self.fallback_enabled:
             raise RuntimeError("Full-diff review failed and fallback mode is disabled.") from exc
         LOGGER.warning("Full-diff review failed, falling back to per-file mode: %s", exc)
 
-    # Step 2: fallback to per-file reviews, with chunking within each file if needed.
-    fallback_outputs: List[str] = []
-    for file_obj in files:
-        file_chunks = chunk_diff_files([file_obj], max_changes_per_chunk=max_changes_per_chunk)
-        for chunk in file_chunks:
-            try:
-                chunk_output = _review_one_payload(
-                    chunk,
-                    adapter=adapter,
-                    repository=repository,
-                    base_ref=base_ref,
-                    head_ref=head_ref,
-                    pr_title=pr_title,
-                    pr_body=pr_body,
-                )
-                fallback_outputs.append(chunk_output)
-            except Exception as exc:
-                LOGGER.warning("Fallback chunk review failed for file '%s': %s", file_obj.path, exc)
+    def full_review_markdown(self, full_output: str) -> str:
+        PREFLIGHT_STATS.record(self.preflight, full_review_succeeded=True)
+        return self._merge([full_output])
+
+    def plan_chunks(self) -> List[Tuple[str, List[DiffFile]]]:
+        return plan_fallback_chunks(
+            self.files,
+            chunk_planner=self.chunk_planner,
+            chunk_order=self.chunk_order,
+            per_file=self.per_file,
+            prompt_limit=self.prompt_limit,
+            max_changes_per_chunk=self.max_changes_per_chunk,
+            repository=self.prompt_options["repository"],
+            base_ref=self.prompt_options["base_ref"],
+            head_ref=self.prompt_options["head_ref"],
+            pr_title=self.prompt_options["pr_title"],
+            pr_body=self.prompt_options["pr_body"],
+        )
+
+    def chunked_review_markdown(self, chunk_results: List[Optional[str]], skipped_chunks: int) -> str:
+        fallback_outputs = [output for output in chunk_results if output is not None]
+        if fallback_outputs:
+            return self._merge(fallback_outputs, skipped_chunks=skipped_chunks)
 
-    if fallback_outputs:
+        # Step 3: controlled final fallback if everything failed.
+        return _unavailable_review_markdown(
+            self.change_summary_lines,
+            self.intent_summary,
+            skipped_chunks=skipped_chunks,
+            previous_markdown=self.previous_markdown,
+        )
+
+    def _merge(self, outputs: List[str], *, skipped_chunks: int = 0) -> str:
         return merge_chunk_markdowns(
-            fallback_outputs,
-            change_summary_lines=change_summary_lines,
-            summary_prefix=summary_prefix,
-            intent_summary=intent_summary,
+            outputs,
+            change_summary_lines=self.change_summary_lines,
+            summary_prefix=self.summary_prefix,
+            intent_summary=self.intent_summary,
+            previous_markdown=self.previous_markdown,
+            skipped_chunks=skipped_chunks,
         )
 
-    # Step 3: controlled final fallback if everything failed.
+
+def _prepare_review(
+    files: List[DiffFile],
+    *,
+    adapter_name: str,
+    repository: str,
+    base_ref: str,
+    head_ref: str,
+    max_changes_per_chunk: int,
+    fallback_enabled: bool,
+    adapter_override: Optional[ModelAdapter],
+    pr_title: str,
+    pr_body: str,
+    max_concurrency: int,
+    max_prompt_tokens: Optional[int],
+    chunk_planner: str,
+    cache: Optional[ReviewCache],
+    memo: Optional[ReviewMemo],
+    previous_markdown: Optional[str],
+    deadline_seconds: Optional[float],
+    chunk_order: str,
+) -> _PreparedReview:
+    """Validate options, resolve the adapter and run the pre-flight size check."""
+
+    _validate_review_options(
+        max_concurrency=max_concurrency,
+        max_prompt_tokens=max_prompt_tokens,
+        chunk_planner=chunk_planner,
+        deadline_seconds=deadline_seconds,
+        chunk_order=chunk_order,
+    )
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+
+    adapter = adapter_override if adapter_override is not None else get_adapter(adapter_name)
+    prompt_limit = max_prompt_tokens or adapter_prompt_limit(adapter)
+
+    # Step 0: predict whether the full diff can fit the model context at all.
+    preflight = predict_full_review(
+        files,
+        max_prompt_tokens=prompt_limit,
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        pr_title=pr_title,
+        pr_body=pr_body,
+    )
+
+    return _PreparedReview(
+        files=files,
+        adapter=adapter,
+        preflight=preflight,
+        prompt_limit=prompt_limit,
+        deadline=deadline,
+        prompt_options={
+            "repository": repository,
+            "base_ref": base_ref,
+            "head_ref": head_ref,
+            "pr_title": pr_title,
+            "pr_body": pr_body,
+            "cache": cache,
+        },
+        fallback_enabled=fallback_enabled,
+        chunk_planner=chunk_planner,
+        chunk_order=chunk_order,
+        per_file=memo is not None,
+        max_changes_per_chunk=max_changes_per_chunk,
+        change_summary_lines=build_change_summary(files),
+        summary_prefix=build_pr_summary(files),
+        intent_summary=build_intent_summary(pr_title, pr_body),
+        previous_markdown=previous_markdown,
+    )
+
+
+def _validate_review_options(
+    *,
+    max_concurrency: int,
+    max_prompt_tokens: Optional[int],
+    chunk_planner: str,
+    deadline_seconds: Optional[float] = None,
+    chunk_order: str = "diff",
+) -> None:
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be > 0")
+    if max_prompt_tokens is not None and max_prompt_tokens <= 0:
+        raise ValueError("max_prompt_tokens must be > 0")
+    if chunk_planner not in CHUNK_PLANNERS:
+        raise ValueError(f"chunk_planner must be one of: {', '.join(CHUNK_PLANNERS)}")
+    if deadline_seconds is not None and deadline_seconds <= 0:
+        raise ValueError("deadline_seconds must be > 0")
+    if chunk_order not in CHUNK_ORDERS:
+        raise ValueError(f"chunk_order must be one of: {', '.join(CHUNK_ORDERS)}")
+
+
+def _unavailable_review_markdown(
+    change_summary_lines: List[str],
+    intent_summary: str,
+    *,
+    skipped_chunks: int = 0,
+    previous_markdown: Optional[str] = None,
+) -> str:
     change_summary_block = "\n".join(change_summary_lines) if change_summary_lines else "- Not available."
+    summary = "Review could not be generated from model output."
+    if skipped_chunks:
+        summary = (
+            "Review could not be generated before the review deadline; "
+            f"skipped {skipped_chunks} chunk(s)."
+        )
+    # Findings of the previous review still apply to the unchanged code.
+    carried_over = previous_findings(previous_markdown) if previous_markdown else []
+    if carried_over:
+        summary += f" Carried over {len(carried_over)} finding(s) from the previous review."
+    findings_block = "\n".join(f"- {item}" for item in carried_over) or "- No issues found."
     return (
         "## AI Review\n"
         "\n"
         "### Summary\n"
-        "Review could not be generated from model output.\n"
+        f"{summary}\n"
         "\n"
         "### Intent\n"
         f"{intent_summary}\n"
@@ -147,10 +429,281 @@ def run_review(
         f"{change_summary_block}\n"
         "\n"
         "### Findings\n"
-        "- No issues found.\n"
+        f"{findings_block}\n"
     )
 
 
+def plan_fallback_chunks(
+    files: List[DiffFile],
+    *,
+    chunk_planner: str,
+    chunk_order: str = "diff",
+    per_file: bool = False,
+    prompt_limit: Optional[int],
+    max_changes_per_chunk: int,
+    repository: str,
+    base_ref: str,
+    head_ref: str,
+    pr_title: str,
+    pr_body: str,
+) -> List[Tuple[str, List[DiffFile]]]:
+    """Return ``(label, chunk)`` pairs for fallback review, labelled by file path(s).
+
+    ``per_file`` keeps every chunk within a single file regardless of planner,
+    which gives chunks a stable identity across runs for the piece memo.
+    ``chunk_order="risk"`` plans the riskiest files first and returns the
+    chunks riskiest first.
+    """
+
+    scores = None
+    if chunk_order == "risk":
+        # Shared so chunk ordering reuses the hunk scores computed for file ordering.
+        scores = HunkScores()
+        files = order_files_by_risk(files, scores)
+
+    if prompt_limit is not None:
+        # Token-packed chunks, sized against the same headroom as the pre-flight check.
+        header_tokens = estimate_header_tokens(
+            repository=repository,
+            base_ref=base_ref,
+            head_ref=head_ref,
+            pr_title=pr_title,
+            pr_body=pr_body,
+        )
+        planner = pack_diff_files_by_tokens if chunk_planner == "bin-pack" else chunk_diff_files_by_tokens
+        budget = int(prompt_limit * DEFAULT_SAFETY_RATIO)
+        if per_file:
+            chunks = [
+                chunk
+                for file_obj in files
+                for chunk in chunk_diff_files_by_tokens([file_obj], budget, header_tokens=header_tokens)
+            ]
+        else:
+            chunks = planner(files, budget, header_tokens=header_tokens)
+    elif chunk_planner == "bin-pack" and not per_file:
+        chunks = pack_diff_files(files, max_changes_per_chunk=max_changes_per_chunk)
+    else:
+        # Per-file reviews, with chunking within each file if needed.
+        chunks = [
+            chunk
+            for file_obj in files
+            for chunk in chunk_diff_files([file_obj], max_changes_per_chunk=max_changes_per_chunk)
+        ]
+
+    if chunk_order == "risk":
+        chunks = order_chunks_by_risk(chunks, scores)
+
+    return [(", ".join(dict.fromkeys(f.path for f in chunk)), chunk) for chunk in chunks if chunk]
+
+
+def _review_chunks(
+    chunks: List[Tuple[str, List[DiffFile]]],
+    *,
+    adapter: ModelAdapter,
+    max_concurrency: int,
+    repository: str,
+    base_ref: str,
+    head_ref: str,
+    pr_title: str,
+    pr_body: str,
+    cache: Optional[ReviewCache] = None,
+    memo: Optional[ReviewMemo] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Optional[str]], int]:
+    """Review fallback chunks, returning outputs in chunk order (None on failure).
+
+    Also returns how many chunks were skipped because ``deadline`` (a
+    ``time.monotonic`` value) left too little time to review them, including
+    calls abandoned when the deadline passed while they were running.
+    """
+
+    # Wall time of completed adapter calls; the slowest one predicts the next.
+    durations: List[float] = []
+
+    def review(chunk_index: int) -> Tuple[Optional[str], bool]:
+        path, chunk = chunks[chunk_index]
+        memo_key = None
+        if memo is not None:
+            memo_key = memo.make_key(adapter, chunk)
+            memoized = memo.get(memo_key)
+            if memoized is not None:
+                return memoized, False
+        if not _deadline_allows(deadline, max(durations, default=0.0)):
+            return None, True
+        started = time.monotonic()
+        try:
+            output = _call_until(
+                lambda: _review_one_payload(
+                    chunk,
+                    adapter=adapter,
+                    repository=repository,
+                    base_ref=base_ref,
+                    head_ref=head_ref,
+                    pr_title=pr_title,
+                    pr_body=pr_body,
+                    cache=cache,
+                ),
+                deadline,
+            )
+        except _DeadlineExceeded:
+            LOGGER.warning("Fallback chunk review for file '%s' abandoned at the review deadline.", path)
+            return None, True
+        except Exception as exc:
+            LOGGER.warning("Fallback chunk review failed for file '%s': %s", path, exc)
+            return None, False
+        finally:
+            durations.append(time.monotonic() - started)
+        if memo_key is not None:
+            memo.put(memo_key, output)
+        return output, False
+
+    workers = min(max_concurrency, len(chunks))
+    if workers <= 1:
+        results = [review(idx) for idx in range(len(chunks))]
+    else:
+        # Deferred import keeps single-worker runs (the CLI default) from paying for it.
+        from concurrent.futures import ThreadPoolExecutor
+
+        # executor.map yields results in submission order, keeping the merge deterministic.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-chunk") as executor:
+            results = list(executor.map(review, range(len(chunks))))
+    return _split_chunk_results(results)
+
+
+async def _areview_chunks(
+    chunks: List[Tuple[str, List[DiffFile]]],
+    *,
+    adapter: ModelAdapter,
+    max_concurrency: int,
+    repository: str,
+    base_ref: str,
+    head_ref: str,
+    pr_title: str,
+    pr_body: str,
+    cache: Optional[ReviewCache] = None,
+    memo: Optional[ReviewMemo] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Optional[str]], int]:
+    """Async counterpart of ``_review_chunks`` bounded by a semaphore.
+
+    Chunk calls still running when ``deadline`` passes are cancelled and
+    counted as skipped.
+    """
+
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    durations: List[float] = []
+
+    async def review(path: str, chunk: List[DiffFile]) -> Tuple[Optional[str], bool]:
+        memo_key = None
+        if memo is not None:
+            memo_key = memo.make_key(adapter, chunk)
+            memoized = memo.get(memo_key)
+            if memoized is not None:
+                return memoized, False
+        try:
+            async with semaphore:
+                if not _deadline_allows(deadline, max(durations, default=0.0)):
+                    return None, True
+                started = time.monotonic()
+                try:
+                    output = await _await_until(
+                        _areview_one_payload(
+                            chunk,
+                            adapter=adapter,
+                            repository=repository,
+                            base_ref=base_ref,
+                            head_ref=head_ref,
+                            pr_title=pr_title,
+                            pr_body=pr_body,
+                            cache=cache,
+                        ),
+                        deadline,
+                    )
+                finally:
+                    durations.append(time.monotonic() - started)
+        except _DeadlineExceeded:
+            LOGGER.warning("Fallback chunk review for file '%s' cancelled at the review deadline.", path)
+            return None, True
+        except Exception as exc:
+            LOGGER.warning("Fallback chunk review failed for file '%s': %s", path, exc)
+            return None, False
+        if memo_key is not None:
+            memo.put(memo_key, output)
+        return output, False
+
+    # gather returns results in argument order, keeping the merge deterministic.
+    results = await asyncio.gather(*(review(path, chunk) for path, chunk in chunks))
+    return _split_chunk_results(results)
+
+
+class _DeadlineExceeded(Exception):
+    """An adapter call was cancelled because the review deadline passed."""
+
+
+def _deadline_allows(deadline: Optional[float], expected_seconds: float) -> bool:
+    """Return True when a call expected to take ``expected_seconds`` can finish before ``deadline``."""
+
+    return deadline is None or time.monotonic() + expected_seconds < deadline
+
+
+def _call_until(func, deadline: Optional[float]):
+    """Return ``func()``, abandoning it with ``_DeadlineExceeded`` once ``deadline`` passes.
+
+    With a deadline the call runs in a daemon thread, since a blocking
+    adapter call cannot be interrupted; an abandoned call finishes (or hits
+    its own request timeout) in the background and its result is dropped.
+    """
+
+    if deadline is None:
+        return func()
+
+    outcome: Dict[str, Any] = {}
+    finished = threading.Event()
+
+    def call() -> None:
+        try:
+            outcome["result"] = func()
+        except BaseException as exc:  # re-raised in the caller's thread
+            outcome["error"] = exc
+        finally:
+            finished.set()
+
+    threading.Thread(target=call, name="review-call", daemon=True).start()
+    if not finished.wait(max(0.0, deadline - time.monotonic())):
+        raise _DeadlineExceeded()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+async def _await_until(awaitable, deadline: Optional[float]):
+    """Await ``awaitable``, cancelling it with ``_DeadlineExceeded`` once ``deadline`` passes.
+
+    A ``TimeoutError`` raised before the deadline (an adapter's own request
+    timeout) is re-raised so it counts as an ordinary chunk failure.
+    """
+
+    if deadline is None:
+        return await awaitable
+
+    import asyncio
+
+    try:
+        return await asyncio.wait_for(awaitable, max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError as exc:
+        if time.monotonic() < deadline:
+            raise
+        raise _DeadlineExceeded() from exc
+
+
+def _split_chunk_results(results: List[Tuple[Optional[str], bool]]) -> Tuple[List[Optional[str]], int]:
+    outputs = [output for output, _ in results]
+    skipped = sum(1 for _, was_skipped in results if was_skipped)
+    return outputs, skipped
+
+
 def _review_one_payload(
     files: List[DiffFile],
     *,
@@ -160,6 +713,31 @@ def _review_one_payload(
     head_ref: str,
     pr_title: str,
     pr_body: str,
+    cache: Optional[ReviewCache] = None,
+) -> str:
+    prompt = build_review_prompt(
+        files,
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        pr_title=pr_title,
+        pr_body=pr_body,
+    )
+    raw_output = generate_with_cache(adapter, prompt, cache)
+    normalized = normalize_review_markdown(raw_output)
+    return filter_review_markdown(normalized)
+
+
+async def _areview_one_payload(
+    files: List[DiffFile],
+    *,
+    adapter: ModelAdapter,
+    repository: str,
+    base_ref: str,
+    head_ref: str,
+    pr_title: str,
+    pr_body: str,
+    cache: Optional[ReviewCache] = None,
 ) -> str:
     prompt = build_review_prompt(
         files,
@@ -169,6 +747,6 @@ def _review_one_payload(
         pr_title=pr_title,
         pr_body=pr_body,
     )
-    raw_output = adapter.generate_review(prompt)
+    raw_output = await agenerate_with_cache(adapter, prompt, cache)
     normalized = normalize_review_markdown(raw_output)
     return filter_review_markdown(normalized)
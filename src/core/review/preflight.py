@@ -0,0 +1,141 @@
+"""Pre-flight prediction of whether a full-diff prompt fits the model context."""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from core.diff.types import DiffFile
+from core.review.model_adapter import ModelAdapter
+from core.review.tokens import TokenEstimator, estimate_prompt_tokens, estimate_tokens
+
+# Estimates are approximate; keep headroom below the hard limit.
+DEFAULT_SAFETY_RATIO = 0.9
+
+
+@dataclass(frozen=True)
+class PreflightDecision:
+    """Outcome of a pre-flight size check.
+
+    ``estimated_tokens`` is None when no limit is known (nothing to compare).
+    """
+
+    estimated_tokens: Optional[int]
+    max_prompt_tokens: Optional[int]
+    fits: bool
+
+    @property
+    def limit_known(self) -> bool:
+        return self.max_prompt_tokens is not None
+
+
+class PreflightStats:
+    """Thread-safe counters for tuning the pre-flight threshold.
+
+    A prediction is only scored when the full review is actually attempted,
+    so ``predicted_overflow`` counts skips whose correctness is unknown.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.predicted_fit_succeeded = 0
+        self.predicted_fit_failed = 0
+        self.predicted_overflow = 0
+        self.predicted_overflow_succeeded = 0
+        self.predicted_overflow_failed = 0
+
+    def record(self, decision: PreflightDecision, *, full_review_succeeded: Optional[bool]) -> None:
+        """Record one decision.
+
+        ``None`` means the full review was skipped, or failed for a reason
+        unrelated to prompt size; such outcomes do not score the prediction.
+        """
+
+        if not decision.limit_known:
+            return
+        with self._lock:
+            if decision.fits:
+                if full_review_succeeded is None:
+                    return
+                if full_review_succeeded:
+                    self.predicted_fit_succeeded += 1
+                else:
+                    self.predicted_fit_failed += 1
+            else:
+                self.predicted_overflow += 1
+                if full_review_succeeded is True:
+                    self.predicted_overflow_succeeded += 1
+                elif full_review_succeeded is False:
+                    self.predicted_overflow_failed += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.predicted_fit_succeeded = 0
+            self.predicted_fit_failed = 0
+            self.predicted_overflow = 0
+            self.predicted_overflow_succeeded = 0
+            self.predicted_overflow_failed = 0
+
+    def snapshot(self) -> Dict[str, Union[int, Optional[float]]]:
+        """Return counters plus accuracy over predictions that were verified."""
+
+        with self._lock:
+            correct = self.predicted_fit_succeeded + self.predicted_overflow_failed
+            wrong = self.predicted_fit_failed + self.predicted_overflow_succeeded
+            scored = correct + wrong
+            return {
+                "predicted_fit_succeeded": self.predicted_fit_succeeded,
+                "predicted_fit_failed": self.predicted_fit_failed,
+                "predicted_overflow": self.predicted_overflow,
+                "predicted_overflow_succeeded": self.predicted_overflow_succeeded,
+                "predicted_overflow_failed": self.predicted_overflow_failed,
+                "accuracy": (correct / scored) if scored else None,
+            }
+
+
+PREFLIGHT_STATS = PreflightStats()
+
+
+def adapter_prompt_limit(adapter: ModelAdapter) -> Optional[int]:
+    """Return the adapter's configured prompt token limit, if any."""
+
+    limit = getattr(adapter, "max_prompt_tokens", None)
+    if isinstance(limit, int) and limit > 0:
+        return limit
+    return None
+
+
+def predict_full_review(
+    files: List[DiffFile],
+    *,
+    max_prompt_tokens: Optional[int],
+    repository: str = "",
+    base_ref: str = "",
+    head_ref: str = "",
+    pr_title: str = "",
+    pr_body: str = "",
+    safety_ratio: float = DEFAULT_SAFETY_RATIO,
+    estimator: TokenEstimator = estimate_tokens,
+) -> PreflightDecision:
+    """Predict whether the full-diff prompt fits ``max_prompt_tokens``.
+
+    Without a known limit the prediction is always "fits", which keeps the
+    historical full-diff-first behaviour, and the prompt is not estimated.
+    """
+
+    if max_prompt_tokens is None:
+        return PreflightDecision(estimated_tokens=None, max_prompt_tokens=None, fits=True)
+    estimated = estimate_prompt_tokens(
+        files,
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        pr_title=pr_title,
+        pr_body=pr_body,
+        estimator=estimator,
+    )
+    fits = estimated <= int(max_prompt_tokens * safety_ratio)
+    return PreflightDecision(
+        estimated_tokens=estimated,
+        max_prompt_tokens=max_prompt_tokens,
+        fits=fits,
+    )
@@ -30,6 +30,32 @@ def build_review_prompt(
 ) -> str:
     """Build deterministic prompt text from parsed diff files."""
 
+    lines = build_prompt_header_lines(
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        pr_title=pr_title,
+        pr_body=pr_body,
+    )
+    if not files:
+        lines.append("(no changed files)")
+    else:
+        for file_obj in _sort_files(files):
+            lines.extend(format_file_block(file_obj))
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def build_prompt_header_lines(
+    *,
+    repository: str = "",
+    base_ref: str = "",
+    head_ref: str = "",
+    pr_title: str = "",
+    pr_body: str = "",
+) -> List[str]:
+    """Return the fixed prompt lines that precede the parsed diff."""
+
     lines: List[str] = []
     lines.append("You are a senior software engineer performing pull-request review.")
     lines.append("Focus only on actionable, high-signal findings.")
@@ -71,20 +97,23 @@ def build_review_prompt(
     lines.append("")
 
     lines.append("Parsed diff input:")
-    if not files:
-        lines.append("(no changed files)")
-    else:
-        for file_obj in _sort_files(files):
-            lines.append(f"FILE: {file_obj.path}")
-            for hunk in _sort_hunks(file_obj.hunks):
-                lines.append(
-                    f"HUNK: -{hunk.old_start},{hunk.old_length} +{hunk.new_start},{hunk.new_length}"
-                )
-                for change in hunk.changes:
-                    lines.append(_format_change(change))
-            lines.append("")
+    return lines
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def format_file_block(file_obj: DiffFile) -> List[str]:
+    """Return the prompt lines for one file, including the trailing blank line."""
+
+    lines = [f"FILE: {file_obj.path}"]
+    for hunk in _sort_hunks(file_obj.hunks):
+        lines.append(format_hunk_header(hunk))
+        for change in hunk.changes:
+            lines.append(format_change(change))
+    lines.append("")
+    return lines
+
+
+def format_hunk_header(hunk: DiffHunk) -> str:
+    return f"HUNK: -{hunk.old_start},{hunk.old_length} +{hunk.new_start},{hunk.new_length}"
 
 
 def _sort_files(files: List[DiffFile]) -> List[DiffFile]:
@@ -95,7 +124,7 @@ def _sort_hunks(hunks: List[DiffHunk]) -> List[DiffHunk]:
     return sorted(hunks, key=lambda hunk: (hunk.new_start, hunk.old_start))
 
 
-def _format_change(change: Change) -> str:
+def format_change(change: Change) -> str:
     if change.type.value == "add":
         return f"+ {change.content}"
     if change.type.value == "remove":
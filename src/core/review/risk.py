@@ -0,0 +1,281 @@
+"""Cheap, deterministic risk scoring for diff hunks.
+
+Scores combine the file path (auth code outranks tests and docs), the
+language, risky keywords in added lines (secrets, ``exec``, raw SQL, ...)
+and churn. They are only used to order fallback chunks so that, under a
+review deadline, the riskiest code is reviewed first; nothing is sent to a
+model and the same diff always gets the same order.
+"""
+
+import math
+import posixpath
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from core.diff.types import ChangeType, DiffFile, DiffHunk
+
+CHUNK_ORDERS = ("diff", "risk")
+
+# Keyword groups matched in added lines; each group counts at most
+# ``MAX_KEYWORD_HITS`` times per hunk so one noisy hunk cannot dominate.
+KEYWORD_WEIGHTS = {
+    "secret": 4.0,
+    "execution": 4.0,
+    "sql": 3.0,
+    "auth": 3.0,
+    "crypto": 3.0,
+    "unsafe": 2.0,
+}
+MAX_KEYWORD_HITS = 3
+
+
+_NOT_AFTER_WORD = "(?<![a-z0-9])"
+_NOT_BEFORE_WORD = "(?![a-z0-9])"
+
+
+def _word(alternatives: str) -> str:
+    # Whole identifier part: "os.exec" and "exec_file" match, "executor" does not.
+    return f"{_NOT_AFTER_WORD}(?:{alternatives}){_NOT_BEFORE_WORD}"
+
+
+# Added lines are split into tokens (identifiers with their dots and ``=``, so
+# ``shell=True`` stays one token) and each distinct token is classified once;
+# scanning every line with one large regex is far slower on big diffs.
+_TOKEN_PATTERN = re.compile(r"[\w.=]+")
+_SQL_STATEMENTS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "DROP", "ALTER", "TRUNCATE"})
+_KEYWORD_PATTERNS = (
+    ("secret", re.compile(r"password|passwd|secret|api_?key|private_?key|credential|access_?token")),
+    (
+        "execution",
+        re.compile(
+            r"pickle\.loads?|yaml\.load|shell=true|" + _word("exec|eval|system|popen|subprocess|spawn")
+        ),
+    ),
+    ("sql", re.compile(r"\.execute|executemany|" + _word("cursor|sql"))),
+    (
+        "auth",
+        re.compile(
+            r"authent|authori|oauth|permission|is_?admin|" + _word("auth|sudo|login|session|csrf|acl")
+        ),
+    ),
+    ("crypto", re.compile(r"crypt|verify=false|" + _word("md5|sha1|ssl|tls|cert|certs"))),
+    ("unsafe", re.compile(r"innerhtml|unsafe|rmtree|" + _word("chmod|0o?777"))),
+)
+# Most tokens match no group; one combined search rules them out before the
+# per-group searches that decide which group wins. Without the word-boundary
+# lookarounds it matches a superset of the groups at about half the cost.
+_ANY_KEYWORD = re.compile(
+    "|".join(
+        f"(?:{pattern.pattern})".replace(_NOT_AFTER_WORD, "").replace(_NOT_BEFORE_WORD, "")
+        for _, pattern in _KEYWORD_PATTERNS
+    )
+)
+
+# Path multipliers: security-sensitive areas up, tests/docs/vendored code down.
+SENSITIVE_PATH_FACTOR = 2.0
+LOW_RISK_PATH_FACTOR = 0.25
+
+_SENSITIVE_PATH = re.compile(
+    r"(?:^|/)(?:o?auth[nz]?|authentication|authorization|security|crypto\w*|secrets?|credentials?"
+    r"|permissions?|acl|login|sessions?|payments?|billing|migrations?|admin)(?:/|[._-]|$)"
+    r"|(?:^|/)\.github/workflows/|(?:^|/)dockerfile$"
+)
+_LOW_RISK_PATH = re.compile(
+    r"(?:^|/)(?:tests?|spec|__tests__|fixtures?|snapshots?|docs?|examples?|vendor|third_party|node_modules)/"
+    r"|(?:^|/)test_[^/]+$|_test\.\w+$|\.(?:spec|test)\.\w+$"
+)
+
+LANGUAGE_WEIGHTS = {
+    "python": 1.0,
+    "javascript": 1.0,
+    "typescript": 1.0,
+    "go": 1.0,
+    "java": 1.0,
+    "kotlin": 1.0,
+    "ruby": 1.0,
+    "rust": 1.0,
+    "csharp": 1.0,
+    "dockerfile": 1.0,
+    "c": 1.2,
+    "cpp": 1.2,
+    "php": 1.2,
+    "shell": 1.2,
+    "sql": 1.2,
+    "config": 0.6,
+    "docs": 0.2,
+    "lockfile": 0.1,
+}
+DEFAULT_LANGUAGE_WEIGHT = 0.8
+
+_EXTENSION_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".rb": "ruby",
+    ".rs": "rust",
+    ".cs": "csharp",
+    ".c": "c",
+    ".h": "c",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".php": "php",
+    ".sh": "shell",
+    ".bash": "shell",
+    ".sql": "sql",
+    ".yml": "config",
+    ".yaml": "config",
+    ".json": "config",
+    ".toml": "config",
+    ".ini": "config",
+    ".cfg": "config",
+    ".xml": "config",
+    ".md": "docs",
+    ".rst": "docs",
+    ".txt": "docs",
+    ".adoc": "docs",
+    ".lock": "lockfile",
+}
+_FILENAME_LANGUAGES = {
+    "dockerfile": "dockerfile",
+    "package-lock.json": "lockfile",
+    "pnpm-lock.yaml": "lockfile",
+    "go.sum": "lockfile",
+}
+
+
+def detect_language(path: str) -> Optional[str]:
+    """Guess the language of ``path`` from its file name or extension."""
+
+    name = posixpath.basename(path).lower()
+    if name in _FILENAME_LANGUAGES:
+        return _FILENAME_LANGUAGES[name]
+    return _EXTENSION_LANGUAGES.get(posixpath.splitext(name)[1])
+
+
+def path_factor(path: str) -> float:
+    """Multiplier for ``path``: sensitive areas above 1, tests and docs below."""
+
+    lowered = path.lower()
+    if _SENSITIVE_PATH.search(lowered):
+        return SENSITIVE_PATH_FACTOR
+    if _LOW_RISK_PATH.search(lowered):
+        return LOW_RISK_PATH_FACTOR
+    return 1.0
+
+
+def score_hunk(hunk: DiffHunk, *, path: str, language: Optional[str] = None) -> float:
+    """Risk score of one hunk; higher means review sooner.
+
+    ``(log2(1 + churn) + keyword score) * path factor * language weight``,
+    where the keyword score only looks at added lines.
+    """
+
+    added: List[str] = []
+    churn = 0
+    for change in hunk.changes:
+        if change.type is ChangeType.ADD:
+            added.append(change.content)
+            churn += 1
+        elif change.type is ChangeType.REMOVE:
+            churn += 1
+
+    hits = dict.fromkeys(KEYWORD_WEIGHTS, 0)
+    if added:
+        for token, count in Counter(_TOKEN_PATTERN.findall("\n".join(added))).items():
+            group = _keyword_group(token)
+            if group is not None:
+                hits[group] += count
+    keyword_score = sum(
+        weight * min(hits[group], MAX_KEYWORD_HITS) for group, weight in KEYWORD_WEIGHTS.items()
+    )
+
+    language_weight = LANGUAGE_WEIGHTS.get(
+        (language or detect_language(path) or "").lower(), DEFAULT_LANGUAGE_WEIGHT
+    )
+    return (math.log2(1 + churn) + keyword_score) * path_factor(path) * language_weight
+
+
+class HunkScores:
+    """Hunk scores memoised for one planning run.
+
+    Chunk planners keep the parsed hunk objects for every hunk they do not
+    split, so a hunk scored while ordering files is only looked up again
+    when the chunks cut from it are ordered; only split hunks are scored
+    per part. Keep an instance no longer than the diff it scored.
+    """
+
+    def __init__(self) -> None:
+        # Keyed by id(); the hunk is kept alongside so its id cannot be reused.
+        self._scores: Dict[int, Tuple[DiffHunk, float]] = {}
+
+    def hunk(self, hunk: DiffHunk, *, path: str, language: Optional[str] = None) -> float:
+        entry = self._scores.get(id(hunk))
+        if entry is None:
+            entry = (hunk, score_hunk(hunk, path=path, language=language))
+            self._scores[id(hunk)] = entry
+        return entry[1]
+
+    def file(self, file_obj: DiffFile) -> float:
+        return max(
+            (self.hunk(hunk, path=file_obj.path, language=file_obj.language) for hunk in file_obj.hunks),
+            default=0.0,
+        )
+
+
+def score_file(file_obj: DiffFile, scores: Optional[HunkScores] = None) -> float:
+    """Risk score of a file: the score of its riskiest hunk."""
+
+    return (scores or HunkScores()).file(file_obj)
+
+
+def score_chunk(chunk: List[DiffFile], scores: Optional[HunkScores] = None) -> float:
+    """Risk score of a review chunk: the score of its riskiest hunk.
+
+    Pieces of a split file are scored by their own hunks, so the piece
+    holding a file's risky hunk outranks the rest of that file.
+    """
+
+    scores = scores or HunkScores()
+    return max((scores.file(file_obj) for file_obj in chunk), default=0.0)
+
+
+def order_files_by_risk(files: List[DiffFile], scores: Optional[HunkScores] = None) -> List[DiffFile]:
+    """Return ``files`` riskiest first; ties keep diff order."""
+
+    scores = scores or HunkScores()
+    file_scores = [scores.file(file_obj) for file_obj in files]
+    order = sorted(range(len(files)), key=lambda idx: -file_scores[idx])
+    return [files[idx] for idx in order]
+
+
+def order_chunks_by_risk(
+    chunks: List[List[DiffFile]], scores: Optional[HunkScores] = None
+) -> List[List[DiffFile]]:
+    """Return ``chunks`` riskiest first; ties keep planner order."""
+
+    scores = scores or HunkScores()
+    chunk_scores = [score_chunk(chunk, scores) for chunk in chunks]
+    order = sorted(range(len(chunks)), key=lambda idx: -chunk_scores[idx])
+    return [chunks[idx] for idx in order]
+
+
+@lru_cache(maxsize=65536)
+def _keyword_group(token: str) -> Optional[str]:
+    if token in _SQL_STATEMENTS:
+        return "sql"
+    lowered = token.lower()
+    if not _ANY_KEYWORD.search(lowered):
+        return None
+    for group, pattern in _KEYWORD_PATTERNS:
+        if pattern.search(lowered):
+            return group
+    return None
@@ -0,0 +1,317 @@
+"""Long-running review server that keeps adapters warm between jobs.
+
+Jobs are JSON objects (see ``core.review.jobs.ReviewJob``) posted to
+``/review`` over localhost HTTP or a UNIX socket. ``/health`` and
+``/metrics`` report liveness and job counters.
+
+Requests must carry a loopback ``Host`` header, which keeps DNS-rebound
+pages out, and jobs must be posted as ``application/json``, which browsers
+cannot send cross-origin without a CORS preflight the server never grants.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+import stat
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from core.review.adapter_registry import ADAPTER_REGISTRY
+from core.review.cache import CACHE_DIR_ENV, DEFAULT_MAX_BYTES, DEFAULT_TTL_SECONDS, ReviewCache
+from core.review.cli import EXIT_FATAL, EXIT_OK, EXIT_RECOVERABLE
+from core.review.jobs import ReviewJob, ReviewJobRunner
+from core.review.memo import MEMO_DIR_ENV, ReviewMemo
+from core.review.preflight import PREFLIGHT_STATS
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+_LOOPBACK_HOSTS = {"127.0.0.1", "localhost"}
+_LOOPBACK_HOST_HEADERS = _LOOPBACK_HOSTS | {"[::1]"}
+
+
+class ReviewRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler for review jobs; connections are kept alive between jobs."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "pr-review-core"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - base class signature
+        LOGGER.debug(format, *args)
+
+    def do_GET(self) -> None:
+        if not self._check_host():
+            return
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._reply(
+                200,
+                {
+                    "uptime_seconds": time.monotonic() - self.server.started_at,
+                    "jobs": self.server.runner.snapshot(),
+                    "preflight": PREFLIGHT_STATS.snapshot(),
+                    "adapters": _adapter_snapshots(),
+                },
+            )
+        else:
+            self._reply(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self) -> None:
+        if self.path != "/review":
+            self._discard_body()
+            self._reply(404, {"error": f"Unknown path '{self.path}'."})
+            return
+        if not self._check_host():
+            return
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._reply(415, {"error": "Review jobs must be sent as application/json."}, close=True)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._reply(411, {"error": "Content-Length is required."}, close=True)
+            return
+        if length > MAX_REQUEST_BYTES:
+            self._reply(413, {"error": f"Review job exceeds {MAX_REQUEST_BYTES} bytes."}, close=True)
+            return
+
+        try:
+            job = ReviewJob.from_dict(json.loads(self.rfile.read(length).decode("utf-8")))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            self._reply(400, {"error": f"Invalid JSON body: {exc}"})
+            return
+        except ValueError as exc:
+            self._reply(400, {"error": str(exc)})
+            return
+
+        started = time.monotonic()
+        try:
+            markdown = self.server.runner.run(job)
+        except ValueError as exc:
+            # Malformed diff input or unknown adapter: the job itself is at fault.
+            self._reply(400, {"error": str(exc)})
+            return
+        except Exception as exc:
+            LOGGER.warning("Review job failed: %s", exc)
+            self._reply(500, {"error": f"review generation failed ({exc})"})
+            return
+        self._reply(200, {"markdown": markdown, "elapsed_seconds": time.monotonic() - started})
+
+    def _check_host(self) -> bool:
+        """Reply ``403`` unless the ``Host`` header names a loopback address."""
+
+        host = self.headers.get("Host", "").strip().lower()
+        # Drop the port; IPv6 literals keep their brackets.
+        hostname = host[: host.index("]") + 1] if host.startswith("[") and "]" in host else host.split(":")[0]
+        if hostname in _LOOPBACK_HOST_HEADERS:
+            return True
+        self._reply(403, {"error": f"Host '{host}' is not allowed."}, close=True)
+        return False
+
+    def _discard_body(self) -> None:
+        length = self.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) <= MAX_REQUEST_BYTES:
+            self.rfile.read(int(length))
+        else:
+            self.close_connection = True
+
+    def _reply(self, status: int, data: Dict[str, Any], close: bool = False) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ReviewHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Any, runner: ReviewJobRunner) -> None:
+        self.runner = runner
+        self.started_at = time.monotonic()
+        super().__init__(address, ReviewRequestHandler)
+
+
+class ReviewUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, runner: ReviewJobRunner) -> None:
+        self.runner = runner
+        self.started_at = time.monotonic()
+        super().__init__(path, ReviewRequestHandler)
+
+    def get_request(self) -> Any:
+        # UNIX peers have no address; BaseHTTPRequestHandler expects a (host, port) pair.
+        conn, _ = super().get_request()
+        return conn, ("unix", 0)
+
+
+def create_server(
+    runner: ReviewJobRunner,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Bind a review server on a UNIX socket, or on a loopback HTTP address."""
+
+    if socket_path:
+        _remove_stale_socket(socket_path)
+        # Only the owning user may submit jobs (and spend its model credentials). The
+        # socket is created 0600 rather than chmod-ed afterwards, so it is never open.
+        previous_umask = os.umask(0o177)
+        try:
+            return ReviewUnixServer(socket_path, runner)
+        finally:
+            os.umask(previous_umask)
+
+    if host not in _LOOPBACK_HOSTS:
+        raise ValueError(f"Review server only binds to loopback addresses, not '{host}'.")
+    return ReviewHTTPServer((host, port), runner)
+
+
+def _adapter_snapshots() -> Dict[str, Any]:
+    """Collect counters from the wrapper layers (rate limit, retry, ...) of cached adapters."""
+
+    snapshots = {}
+    for name, adapter in ADAPTER_REGISTRY.cached().items():
+        layers = {}
+        layer: Optional[Any] = adapter
+        while layer is not None:
+            key = getattr(type(layer), "metrics_key", None)
+            if key:
+                layers[key] = layer.snapshot()
+            # Read "inner" from the instance dict: wrappers forward unknown attributes.
+            layer = getattr(layer, "__dict__", {}).get("inner")
+        if layers:
+            snapshots[name] = layers
+    return snapshots
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"Refusing to replace non-socket file '{path}'.")
+    os.unlink(path)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve review jobs with warm adapters.")
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Loopback address to listen on (default: {DEFAULT_HOST}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"TCP port to listen on (default: {DEFAULT_PORT}; 0 picks a free port).",
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="Listen on this UNIX socket path instead of TCP.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Maximum number of review jobs processed at once.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv(CACHE_DIR_ENV, ""),
+        help=f"Directory for the on-disk review cache (default: ${CACHE_DIR_ENV}; unset disables caching).",
+    )
+    parser.add_argument(
+        "--memo-dir",
+        default=os.getenv(MEMO_DIR_ENV, ""),
+        help=f"Directory for per-piece review memo (default: ${MEMO_DIR_ENV}).",
+    )
+    parser.add_argument(
+        "--cache-ttl-seconds",
+        type=int,
+        default=DEFAULT_TTL_SECONDS,
+        help="Age after which cached review output is discarded.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Cache size above which least recently used entries are evicted.",
+    )
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as exc:
+        return int(exc.code)
+
+    if args.workers <= 0:
+        print("Error: --workers must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+    if args.cache_ttl_seconds <= 0 or args.cache_max_mb <= 0:
+        print("Error: --cache-ttl-seconds and --cache-max-mb must be > 0", file=sys.stderr)
+        return EXIT_FATAL
+
+    try:
+        cache = _open_store(args.cache_dir, args) if args.cache_dir else None
+        memo = ReviewMemo(_open_store(args.memo_dir, args)) if args.memo_dir else None
+    except OSError as exc:
+        print(f"Error: failed to open review cache directory ({exc})", file=sys.stderr)
+        return EXIT_RECOVERABLE
+
+    runner = ReviewJobRunner(workers=args.workers, cache=cache, memo=memo)
+    try:
+        server = create_server(runner, host=args.host, port=args.port, socket_path=args.socket or None)
+    except (OSError, ValueError) as exc:
+        runner.close()
+        print(f"Error: failed to start review server ({exc})", file=sys.stderr)
+        return EXIT_RECOVERABLE
+
+    where = args.socket or "http://{}:{}".format(*server.server_address[:2])
+    print(f"Review server listening on {where}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        runner.close()
+        if args.socket:
+            _remove_stale_socket(args.socket)
+    return EXIT_OK
+
+
+def _open_store(directory: str, args: argparse.Namespace) -> ReviewCache:
+    return ReviewCache(
+        directory,
+        ttl_seconds=args.cache_ttl_seconds,
+        max_bytes=args.cache_max_mb * 1024 * 1024,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
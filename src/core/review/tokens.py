@@ -0,0 +1,77 @@
+"""Cheap prompt-size estimates used to plan requests before sending them."""
+
+from typing import Callable, List
+
+from core.diff.types import DiffFile
+from core.review.prompt_builder import build_prompt_header_lines, format_file_block
+
+# Rough average for English text and source code with BPE tokenizers.
+CHARS_PER_TOKEN = 4
+
+TokenEstimator = Callable[[str], int]
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a fast, tokenizer-free token estimate for ``text``."""
+
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_lines_tokens(lines: List[str], estimator: TokenEstimator = estimate_tokens) -> int:
+    """Estimate tokens for prompt lines joined by newlines."""
+
+    # Each line is estimated on its own so callers can budget line by line;
+    # the per-line rounding makes the sum an upper bound of the joined text.
+    return sum(estimator(line + "\n") for line in lines)
+
+
+def estimate_header_tokens(
+    *,
+    repository: str = "",
+    base_ref: str = "",
+    head_ref: str = "",
+    pr_title: str = "",
+    pr_body: str = "",
+    estimator: TokenEstimator = estimate_tokens,
+) -> int:
+    """Estimate tokens for the fixed prompt text that precedes the diff."""
+
+    return estimate_lines_tokens(
+        build_prompt_header_lines(
+            repository=repository,
+            base_ref=base_ref,
+            head_ref=head_ref,
+            pr_title=pr_title,
+            pr_body=pr_body,
+        ),
+        estimator,
+    )
+
+
+def estimate_prompt_tokens(
+    files: List[DiffFile],
+    *,
+    repository: str = "",
+    base_ref: str = "",
+    head_ref: str = "",
+    pr_title: str = "",
+    pr_body: str = "",
+    estimator: TokenEstimator = estimate_tokens,
+) -> int:
+    """Estimate tokens of ``build_review_prompt`` output without building it."""
+
+    total = estimate_header_tokens(
+        repository=repository,
+        base_ref=base_ref,
+        head_ref=head_ref,
+        pr_title=pr_title,
+        pr_body=pr_body,
+        estimator=estimator,
+    )
+    if not files:
+        return total + estimator("(no changed files)\n")
+    for file_obj in files:
+        total += estimate_lines_tokens(format_file_block(file_obj), estimator)
+    return total
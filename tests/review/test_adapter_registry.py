@@ -0,0 +1,124 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from core.review.adapter_registry import (
+    AdapterRegistry,
+    get_adapter,
+    invalidate_adapters,
+)
+from core.review.adapters.fake import FakeModelAdapter
+
+_OLLAMA_ENV = {
+    "OLLAMA_BASE_URL": "http://localhost:11434",
+    "OLLAMA_MODEL": "qwen3:32b",
+}
+
+
+class _CountingFactory:
+    def __init__(self, configured: bool = True) -> None:
+        self.configured = configured
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        return FakeModelAdapter(name="counted") if self.configured else None
+
+
+class AdapterRegistryTest(unittest.TestCase):
+    def test_factories_run_only_when_requested(self) -> None:
+        registry = AdapterRegistry()
+        wanted, other = _CountingFactory(), _CountingFactory()
+        registry.register("wanted", wanted)
+        registry.register("other", other)
+
+        first = registry.get("wanted")
+        second = registry.get("wanted")
+
+        self.assertIs(first, second)
+        self.assertEqual(wanted.calls, 1)
+        self.assertEqual(other.calls, 0)
+
+    def test_unconfigured_adapter_is_retried_on_next_lookup(self) -> None:
+        registry = AdapterRegistry()
+        factory = _CountingFactory(configured=False)
+        registry.register("late", factory)
+
+        with self.assertRaises(ValueError):
+            registry.get("late")
+        factory.configured = True
+
+        self.assertEqual(registry.get("late").name, "counted")
+
+    def test_unknown_adapter_lists_configured_names(self) -> None:
+        registry = AdapterRegistry()
+        registry.register("b", _CountingFactory())
+        registry.register("a", _CountingFactory())
+        registry.register("missing", _CountingFactory(configured=False))
+
+        with self.assertRaises(ValueError) as ctx:
+            registry.get("nope")
+
+        self.assertEqual(str(ctx.exception), "Unknown adapter 'nope'. Known adapters: a, b")
+
+    def test_invalidate_and_register_drop_cached_instances(self) -> None:
+        registry = AdapterRegistry()
+        factory = _CountingFactory()
+        registry.register("x", factory)
+        first = registry.get("x")
+
+        registry.invalidate("x")
+        second = registry.get("x")
+        registry.register("x", factory)
+        third = registry.get("x")
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(second, third)
+        self.assertEqual(factory.calls, 3)
+
+    def test_concurrent_lookups_build_once(self) -> None:
+        registry = AdapterRegistry()
+        factory = _CountingFactory()
+        registry.register("x", factory)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(registry.get("x"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(factory.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+class SharedAdapterRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_adapters()
+        self.addCleanup(invalidate_adapters)
+
+    def test_configured_adapter_is_reused_with_its_client(self) -> None:
+        with patch.dict(os.environ, _OLLAMA_ENV, clear=True):
+            adapter = get_adapter("ollama")
+        adapter.warm_marker = object()
+
+        with patch.dict(os.environ, {}, clear=True):
+            again = get_adapter("ollama")
+
+        self.assertIs(again, adapter)
+        self.assertIs(again.warm_marker, adapter.warm_marker)
+
+    def test_invalidate_rebuilds_from_current_env(self) -> None:
+        with patch.dict(os.environ, _OLLAMA_ENV, clear=True):
+            self.assertEqual(get_adapter("ollama").model, "qwen3:32b")
+        with patch.dict(os.environ, {**_OLLAMA_ENV, "OLLAMA_MODEL": "llama3"}, clear=True):
+            self.assertEqual(get_adapter("ollama").model, "qwen3:32b")
+            invalidate_adapters("ollama")
+            self.assertEqual(get_adapter("ollama").model, "llama3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from dataclasses import dataclass, field
+from typing import List
+
+from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review.adapters.fake import FakeModelAdapter
+from core.review.cache import ReviewCache
+from core.review.model_adapter import agenerate
+from core.review.pipeline import arun_review, run_review
+
+
+def _files(count: int = 3) -> List[DiffFile]:
+    return [
+        DiffFile(
+            path=f"src/m{idx}.py",
+            hunks=[
+                DiffHunk(
+                    old_start=1,
+                    old_length=1,
+                    new_start=1,
+                    new_length=2,
+                    changes=[
+                        Change(ChangeType.CONTEXT, f"def m{idx}():"),
+                        Change(ChangeType.ADD, f"    return {idx}"),
+                    ],
+                )
+            ],
+        )
+        for idx in range(count)
+    ]
+
+
+def _chunk_review(path: str) -> str:
+    return (
+        "## AI Review\n\n"
+        "### Summary\n"
+        "Chunk.\n\n"
+        "### Findings\n"
+        f"- Missing auth guard before token use in `{path}`.\n"
+    )
+
+
+@dataclass
+class AsyncChunkAdapter:
+    """Fails the full review; chunk reviews are awaited and finish in reverse order."""
+
+    name: str = "async-chunks"
+    sync_calls: int = 0
+    calls: int = 0
+    active: int = 0
+    max_active: int = 0
+    prompts: List[str] = field(default_factory=list)
+
+    def generate_review(self, prompt: str) -> str:
+        self.sync_calls += 1
+        raise AssertionError("arun_review must use agenerate_review")
+
+    async def agenerate_review(self, prompt: str) -> str:
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("simulated full review failure")
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        path = next(line[len("FILE: "):] for line in prompt.splitlines() if line.startswith("FILE: "))
+        # Earlier files wait longer so completion order differs from chunk order.
+        await asyncio.sleep(0.03 - 0.01 * int(path[-4]))
+        self.active -= 1
+        return _chunk_review(path)
+
+
+class AsyncPipelineTest(unittest.TestCase):
+    def test_sync_only_adapter_matches_run_review(self) -> None:
+        files = _files()
+
+        self.assertEqual(
+            asyncio.run(arun_review(files, adapter_override=FakeModelAdapter())),
+            run_review(files, adapter_override=FakeModelAdapter()),
+        )
+
+    def test_chunks_are_awaited_concurrently_in_order(self) -> None:
+        adapter = AsyncChunkAdapter()
+
+        output = asyncio.run(arun_review(_files(), adapter_override=adapter, max_concurrency=3))
+
+        self.assertEqual(adapter.sync_calls, 0)
+        self.assertEqual(adapter.max_active, 3)
+        self.assertIn("Reviewed 3 chunk(s).", output)
+        positions = [output.index(f"token use in `src/m{idx}.py`") for idx in range(3)]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_max_concurrency_bounds_in_flight_chunks(self) -> None:
+        adapter = AsyncChunkAdapter()
+
+        asyncio.run(arun_review(_files(5), adapter_override=adapter, max_concurrency=2))
+
+        self.assertEqual(adapter.max_active, 2)
+        self.assertEqual(len(adapter.prompts), 5)
+
+    def test_cache_serves_repeated_async_prompts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ReviewCache(tmp)
+            first = asyncio.run(arun_review(_files(), adapter_override=AsyncChunkAdapter(), cache=cache))
+            adapter = AsyncChunkAdapter()
+
+            second = asyncio.run(arun_review(_files(), adapter_override=adapter, cache=cache))
+
+        self.assertEqual(second, first)
+        self.assertEqual(adapter.calls, 1)
+        self.assertEqual(adapter.prompts, [])
+
+    def test_deadline_cancels_in_flight_chunks(self) -> None:
+        class _HangingChunkAdapter(AsyncChunkAdapter):
+            async def agenerate_review(self, prompt: str) -> str:
+                if self.calls == 0:
+                    return await super().agenerate_review(prompt)
+                self.calls += 1
+                await asyncio.sleep(5)
+                return ""
+
+        adapter = _HangingChunkAdapter()
+        started = time.monotonic()
+
+        output = asyncio.run(
+            arun_review(_files(), adapter_override=adapter, max_concurrency=3, deadline_seconds=0.1)
+        )
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(adapter.calls, 4)
+        self.assertIn("before the review deadline; skipped 3 chunk(s).", output)
+
+    def test_adapter_timeout_before_deadline_is_a_failure_not_a_skip(self) -> None:
+        class _TimingOutChunkAdapter(AsyncChunkAdapter):
+            async def agenerate_review(self, prompt: str) -> str:
+                if self.calls == 0:
+                    return await super().agenerate_review(prompt)
+                self.calls += 1
+                if "src/m0.py" in prompt:
+                    raise asyncio.TimeoutError("request timed out")
+                return _chunk_review("src/m1.py")
+
+        output = asyncio.run(
+            arun_review(_files(2), adapter_override=_TimingOutChunkAdapter(), deadline_seconds=600)
+        )
+
+        self.assertNotIn("review deadline", output)
+        self.assertIn("token use in `src/m1.py`", output)
+
+    def test_invalid_options_raise(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(arun_review(_files(), adapter_override=FakeModelAdapter(), max_concurrency=0))
+
+
+class AgenerateTest(unittest.TestCase):
+    def test_falls_back_to_thread_for_sync_adapters(self) -> None:
+        output = asyncio.run(agenerate(FakeModelAdapter(), "prompt"))
+
+        self.assertIn("## AI Review", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from core.review import batch, cli
+from core.review.batch import read_manifest, run_batch
+from core.review.jobs import ReviewJobRunner
+
+FIXTURE = Path(__file__).parent / "fixtures" / "raw_small.diff"
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "one.diff").write_text(FIXTURE.read_text(encoding="utf-8"), encoding="utf-8")
+        (self.root / "broken.diff").write_text("[not json", encoding="utf-8")
+
+    def _manifest(self, *lines: str) -> str:
+        path = self.root / "manifest.jsonl"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return str(path)
+
+    def _run_main(self, argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = batch.main(argv)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return code, records, stderr.getvalue()
+
+    def test_results_keep_manifest_order_and_match_cli_output(self) -> None:
+        entry = {"diff_path": "one.diff", "pr_title": "Add hello"}
+        manifest = self._manifest(*(json.dumps({"id": f"pr-{n}", **entry}) for n in range(5)))
+        cli_out = io.StringIO()
+        with redirect_stdout(cli_out), redirect_stderr(io.StringIO()):
+            cli.main(["--from-file", str(FIXTURE), "--pr-title", "Add hello"])
+
+        code, records, stderr = self._run_main([manifest, "--workers", "2"])
+
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual([record["id"] for record in records], [f"pr-{n}" for n in range(5)])
+        for record in records:
+            self.assertEqual(record["status"], "ok")
+            self.assertIsInstance(record["elapsed_seconds"], float)
+            self.assertEqual(record["markdown"], cli_out.getvalue())
+        self.assertIn("5 item(s), 5 succeeded, 0 failed", stderr)
+
+    def test_failures_are_reported_per_item(self) -> None:
+        manifest = self._manifest(
+            json.dumps({"id": "good", "diff_path": "one.diff"}),
+            "{not json",
+            json.dumps({"id": "missing", "diff_path": "nope.diff"}),
+            json.dumps({"id": "broken", "diff_path": "broken.diff", "input_format": "parsed-json"}),
+            json.dumps({"id": "good", "diff_path": "one.diff"}),
+            json.dumps({"id": "extra", "diff_path": "one.diff", "unexpected": 1}),
+        )
+
+        code, records, stderr = self._run_main([manifest])
+
+        self.assertEqual(code, cli.EXIT_RECOVERABLE)
+        self.assertEqual(
+            [(record["id"], record["status"]) for record in records],
+            [
+                ("good", "ok"),
+                ("line-2", "error"),
+                ("missing", "error"),
+                ("broken", "error"),
+                ("good", "error"),
+                ("extra", "error"),
+            ],
+        )
+        self.assertIn("Duplicate manifest id", records[4]["error"])
+        self.assertIn("1 succeeded, 5 failed", stderr)
+
+    def test_output_dir_receives_one_file_per_item(self) -> None:
+        manifest = self._manifest(json.dumps({"id": "org/repo#1", "diff_path": "one.diff"}))
+        out_dir = self.root / "reviews"
+        results = self.root / "results.jsonl"
+
+        with redirect_stderr(io.StringIO()):
+            code = batch.main([manifest, "--output-dir", str(out_dir), "--results", str(results)])
+
+        self.assertEqual(code, cli.EXIT_OK)
+        (record,) = [json.loads(line) for line in results.read_text(encoding="utf-8").splitlines()]
+        self.assertNotIn("markdown", record)
+        self.assertEqual(os.path.basename(record["output_path"]), "org_repo_1.md")
+        self.assertIn("`src/app.py`", Path(record["output_path"]).read_text(encoding="utf-8"))
+
+    def test_ids_that_sanitize_alike_get_distinct_files(self) -> None:
+        ids = ("a/b", "a b", "a_b", "A_B")
+        manifest = self._manifest(*(json.dumps({"id": item_id, "diff_path": "one.diff"}) for item_id in ids))
+        out_dir = self.root / "reviews"
+
+        code, records, _ = self._run_main([manifest, "--output-dir", str(out_dir)])
+
+        self.assertEqual(code, cli.EXIT_OK)
+        self.assertEqual(
+            [os.path.basename(record["output_path"]) for record in records],
+            ["a_b.md", "a_b-2.md", "a_b-3.md", "A_B-4.md"],
+        )
+        self.assertEqual(len(os.listdir(out_dir)), 4)
+
+    def test_manifest_defaults_are_overridden_per_item(self) -> None:
+        manifest = self._manifest(json.dumps({"diff_path": "one.diff", "chunk_planner": "bin-pack"}))
+
+        (item,) = list(read_manifest(manifest, defaults={"chunk_planner": "greedy", "max_concurrency": 3}))
+
+        self.assertEqual(item.item_id, "line-1")
+        self.assertEqual(item.job.chunk_planner, "bin-pack")
+        self.assertEqual(item.job.max_concurrency, 3)
+
+    def test_run_batch_reads_manifest_lazily(self) -> None:
+        manifest = self._manifest(*(json.dumps({"diff_path": "one.diff"}) for _ in range(20)))
+        consumed = []
+
+        def items():
+            for item in read_manifest(manifest):
+                consumed.append(item.item_id)
+                yield item
+
+        runner = ReviewJobRunner(workers=1)
+        self.addCleanup(runner.close)
+        consumed_at_write = []
+
+        class _Results(io.StringIO):
+            def write(self, text: str) -> int:
+                consumed_at_write.append(len(consumed))
+                return super().write(text)
+
+        summary = run_batch(items(), runner, results=_Results())
+
+        self.assertEqual(summary.succeeded, 20)
+        self.assertLessEqual(consumed_at_write[0], runner.workers * 2 + 1)
+
+    def test_missing_manifest_is_fatal(self) -> None:
+        code, records, stderr = self._run_main([str(self.root / "absent.jsonl")])
+
+        self.assertEqual(code, cli.EXIT_FATAL)
+        self.assertEqual(records, [])
+        self.assertIn("manifest not found", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review import cli
+from core.review.cache import ReviewCache, generate_with_cache
+from core.review.pipeline import run_review
+
+
+@dataclass
+class CountingAdapter:
+    name: str = "counting"
+    model: str = "m1"
+    calls: List[str] = field(default_factory=list)
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        return (
+            "## AI Review\n\n"
+            "### Summary\n"
+            "Reviewed.\n\n"
+            "### Findings\n"
+            "- Missing auth guard before token use.\n"
+        )
+
+
+def _files() -> List[DiffFile]:
+    return [
+        DiffFile(
+            path="src/a.py",
+            hunks=[
+                DiffHunk(
+                    old_start=1,
+                    old_length=1,
+                    new_start=1,
+                    new_length=2,
+                    changes=[Change(ChangeType.CONTEXT, "def a():"), Change(ChangeType.ADD, "    return 1")],
+                )
+            ],
+        )
+    ]
+
+
+class ReviewCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def test_key_depends_on_adapter_model_and_prompt(self) -> None:
+        base = ReviewCache.make_key("openai", "m1", "prompt")
+
+        self.assertEqual(base, ReviewCache.make_key("openai", "m1", "prompt"))
+        self.assertNotEqual(base, ReviewCache.make_key("ollama", "m1", "prompt"))
+        self.assertNotEqual(base, ReviewCache.make_key("openai", "m2", "prompt"))
+        self.assertNotEqual(base, ReviewCache.make_key("openai", "m1", "prompt "))
+        self.assertNotEqual(ReviewCache.make_key("ab", "c", ""), ReviewCache.make_key("a", "bc", ""))
+
+    def test_round_trip_and_stats(self) -> None:
+        cache = ReviewCache(self.directory)
+
+        self.assertIsNone(cache.get("k" * 64))
+        cache.put("k" * 64, "output ✓")
+
+        self.assertEqual(ReviewCache(self.directory).get("k" * 64), "output ✓")
+        self.assertEqual(cache.stats.as_dict()["misses"], 1)
+        self.assertEqual(cache.stats.writes, 1)
+
+    def test_expired_entries_are_misses(self) -> None:
+        cache = ReviewCache(self.directory, ttl_seconds=60)
+        cache.put("a" * 64, "old")
+        path = Path(self.directory) / "aa" / ("a" * 64 + ".json")
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+
+        self.assertIsNone(cache.get("a" * 64))
+        self.assertEqual(cache.stats.expired, 1)
+        self.assertFalse(path.exists())
+
+    def test_size_limit_evicts_least_recently_used(self) -> None:
+        cache = ReviewCache(self.directory, max_bytes=1400)
+        keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+        for offset, key in enumerate(keys):
+            cache.put(key, "x" * 300)
+            stamp = time.time() - 100 + offset
+            os.utime(Path(self.directory) / key[:2] / f"{key}.json", (stamp, stamp))
+
+        # Reading the oldest entry makes it the most recently used one.
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.put("99" + "0" * 62, "x" * 300)
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertLessEqual(cache.total_bytes(), 1400)
+
+    def test_corrupt_entry_is_a_miss(self) -> None:
+        cache = ReviewCache(self.directory)
+        cache.put("c" * 64, "ok")
+        (Path(self.directory) / "cc" / ("c" * 64 + ".json")).write_text("{", encoding="utf-8")
+
+        self.assertIsNone(cache.get("c" * 64))
+
+    def test_generate_with_cache_only_calls_adapter_once(self) -> None:
+        cache = ReviewCache(self.directory)
+        adapter = CountingAdapter()
+
+        first = generate_with_cache(adapter, "prompt", cache)
+        second = generate_with_cache(adapter, "prompt", cache)
+        generate_with_cache(CountingAdapter(model="m2"), "prompt", cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(adapter.calls), 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 2)
+
+    def test_run_review_reuses_cached_output(self) -> None:
+        cache = ReviewCache(self.directory)
+        adapter = CountingAdapter()
+
+        first = run_review(_files(), adapter_override=adapter, cache=cache)
+        second = run_review(_files(), adapter_override=adapter, cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(adapter.calls), 1)
+
+
+class CliCacheTest(unittest.TestCase):
+    RAW = "diff --git a/src/a.py b/src/a.py\n@@ -1,1 +1,2 @@\n def a():\n+    return 1\n"
+
+    def _run(self, argv: List[str]) -> str:
+        stderr = io.StringIO()
+        with patch("sys.stdin", io.StringIO(self.RAW)):
+            with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                code = cli.main(["--input-format", "raw", *argv])
+        self.assertEqual(code, 0)
+        return stderr.getvalue()
+
+    def test_cache_dir_reports_stats_and_no_cache_bypasses(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIn("0 hit(s), 1 miss(es)", self._run(["--cache-dir", tmp]))
+            self.assertIn("1 hit(s), 0 miss(es)", self._run(["--cache-dir", tmp]))
+            self.assertNotIn("Review cache", self._run(["--cache-dir", tmp, "--no-cache"]))
+
+    def test_cache_dir_defaults_to_environment(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict(os.environ, {"PR_REVIEW_CACHE_DIR": tmp}):
+                self.assertIn("Review cache", self._run([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
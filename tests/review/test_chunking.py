@@ -1,8 +1,19 @@
 ﻿import unittest
 
 from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
-from core.review.chunking import build_intent_summary, chunk_diff_files, merge_chunk_markdowns
+from core.review.chunking import (
+    CARRIED_OVER_LABEL,
+    TRUNCATION_MARKER,
+    build_intent_summary,
+    chunk_diff_files,
+    chunk_diff_files_by_tokens,
+    merge_chunk_markdowns,
+    pack_diff_files,
+    pack_diff_files_by_tokens,
+)
 from core.review.pipeline import run_review
+from core.review.prompt_builder import build_review_prompt
+from core.review.tokens import estimate_header_tokens, estimate_prompt_tokens, estimate_tokens
 
 
 class ChunkingBoundaryTest(unittest.TestCase):
@@ -97,6 +108,37 @@ class ChunkMergeTest(unittest.TestCase):
         self.assertIn("Intent not provided.", merged_first)
         self.assertEqual(merged_first.count("Missing auth guard before token use"), 1)
 
+    def test_merge_chunk_markdowns_carries_over_previous_findings(self) -> None:
+        new = "### Findings\n- Missing auth guard before token use.\n"
+        previous = (
+            "## AI Review\n\n"
+            "### Summary\n"
+            "Earlier run.\n\n"
+            "### Findings\n"
+            "- Missing auth guard before token use!\n"
+            "- SQL injection risk in `build_query` string formatting.\n"
+        )
+
+        merged = merge_chunk_markdowns([new], previous_markdown=previous)
+
+        self.assertIn("Kept 2 unique finding(s). Carried over 1 finding(s) from the previous review.", merged)
+        self.assertLess(merged.index("Missing auth guard"), merged.index("SQL injection risk"))
+        self.assertIn(f"- {CARRIED_OVER_LABEL} SQL injection risk", merged)
+        self.assertEqual(merge_chunk_markdowns([new], previous_markdown=""), merge_chunk_markdowns([new]))
+
+    def test_findings_carried_over_twice_are_labelled_once(self) -> None:
+        previous = f"### Findings\n- {CARRIED_OVER_LABEL} SQL injection risk in `build_query`.\n"
+        new = "### Findings\n- SQL injection risk in `build_query`.\n"
+        nothing_new = "### Findings\n- No issues found.\n"
+
+        carried_again = merge_chunk_markdowns([nothing_new], previous_markdown=previous)
+        fixed_again = merge_chunk_markdowns([new], previous_markdown=previous)
+
+        self.assertEqual(carried_again.count(CARRIED_OVER_LABEL), 1)
+        # Reported again by the new review: kept once, without the label.
+        self.assertNotIn(CARRIED_OVER_LABEL, fixed_again)
+        self.assertIn("Kept 1 unique finding(s).", fixed_again)
+
     def test_run_review_uses_chunking_and_merges(self) -> None:
         files = [
             DiffFile(
@@ -124,6 +166,194 @@ class ChunkMergeTest(unittest.TestCase):
         self.assertIn("### Findings", output)
 
 
+class TokenChunkingTest(unittest.TestCase):
+    def _file(self, path: str, widths: list) -> DiffFile:
+        return DiffFile(
+            path=path,
+            hunks=[
+                DiffHunk(
+                    old_start=10,
+                    old_length=0,
+                    new_start=10,
+                    new_length=len(widths),
+                    changes=[Change(ChangeType.ADD, "x" * width) for width in widths],
+                )
+            ],
+        )
+
+    def _files(self) -> list:
+        return [
+            self._file("src/short.py", [1] * 200),
+            self._file("src/wide.js", [2000] * 20),
+            self._file("src/mixed.py", [10, 400, 40, 4000, 4] * 10),
+        ]
+
+    def test_chunks_never_exceed_budget(self) -> None:
+        header = estimate_header_tokens()
+        limit = header + 3000
+
+        chunks = chunk_diff_files_by_tokens(self._files(), limit, header_tokens=header)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(estimate_prompt_tokens(chunk), limit)
+            self.assertLessEqual(estimate_tokens(build_review_prompt(chunk)), limit)
+
+    def test_chunks_fill_budget_closely(self) -> None:
+        files = self._files()
+        header = estimate_header_tokens()
+        limit = header + 3000
+        diff_tokens = estimate_prompt_tokens(files) - header
+
+        chunks = chunk_diff_files_by_tokens(files, limit, header_tokens=header)
+
+        # Greedy packing wastes at most one line plus per-piece headers per chunk.
+        self.assertLessEqual(len(chunks), -(-diff_tokens // 2000))
+
+    def test_wide_lines_get_smaller_chunks_than_short_lines(self) -> None:
+        short = chunk_diff_files_by_tokens([self._file("a.py", [1] * 200)], 600)
+        wide = chunk_diff_files_by_tokens([self._file("b.js", [1000] * 200)], 600)
+
+        self.assertEqual(len(short), 1)
+        self.assertEqual(len(wide), 100)
+
+    def test_split_keeps_changes_and_line_numbers(self) -> None:
+        file_obj = self._file("src/mixed.py", [10, 400, 40, 4000, 4] * 10)
+
+        chunks = chunk_diff_files_by_tokens([file_obj], 1500)
+
+        hunks = [hunk for chunk in chunks for piece in chunk for hunk in piece.hunks]
+        self.assertEqual(sum(len(hunk.changes) for hunk in hunks), 50)
+        self.assertEqual(hunks[0].new_start, 10)
+        for previous, current in zip(hunks, hunks[1:]):
+            self.assertEqual(current.new_start, previous.new_start + previous.new_length)
+
+    def test_oversized_line_is_truncated_to_fit(self) -> None:
+        file_obj = self._file("min.js", [50_000])
+
+        chunks = chunk_diff_files_by_tokens([file_obj], 1000)
+
+        change = chunks[0][0].hunks[0].changes[0]
+        diff_tokens = estimate_prompt_tokens(chunks[0]) - estimate_header_tokens()
+        self.assertTrue(change.content.endswith(TRUNCATION_MARKER))
+        self.assertLessEqual(diff_tokens, 1000)
+        self.assertGreater(diff_tokens, 990)
+
+    def test_pluggable_estimator(self) -> None:
+        file_obj = self._file("a.py", [9] * 10)
+
+        chunks = chunk_diff_files_by_tokens([file_obj], 60, estimator=len)
+
+        for chunk in chunks:
+            self.assertLessEqual(len(build_review_prompt(chunk).split("Parsed diff input:\n")[1]), 60)
+
+    def test_budget_must_exceed_header(self) -> None:
+        with self.assertRaises(ValueError):
+            chunk_diff_files_by_tokens(self._files(), 100, header_tokens=100)
+
+
+class BinPackTest(unittest.TestCase):
+    def _file(self, path: str, *hunk_sizes: int) -> DiffFile:
+        hunks = []
+        start = 1
+        for size in hunk_sizes:
+            hunks.append(
+                DiffHunk(
+                    old_start=start,
+                    old_length=0,
+                    new_start=start,
+                    new_length=size,
+                    changes=[Change(ChangeType.ADD, f"line {i}") for i in range(size)],
+                )
+            )
+            start += size + 10
+        return DiffFile(path=path, hunks=hunks)
+
+    def _files(self) -> list:
+        return [
+            self._file("src/a.py", 30),
+            self._file("src/big1.py", 180),
+            self._file("lib/b.py", 30),
+            self._file("src/big2.py", 180),
+            self._file("lib/c.py", 30),
+        ]
+
+    def test_uses_fewer_chunks_than_greedy(self) -> None:
+        files = self._files()
+
+        greedy = chunk_diff_files(files, max_changes_per_chunk=200)
+        packed = pack_diff_files(files, max_changes_per_chunk=200)
+
+        self.assertEqual(len(greedy), 5)
+        self.assertEqual(len(packed), 3)
+        for chunk in packed:
+            self.assertLessEqual(sum(len(h.changes) for f in chunk for h in f.hunks), 200)
+
+    def test_is_deterministic_and_keeps_every_change(self) -> None:
+        files = self._files()
+
+        first = pack_diff_files(files, max_changes_per_chunk=200)
+        second = pack_diff_files(files, max_changes_per_chunk=200)
+
+        self.assertEqual(first, second)
+        self.assertEqual(
+            sorted(f.path for chunk in first for f in chunk),
+            sorted(f.path for f in files),
+        )
+        self.assertEqual([f.path for f in first[0]], ["src/a.py", "lib/b.py", "lib/c.py"])
+
+    def test_groups_pieces_by_directory(self) -> None:
+        files = [
+            self._file("a/x.py", 50),
+            self._file("b/x.py", 50),
+            self._file("a/y.py", 50),
+            self._file("b/y.py", 50),
+        ]
+
+        packed = pack_diff_files(files, max_changes_per_chunk=100)
+
+        self.assertEqual([[f.path for f in chunk] for chunk in packed], [["a/x.py", "a/y.py"], ["b/x.py", "b/y.py"]])
+
+    def test_merges_pieces_of_the_same_file(self) -> None:
+        files = [self._file("src/a.py", 50, 100, 50)]
+
+        packed = pack_diff_files(files, max_changes_per_chunk=120)
+
+        self.assertEqual([[f.path for f in chunk] for chunk in packed], [["src/a.py"], ["src/a.py"]])
+        self.assertEqual([h.new_start for h in packed[0][0].hunks], [1, 171])
+        self.assertEqual([len(h.changes) for h in packed[1][0].hunks], [100])
+
+    def test_token_packing_respects_budget(self) -> None:
+        files = self._files()
+        header = estimate_header_tokens()
+        limit = header + 1200
+
+        greedy = chunk_diff_files_by_tokens(files, limit, header_tokens=header)
+        packed = pack_diff_files_by_tokens(files, limit, header_tokens=header)
+
+        self.assertLessEqual(len(packed), len(greedy))
+        for chunk in packed:
+            self.assertLessEqual(estimate_prompt_tokens(chunk), limit)
+
+    def test_run_review_bin_pack_planner(self) -> None:
+        calls = []
+
+        class Adapter:
+            name = "counting"
+
+            def generate_review(self, prompt: str) -> str:
+                calls.append(prompt)
+                if len(calls) == 1:
+                    raise RuntimeError("simulated full review failure")
+                return "## AI Review\n\n### Findings\n- Missing auth guard before token use.\n"
+
+        run_review(self._files(), adapter_override=Adapter(), chunk_planner="bin-pack")
+
+        self.assertEqual(len(calls), 1 + 3)
+        with self.assertRaises(ValueError):
+            run_review(self._files(), adapter_override=Adapter(), chunk_planner="random")
+
+
 class IntentSummaryTest(unittest.TestCase):
     def test_prefers_clean_title_for_intent(self) -> None:
         intent = build_intent_summary(
@@ -0,0 +1,166 @@
+import asyncio
+import io
+import os
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest.mock import patch
+
+from core.review.adapter_registry import get_adapter, invalidate_adapters
+from core.review.adapters.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerModelAdapter,
+    CircuitOpenError,
+    with_circuit_breaker,
+)
+from core.review.adapters.fake import FakeModelAdapter
+from core.review.cli import load_diff_text
+from core.review.pipeline import run_review
+
+FIXTURE = Path(__file__).parent / "fixtures" / "raw_small.diff"
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ScriptedAdapter:
+    name = "scripted"
+
+    def __init__(self) -> None:
+        self.errors = []
+        self.calls = 0
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "## AI Review\n"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _FakeClock()
+        self.inner = _ScriptedAdapter()
+        self.breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=30.0, clock=self.clock)
+        self.adapter = CircuitBreakerModelAdapter(self.inner, self.breaker)
+
+    def _fail(self, count: int, error: Exception = None) -> None:
+        for _ in range(count):
+            self.inner.errors.append(error or ConnectionRefusedError("connection refused"))
+            with self.assertRaises(Exception):
+                self.adapter.generate_review("p")
+
+    def test_opens_after_consecutive_failures_and_fails_fast(self) -> None:
+        self._fail(3)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            self.adapter.generate_review("p")
+        self.assertEqual(self.inner.calls, 3)
+        self.assertEqual(self.breaker.snapshot()["rejected"], 1)
+
+    def test_success_resets_the_failure_count(self) -> None:
+        self._fail(2)
+        self.adapter.generate_review("p")
+        self._fail(2)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_permanent_errors_do_not_open_the_circuit(self) -> None:
+        self._fail(5, ValueError("bad request"))
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_probe_closes_or_reopens(self) -> None:
+        self._fail(3)
+        self.clock.now = 30.0
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        # Only one probe is let through at a time.
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.clock.now = 60.0
+        self.assertEqual(self.adapter.generate_review("p"), "## AI Review\n")
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()["times_opened"], 2)
+
+    def test_cancelled_probe_frees_the_probe_slot(self) -> None:
+        class _HangingAdapter:
+            name = "hanging"
+
+            def generate_review(self, prompt: str) -> str:
+                raise AssertionError("sync path should not be used")
+
+            async def agenerate_review(self, prompt: str) -> str:
+                await asyncio.sleep(5)
+                return ""
+
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=30.0, clock=self.clock)
+        breaker.record_failure()
+        self.clock.now = 30.0
+        adapter = CircuitBreakerModelAdapter(_HangingAdapter(), breaker)
+
+        async def cancelled_probe():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(adapter.agenerate_review("p"), 0.01)
+
+        asyncio.run(cancelled_probe())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.before_call()
+
+
+class CircuitBreakerRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_adapters()
+        self.addCleanup(invalidate_adapters)
+
+    def test_state_is_shared_across_reviews(self) -> None:
+        env = {
+            "OLLAMA_BASE_URL": "http://127.0.0.1:9",
+            "OLLAMA_MODEL": "llama3",
+            "OLLAMA_MAX_ATTEMPTS": "1",
+            "OLLAMA_CIRCUIT_FAILURE_THRESHOLD": "2",
+        }
+        files = load_diff_text(FIXTURE.read_text(encoding="utf-8"))
+        with patch.dict(os.environ, env), redirect_stderr(io.StringIO()):
+            for _ in range(2):
+                output = run_review(files, adapter_name="ollama")
+                self.assertIn("Review could not be generated", output)
+            snapshot = get_adapter("ollama").snapshot()
+
+        # First review: full-diff and fallback chunk both fail and open the circuit.
+        # Second review: both calls are rejected without touching the network.
+        self.assertEqual(snapshot["state"], OPEN)
+        self.assertEqual(snapshot["rejected"], 2)
+
+    def test_threshold_zero_disables_the_breaker(self) -> None:
+        adapter = FakeModelAdapter()
+
+        wrapped = with_circuit_breaker(adapter, "PR_REVIEW_TEST_UNSET")
+        self.assertIsInstance(wrapped, CircuitBreakerModelAdapter)
+        with patch.dict(os.environ, {"PR_REVIEW_TEST_CIRCUIT_FAILURE_THRESHOLD": "0"}):
+            self.assertIs(with_circuit_breaker(adapter, "PR_REVIEW_TEST"), adapter)
+
+    def test_invalid_env_is_rejected(self) -> None:
+        invalid = (("FAILURE_THRESHOLD", "-1"), ("FAILURE_THRESHOLD", "x"), ("COOLDOWN_SECONDS", "0"))
+        for name, value in invalid:
+            with self.subTest(name=name, value=value):
+                with patch.dict(os.environ, {f"PR_REVIEW_TEST_CIRCUIT_{name}": value}):
+                    with self.assertRaises(ValueError):
+                        with_circuit_breaker(FakeModelAdapter(), "PR_REVIEW_TEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
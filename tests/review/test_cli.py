@@ -1,6 +1,7 @@
 ﻿import io
 import unittest
 from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
 from unittest.mock import patch
 
 from core.review import cli
@@ -72,6 +73,13 @@ class ReviewCliTest(unittest.TestCase):
         self.assertEqual(out, "")
         self.assertIn("must be > 0", err)
 
+    def test_cli_rejects_non_positive_deadline(self) -> None:
+        code, out, err = self._run_main(["--deadline-seconds", "0"], "x")
+
+        self.assertEqual(code, 2)
+        self.assertEqual(out, "")
+        self.assertIn("--deadline-seconds must be > 0", err)
+
     def test_cli_includes_intent_section_from_pr_metadata(self) -> None:
         raw_diff = (
             "diff --git a/src/app.py b/src/app.py\n"
@@ -95,6 +103,15 @@ class ReviewCliTest(unittest.TestCase):
         self.assertIn("Add greeting return value", out)
         self.assertEqual(err, "")
 
+    def test_cli_raw_diff_from_file_with_bom(self) -> None:
+        fixture = Path(__file__).parent / "fixtures" / "raw_small.diff"
+
+        code, out, err = self._run_main(["--input-format", "auto", "--from-file", str(fixture)])
+
+        self.assertEqual(code, 0)
+        self.assertIn("`src/app.py`", out)
+        self.assertEqual(err, "")
+
     def test_cli_passes_openai_compat_adapter_to_pipeline(self) -> None:
         raw_diff = (
             "diff --git a/src/app.py b/src/app.py\n"
@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+FIXTURE = Path(__file__).parent / "fixtures" / "raw_small.diff"
+
+# Cumulative `-X importtime` budget for `core.review.cli`, in microseconds.
+# Typical cold imports take well under half of this; the headroom absorbs slow CI hosts.
+CLI_IMPORT_BUDGET_US = 250_000
+
+# Modules that only matter for async, threaded or remote-model runs.
+DEFERRED_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "openai",
+    "core.review.adapters.openai_adapter",
+    "core.review.adapters.openai_compat_adapter",
+    "core.review.adapters.ollama_adapter",
+    "core.review.adapters.http_pool",
+)
+
+# Only needed by async reviews; a sync review with a remote adapter must not load them.
+ASYNC_ONLY_MODULES = ("asyncio", "core.review.adapters.async_http")
+
+_MAIN = "import sys, core.review.cli as cli; sys.exit(cli.main())"
+
+
+class _OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        del format, args
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        review = "### Summary\nOk.\n\n### Findings\n- No issues found.\n"
+        body = json.dumps({"response": review, "done": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _run_with_importtime(
+    args: List[str], extra_env: Optional[Dict[str, str]] = None
+) -> Tuple[subprocess.CompletedProcess, Dict[str, int]]:
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR), "PYTHONDONTWRITEBYTECODE": "1", **(extra_env or {})}
+    for name in ("PR_REVIEW_CACHE_DIR", "PR_REVIEW_MEMO_DIR"):
+        env.pop(name, None)
+    result = subprocess.run(
+        # `-c` rather than `-m` so the CLI module itself shows up in the import profile.
+        [sys.executable, "-X", "importtime", "-c", _MAIN, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line[len("import time:"):].split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+    return result, cumulative
+
+
+class CliStartupTest(unittest.TestCase):
+    def _assert_fast_startup(self, modules: Dict[str, int]) -> None:
+        self.assertIn("core.review.cli", modules)
+        self.assertLess(modules["core.review.cli"], CLI_IMPORT_BUDGET_US)
+        imported = sorted(name for name in DEFERRED_MODULES if name in modules)
+        self.assertEqual(imported, [])
+
+    def test_help_does_not_import_pipeline(self) -> None:
+        result, modules = _run_with_importtime(["--help"])
+
+        self.assertEqual(result.returncode, 0)
+        self.assertNotIn("core.review.pipeline", modules)
+        self._assert_fast_startup(modules)
+
+    def test_small_fake_review_imports_only_what_it_uses(self) -> None:
+        result, modules = _run_with_importtime(["--adapter", "fake", "--from-file", str(FIXTURE)])
+
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn("## AI Review", result.stdout)
+        self.assertIn("core.review.pipeline", modules)
+        self.assertIn("core.review.adapters.fake", modules)
+        self.assertLess(modules["core.review.pipeline"], CLI_IMPORT_BUDGET_US)
+        self._assert_fast_startup(modules)
+
+    def test_sync_remote_review_does_not_import_asyncio(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _OllamaHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        env = {"OLLAMA_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}", "OLLAMA_MODEL": "m"}
+
+        result, modules = _run_with_importtime(["--adapter", "ollama", "--from-file", str(FIXTURE)], env)
+
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn("## AI Review", result.stdout)
+        self.assertIn("core.review.adapters.ollama_adapter", modules)
+        self.assertEqual(sorted(name for name in ASYNC_ONLY_MODULES if name in modules), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,6 @@
-﻿import unittest
+﻿import threading
+import time
+import unittest
 from dataclasses import dataclass, field
 from typing import List
 
@@ -26,6 +28,59 @@ class FailFullThenSucceedAdapter:
         )
 
 
+@dataclass
+class SlowPerFileAdapter:
+    """Fails the full review; chunk reviews finish in reverse file order."""
+
+    name: str = "slow-per-file"
+    calls: int = 0
+    active: int = 0
+    max_active: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def generate_review(self, prompt: str) -> str:
+        with self.lock:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("simulated full review failure")
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        path = next(line[len("FILE: "):] for line in prompt.splitlines() if line.startswith("FILE: "))
+        # Earlier files sleep longer so completion order differs from chunk order.
+        time.sleep(0.05 if path.endswith("a.py") else 0.01)
+
+        with self.lock:
+            self.active -= 1
+        return (
+            "## AI Review\n\n"
+            "### Summary\n"
+            "Chunk.\n\n"
+            "### Findings\n"
+            f"- Missing auth guard before token use in `{path}`.\n"
+        )
+
+
+@dataclass
+class FailFullThenSlowAdapter:
+    """Fails the full review after ``full_delay``; each chunk review takes ``chunk_delay``."""
+
+    full_delay: float = 0.0
+    chunk_delay: float = 0.2
+    name: str = "fail-then-slow"
+    calls: int = 0
+    prompts: List[str] = field(default_factory=list)
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls += 1
+        self.prompts.append(prompt)
+        if self.calls == 1:
+            time.sleep(self.full_delay)
+            raise RuntimeError("simulated full review failure")
+        time.sleep(self.chunk_delay)
+        return FailFullThenSucceedAdapter(calls=["full"]).generate_review(prompt)
+
+
 class FallbackPipelineTest(unittest.TestCase):
     def _files(self) -> List[DiffFile]:
         return [
@@ -79,6 +134,23 @@ class FallbackPipelineTest(unittest.TestCase):
         # 1 full attempt + 2 per-file fallback attempts
         self.assertEqual(len(adapter.calls), 3)
 
+    def test_concurrent_fallback_keeps_chunk_order(self) -> None:
+        sequential = run_review(self._files(), adapter_override=SlowPerFileAdapter())
+        adapter = SlowPerFileAdapter()
+
+        concurrent = run_review(self._files(), adapter_override=adapter, max_concurrency=4)
+
+        self.assertEqual(concurrent, sequential)
+        self.assertEqual(adapter.max_active, 2)
+        self.assertLess(
+            concurrent.index("token use in `src/a.py`"),
+            concurrent.index("token use in `src/b.py`"),
+        )
+
+    def test_max_concurrency_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            run_review(self._files(), adapter_override=SlowPerFileAdapter(), max_concurrency=0)
+
     def test_failure_reason_not_leaked_in_output(self) -> None:
         adapter = FailFullThenSucceedAdapter()
 
@@ -87,6 +159,110 @@ class FallbackPipelineTest(unittest.TestCase):
         self.assertNotIn("simulated full review failure", output)
         self.assertNotIn("Traceback", output)
 
+    def test_previous_findings_survive_when_every_chunk_fails(self) -> None:
+        class AlwaysFailAdapter:
+            name = "always-fail"
+
+            def generate_review(self, prompt: str) -> str:
+                raise RuntimeError("simulated outage")
+
+        previous = (
+            "## AI Review\n\n### Findings\n"
+            "- SQL injection risk in `src/db.py` query builder.\n"
+            "- SQL injection risk in `src/db.py` query builder.\n"
+        )
+
+        output = run_review(self._files(), adapter_override=AlwaysFailAdapter(), previous_markdown=previous)
+
+        self.assertIn("Review could not be generated from model output.", output)
+        self.assertIn("Carried over 1 finding(s) from the previous review.", output)
+        self.assertEqual(output.count("SQL injection risk in `src/db.py` query builder."), 1)
+        self.assertIn(
+            "- (carried over from the previous review; not re-verified) SQL injection risk in `src/db.py`",
+            output,
+        )
+        self.assertNotIn("No issues found.", output)
+
+    def test_deadline_skips_chunks_that_cannot_finish(self) -> None:
+        adapter = FailFullThenSlowAdapter()
+
+        output = run_review(self._files(), adapter_override=adapter, deadline_seconds=0.3)
+
+        # The first chunk takes 0.2s, so a second one would overrun the 0.3s budget.
+        self.assertEqual(adapter.calls, 2)
+        self.assertIn("Reviewed 1 chunk(s); skipped 1 chunk(s) at the review deadline.", output)
+        self.assertIn("Missing auth guard before token use.", output)
+
+    def test_generous_deadline_leaves_output_unchanged(self) -> None:
+        expected = run_review(self._files(), adapter_override=FailFullThenSlowAdapter(chunk_delay=0.0))
+
+        output = run_review(
+            self._files(), adapter_override=FailFullThenSlowAdapter(chunk_delay=0.0), deadline_seconds=60
+        )
+
+        self.assertEqual(output, expected)
+        self.assertNotIn("skipped", output)
+
+    def test_deadline_spent_on_full_review_skips_every_chunk(self) -> None:
+        adapter = FailFullThenSlowAdapter(full_delay=0.1)
+
+        output = run_review(self._files(), adapter_override=adapter, deadline_seconds=0.05)
+
+        self.assertEqual(adapter.calls, 1)
+        self.assertIn("Review could not be generated before the review deadline; skipped 2 chunk(s).", output)
+
+    def test_deadline_abandons_a_hung_full_review(self) -> None:
+        adapter = FailFullThenSlowAdapter(full_delay=5.0)
+
+        started = time.monotonic()
+        output = run_review(self._files(), adapter_override=adapter, deadline_seconds=0.2)
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(adapter.calls, 1)
+        self.assertIn("Review could not be generated before the review deadline; skipped 2 chunk(s).", output)
+
+    def test_deadline_abandons_a_running_chunk_review(self) -> None:
+        adapter = FailFullThenSlowAdapter(chunk_delay=5.0)
+
+        started = time.monotonic()
+        output = run_review(self._files(), adapter_override=adapter, deadline_seconds=0.3)
+
+        # The first chunk is abandoned mid-call; the second is never started.
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(adapter.calls, 2)
+        self.assertIn("Review could not be generated before the review deadline; skipped 2 chunk(s).", output)
+
+    def test_risk_order_reviews_sensitive_code_first_under_deadline(self) -> None:
+        files = self._files() + [
+            DiffFile(
+                path="src/auth/login.py",
+                hunks=[
+                    DiffHunk(
+                        old_start=1,
+                        old_length=0,
+                        new_start=1,
+                        new_length=1,
+                        changes=[Change(ChangeType.ADD, "    if not check_password(user, password):")],
+                    )
+                ],
+            )
+        ]
+        adapter = FailFullThenSlowAdapter()
+
+        output = run_review(files, adapter_override=adapter, chunk_order="risk", deadline_seconds=0.3)
+
+        self.assertEqual(adapter.calls, 2)
+        self.assertIn("FILE: src/auth/login.py", adapter.prompts[1])
+        self.assertIn("Reviewed 1 chunk(s); skipped 2 chunk(s) at the review deadline.", output)
+
+    def test_chunk_order_must_be_known(self) -> None:
+        with self.assertRaises(ValueError):
+            run_review(self._files(), adapter_override=SlowPerFileAdapter(), chunk_order="random")
+
+    def test_deadline_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            run_review(self._files(), adapter_override=SlowPerFileAdapter(), deadline_seconds=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from core.review.adapter_registry import ADAPTER_REGISTRY, get_adapter, invalidate_adapters
+from core.review.adapters.hedged import HedgedModelAdapter, LatencyTracker
+
+
+class _TimedAdapter:
+    def __init__(self, name: str, delay: float, *, error: Exception = None, max_prompt_tokens=None) -> None:
+        self.name = name
+        self.model = f"{name}-model"
+        self.delay = delay
+        self.error = error
+        self.max_prompt_tokens = max_prompt_tokens
+        self.calls = 0
+        self.cancelled = threading.Event()
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}: {prompt}"
+
+    async def agenerate_review(self, prompt: str) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"{self.name}: {prompt}"
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_nearest_rank_percentile_over_window(self) -> None:
+        tracker = LatencyTracker(window=100)
+        self.assertIsNone(tracker.percentile(95))
+
+        for value in range(1, 201):
+            tracker.record(float(value))
+
+        # Only the last 100 samples (101..200) are kept.
+        self.assertEqual(tracker.percentile(50), 150.0)
+        self.assertEqual(tracker.percentile(95), 195.0)
+        self.assertEqual(tracker.percentile(100), 200.0)
+
+
+class HedgedModelAdapterTest(unittest.TestCase):
+    def test_fast_primary_is_not_hedged(self) -> None:
+        primary, secondary = _TimedAdapter("primary", 0.0), _TimedAdapter("secondary", 0.0)
+        adapter = HedgedModelAdapter(primary, secondary, delay_seconds=1.0)
+
+        self.assertEqual(adapter.generate_review("p"), "primary: p")
+        self.assertEqual(secondary.calls, 0)
+        self.assertEqual(adapter.snapshot()["hedged"], 0)
+
+    def test_slow_primary_is_hedged_and_secondary_wins(self) -> None:
+        primary, secondary = _TimedAdapter("primary", 1.0), _TimedAdapter("secondary", 0.0)
+        adapter = HedgedModelAdapter(primary, secondary, delay_seconds=0.05)
+
+        started = time.monotonic()
+        self.assertEqual(adapter.generate_review("p"), "secondary: p")
+        self.assertLess(time.monotonic() - started, 0.5)
+        snapshot = adapter.snapshot()
+        self.assertEqual((snapshot["hedged"], snapshot["secondary_wins"]), (1, 1))
+
+    def test_failed_primary_fails_over_and_both_failing_raises(self) -> None:
+        primary = _TimedAdapter("primary", 0.0, error=RuntimeError("primary down"))
+        adapter = HedgedModelAdapter(primary, _TimedAdapter("secondary", 0.0), delay_seconds=5.0)
+        self.assertEqual(adapter.generate_review("p"), "secondary: p")
+
+        secondary = _TimedAdapter("secondary", 0.0, error=RuntimeError("secondary down"))
+        with self.assertRaisesRegex(RuntimeError, "primary down"):
+            HedgedModelAdapter(primary, secondary, delay_seconds=5.0).generate_review("p")
+
+    def test_delay_follows_primary_latency_percentile(self) -> None:
+        adapter = HedgedModelAdapter(
+            _TimedAdapter("primary", 0.0), _TimedAdapter("secondary", 0.0), delay_seconds=7.0, min_samples=10
+        )
+        for value in range(9):
+            adapter.latencies.record(float(value))
+        self.assertEqual(adapter.hedge_delay(), 7.0)
+
+        adapter.latencies.record(9.0)
+        self.assertEqual(adapter.hedge_delay(), 9.0)
+
+    def test_prompt_limit_and_model_cover_both_adapters(self) -> None:
+        adapter = HedgedModelAdapter(
+            _TimedAdapter("primary", 0.0, max_prompt_tokens=8000),
+            _TimedAdapter("secondary", 0.0, max_prompt_tokens=4000),
+        )
+
+        self.assertEqual(adapter.max_prompt_tokens, 4000)
+        self.assertEqual(adapter.model, "primary-model|secondary-model")
+
+    def test_async_loser_is_cancelled(self) -> None:
+        primary, secondary = _TimedAdapter("primary", 5.0), _TimedAdapter("secondary", 0.0)
+        adapter = HedgedModelAdapter(primary, secondary, delay_seconds=0.02)
+
+        self.assertEqual(asyncio.run(adapter.agenerate_review("p")), "secondary: p")
+        self.assertTrue(primary.cancelled.is_set())
+        # The abandoned primary still counts towards the latency percentile.
+        self.assertEqual(len(adapter.latencies), 1)
+
+
+class HedgedRegistryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_adapters()
+        self.addCleanup(invalidate_adapters)
+
+    def test_selected_by_name_when_configured(self) -> None:
+        env = {"HEDGE_PRIMARY_ADAPTER": "fake", "HEDGE_SECONDARY_ADAPTER": "fake", "HEDGE_PERCENTILE": "99"}
+        with patch.dict(os.environ, env):
+            adapter = get_adapter("hedged")
+
+        self.assertIsInstance(adapter, HedgedModelAdapter)
+        self.assertIs(adapter.primary, get_adapter("fake"))
+        self.assertEqual(adapter.percentile, 99.0)
+
+    def test_unconfigured_hedge_is_not_available(self) -> None:
+        with patch.dict(os.environ, {"HEDGE_PRIMARY_ADAPTER": "", "HEDGE_SECONDARY_ADAPTER": ""}):
+            self.assertNotIn("hedged", ADAPTER_REGISTRY.available())
+
+    def test_unconfigured_primary_does_not_mask_unknown_adapter_errors(self) -> None:
+        with patch.dict(os.environ, {"HEDGE_PRIMARY_ADAPTER": "typo", "HEDGE_SECONDARY_ADAPTER": "fake"}):
+            with self.assertRaisesRegex(ValueError, "Unknown adapter 'other'. Known adapters: .*fake"):
+                get_adapter("other")
+            with self.assertRaisesRegex(ValueError, "HEDGE_PRIMARY_ADAPTER names an unavailable adapter"):
+                get_adapter("hedged")
+            self.assertNotIn("hedged", ADAPTER_REGISTRY.available())
+
+    def test_invalid_config_is_rejected(self) -> None:
+        for env in (
+            {"HEDGE_PRIMARY_ADAPTER": "hedged", "HEDGE_SECONDARY_ADAPTER": "fake"},
+            {"HEDGE_PRIMARY_ADAPTER": "fake", "HEDGE_SECONDARY_ADAPTER": "fake", "HEDGE_PERCENTILE": "150"},
+        ):
+            with self.subTest(env=env):
+                with patch.dict(os.environ, env):
+                    with self.assertRaises(ValueError):
+                        HedgedModelAdapter.from_env(get_adapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+import asyncio
+import http.client
+import json
+import threading
+import time
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from core.review.adapters import http_pool
+from core.review.adapters.async_http import apost_json, astream_json_lines
+from core.review.adapters.errors import retry_after_seconds
+from core.review.adapters.http_pool import HttpPoolManager, get_http_pool, reset_http_pool
+from core.review.adapters.ollama_adapter import OllamaModelAdapter
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        del format, args
+
+    def do_POST(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.requests += 1
+            server.paths.append(self.path)
+            server.proxy_auth = self.headers.get("Proxy-Authorization")
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(server.delay)
+
+        if self.path == "/missing":
+            self._reply(404, {"error": "not found"})
+            return
+        if self.path == "/busy":
+            self._reply(429, {"error": "slow down"}, extra_headers={"Retry-After": "3"})
+            return
+        self._reply(200, {"response": f"echo {payload.get('prompt', '')}"}, close=server.close_each)
+
+    def _reply(self, status: int, data: dict, close: bool = False, extra_headers=None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        if close:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # The client gave up waiting (timeout tests).
+            return
+        if close:
+            self.close_connection = True
+
+
+class HttpPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = set()
+        self.server.requests = 0
+        self.server.paths = []
+        self.server.proxy_auth = None
+        self.server.delay = 0.0
+        self.server.close_each = False
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _post(self, manager: HttpPoolManager, prompt: str, path: str = "/api/generate"):
+        return self._post_url(manager, self.base_url + path, prompt)
+
+    def _post_url(self, manager: HttpPoolManager, url: str, prompt: str = "p"):
+        return manager.request(
+            "POST",
+            url,
+            body=json.dumps({"prompt": prompt}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            timeout=5,
+        )
+
+    def test_sequential_requests_reuse_one_connection(self) -> None:
+        manager = HttpPoolManager(max_size=4)
+        self.addCleanup(manager.close)
+
+        bodies = [self._post(manager, f"p{i}")[1] for i in range(5)]
+
+        self.assertEqual([json.loads(b)["response"] for b in bodies], [f"echo p{i}" for i in range(5)])
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_concurrent_requests_are_bounded_by_pool_size(self) -> None:
+        manager = HttpPoolManager(max_size=2)
+        self.addCleanup(manager.close)
+        self.server.delay = 0.02
+        results = []
+
+        def worker(idx: int) -> None:
+            results.append(self._post(manager, f"p{idx}")[0])
+
+        threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        pool, _ = manager.pool_for(self.base_url)
+        self.assertEqual(results, [200] * 8)
+        self.assertLessEqual(pool.connections_created, 2)
+        self.assertLessEqual(len(self.server.connections), 2)
+
+    def test_server_closed_connections_are_replaced(self) -> None:
+        manager = HttpPoolManager(max_size=1)
+        self.addCleanup(manager.close)
+        self.server.close_each = True
+
+        statuses = [self._post(manager, "p")[0] for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 200])
+        self.assertEqual(len(self.server.connections), 3)
+
+    def test_reused_connection_is_closed_when_the_request_fails(self) -> None:
+        manager = HttpPoolManager(max_size=1)
+        self.addCleanup(manager.close)
+        self._post(manager, "warm")
+        pool, _ = manager.pool_for(self.base_url)
+        idle = pool._idle[0]
+        self.server.delay = 0.5
+
+        with self.assertRaises(TimeoutError):
+            manager.request("POST", self.base_url + "/api/generate", body=b"{}", timeout=0.1)
+
+        self.assertIsNone(idle.sock)
+        self.assertEqual(pool._idle, [])
+
+    def test_http_proxy_from_environment_receives_absolute_targets(self) -> None:
+        manager = HttpPoolManager(max_size=1)
+        self.addCleanup(manager.close)
+        proxy_env = {"http_proxy": f"http://user:p%40ss@{self.base_url[len('http://'):]}", "no_proxy": ""}
+
+        with patch.dict("os.environ", proxy_env):
+            status, _ = self._post_url(manager, "http://models.internal:11434/api/generate")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.server.paths, ["http://models.internal:11434/api/generate"])
+        self.assertEqual(self.server.proxy_auth, "Basic dXNlcjpwQHNz")
+
+    def test_no_proxy_hosts_are_reached_directly(self) -> None:
+        manager = HttpPoolManager(max_size=1)
+        self.addCleanup(manager.close)
+        proxy_env = {"http_proxy": "http://unreachable.invalid:3128", "no_proxy": "127.0.0.1"}
+
+        with patch.dict("os.environ", proxy_env):
+            status, _ = self._post(manager, "p")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.server.paths, ["/api/generate"])
+
+    def test_https_through_a_proxy_is_tunnelled(self) -> None:
+        pool = http_pool.HttpConnectionPool("https", "api.example.com", 443, proxy="http://proxy.local:3128")
+
+        conn = pool._new_connection(timeout=5)
+
+        self.assertIsInstance(conn, http.client.HTTPSConnection)
+        self.assertEqual((conn.host, conn.port), ("proxy.local", 3128))
+        self.assertEqual((conn._tunnel_host, conn._tunnel_port), ("api.example.com", 443))
+
+    def test_post_json_raises_http_error_for_bad_status(self) -> None:
+        reset_http_pool()
+        self.addCleanup(reset_http_pool)
+
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            http_pool.post_json(self.base_url + "/missing", {"prompt": "x"}, timeout=5)
+
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_http_errors_keep_retry_after(self) -> None:
+        reset_http_pool()
+        self.addCleanup(reset_http_pool)
+        url = self.base_url + "/busy"
+
+        def _stream() -> None:
+            with http_pool.stream_json_lines(url, {"prompt": "x"}, timeout=5):
+                pass
+
+        async def _async_stream() -> None:
+            async with astream_json_lines(url, {"prompt": "x"}, timeout=5):
+                pass
+
+        calls = {
+            "post_json": lambda: http_pool.post_json(url, {"prompt": "x"}, timeout=5),
+            "stream_json_lines": _stream,
+            "apost_json": lambda: asyncio.run(apost_json(url, {"prompt": "x"}, timeout=5)),
+            "astream_json_lines": lambda: asyncio.run(_async_stream()),
+        }
+        for name, call in calls.items():
+            with self.subTest(call=name):
+                with self.assertRaises(urllib.error.HTTPError) as ctx:
+                    call()
+                self.assertEqual(ctx.exception.code, 429)
+                self.assertEqual(retry_after_seconds(ctx.exception), 3.0)
+
+    def test_ollama_adapter_uses_shared_pool(self) -> None:
+        reset_http_pool()
+        self.addCleanup(reset_http_pool)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m")
+
+        outputs = [adapter.generate_review(f"prompt {i}") for i in range(3)]
+
+        self.assertEqual(outputs, ["echo prompt 0", "echo prompt 1", "echo prompt 2"])
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_pool_size_comes_from_environment(self) -> None:
+        reset_http_pool()
+        self.addCleanup(reset_http_pool)
+
+        with patch.dict("os.environ", {"PR_REVIEW_HTTP_POOL_SIZE": "3"}):
+            self.assertEqual(get_http_pool().max_size, 3)
+        reset_http_pool()
+        with patch.dict("os.environ", {"PR_REVIEW_HTTP_POOL_SIZE": "0"}):
+            with self.assertRaises(ValueError):
+                get_http_pool()
+
+
+if __name__ == "__main__":
+    unittest.main()
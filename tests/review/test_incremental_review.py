@@ -0,0 +1,133 @@
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from core.review import cli
+
+SCRIPT = Path(__file__).resolve().parents[2] / "adapters" / "github" / "scripts" / "extract_pr_diff.py"
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("extract_pr_diff", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@unittest.skipUnless(shutil.which("git"), "git is required")
+class IncrementalExtractTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = Path(tmp.name)
+        self.script = _load_script()
+        previous_cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.addCleanup(os.chdir, previous_cwd)
+        self._git("init", "-q")
+        self._git("config", "user.email", "dev@example.com")
+        self._git("config", "user.name", "dev")
+        self.base = self._commit("a.py", "a = 1\n")
+        self._git("checkout", "-q", "-b", "feature")
+        self.first_head = self._commit("b.py", "b = 1\n")
+        self.second_head = self._commit("c.py", "c = 1\n")
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+    def _commit(self, name: str, text: str) -> str:
+        (self.repo / name).write_text(text, encoding="utf-8")
+        self._git("add", name)
+        self._git("commit", "-q", "-m", f"add {name}")
+        return self._git("rev-parse", "HEAD")
+
+    def _extract(self, since: str, head: str = "") -> tuple:
+        argv = [
+            "extract_pr_diff.py",
+            "--base-sha",
+            self.base,
+            "--head-sha",
+            head or self.second_head,
+            "--pr-number",
+            "1",
+            "--output",
+            "out.diff",
+            "--mode-output",
+            "mode.txt",
+            "--since-sha",
+            since,
+        ]
+        with patch.object(sys, "argv", argv), redirect_stderr(io.StringIO()):
+            code = self.script.main()
+        self.assertEqual(code, 0)
+        return Path("mode.txt").read_text().strip(), Path("out.diff").read_text()
+
+    def test_since_sha_extracts_only_new_changes(self) -> None:
+        mode, diff = self._extract(self.first_head)
+
+        self.assertEqual(mode, "incremental")
+        self.assertIn("c.py", diff)
+        self.assertNotIn("b.py", diff)
+
+    def test_non_ancestor_falls_back_to_full_diff(self) -> None:
+        self._git("checkout", "-q", "-b", "rewritten", self.base)
+        rewritten = self._commit("b.py", "b = 2\n")
+        self._git("checkout", "-q", "feature")
+
+        mode, diff = self._extract(rewritten)
+
+        self.assertEqual(mode, "triple-dot")
+        self.assertIn("b.py", diff)
+        self.assertIn("c.py", diff)
+
+    def test_base_branch_merged_in_falls_back_to_full_diff(self) -> None:
+        self._git("checkout", "-q", "-b", "upstream", self.base)
+        self.base = self._commit("upstream.py", "u = 1\n")
+        self._git("checkout", "-q", "feature")
+        self._git("merge", "-q", "--no-edit", "upstream")
+        merged_head = self._git("rev-parse", "HEAD")
+
+        mode, diff = self._extract(self.second_head, head=merged_head)
+
+        # since..head would wrongly include upstream.py, which the PR did not change.
+        self.assertEqual(mode, "triple-dot")
+        self.assertNotIn("upstream.py", diff)
+        self.assertIn("b.py", diff)
+
+
+class PreviousReviewCliTest(unittest.TestCase):
+    def test_previous_review_findings_are_merged(self) -> None:
+        raw = "diff --git a/src/a.py b/src/a.py\n@@ -1,1 +1,2 @@\n def a():\n+    return 1\n"
+        previous = "## AI Review\n\n### Findings\n- SQL injection risk in `build_query` string formatting.\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            previous_path = Path(tmp) / "previous.md"
+            previous_path.write_text(previous, encoding="utf-8")
+            stdout = io.StringIO()
+            with patch("sys.stdin", io.StringIO(raw)):
+                with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+                    code = cli.main(["--input-format", "raw", "--previous-review", str(previous_path)])
+
+        self.assertEqual(code, 0)
+        self.assertIn(
+            "- (carried over from the previous review; not re-verified) "
+            "SQL injection risk in `build_query` string formatting.",
+            stdout.getvalue(),
+        )
+
+    def test_missing_previous_review_is_recoverable(self) -> None:
+        with redirect_stderr(io.StringIO()):
+            code = cli.main(["--previous-review", "/nonexistent/previous.md"])
+
+        self.assertEqual(code, cli.EXIT_RECOVERABLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from typing import List
+from unittest.mock import patch
+
+from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review import cli
+from core.review.cache import ReviewCache
+from core.review.memo import ReviewMemo
+from core.review.pipeline import run_review
+from core.review.preflight import DEFAULT_SAFETY_RATIO
+from core.review.tokens import estimate_prompt_tokens
+
+
+@dataclass
+class PathEchoAdapter:
+    """Reports one finding naming the file of each prompt."""
+
+    name: str = "path-echo"
+    model: str = "m1"
+    calls: List[str] = field(default_factory=list)
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        paths = [line[len("FILE: "):] for line in prompt.splitlines() if line.startswith("FILE: ")]
+        findings = "".join(f"- Missing auth guard before token use in `{path}`.\n" for path in paths)
+        return "## AI Review\n\n### Summary\nReviewed.\n\n### Findings\n" + findings
+
+
+def _file(path: str, body: str, start: int = 1) -> DiffFile:
+    return DiffFile(
+        path=path,
+        hunks=[
+            DiffHunk(
+                old_start=start,
+                old_length=1,
+                new_start=start,
+                new_length=2,
+                changes=[Change(ChangeType.CONTEXT, "def handler():"), Change(ChangeType.ADD, body)],
+            )
+        ],
+    )
+
+
+def _prs(count: int = 30) -> List[DiffFile]:
+    return [_file(f"src/m{idx}.py", f"    return token_{idx}") for idx in range(count)]
+
+
+def _chunked_limit(files: List[DiffFile]) -> int:
+    """Prompt limit that fits any two of ``files`` but not the full diff, forcing chunked review."""
+
+    return int(estimate_prompt_tokens(files[:2], pr_title="New title") / DEFAULT_SAFETY_RATIO) + 1
+
+
+class ReviewMemoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.memo = ReviewMemo(ReviewCache(tmp.name))
+
+    def test_key_ignores_line_numbers_but_not_content(self) -> None:
+        adapter = PathEchoAdapter()
+        base = ReviewMemo.make_key(adapter, [_file("a.py", "x = 1")])
+
+        self.assertEqual(base, ReviewMemo.make_key(adapter, [_file("a.py", "x = 1", start=40)]))
+        self.assertNotEqual(base, ReviewMemo.make_key(adapter, [_file("a.py", "x = 2")]))
+        self.assertNotEqual(base, ReviewMemo.make_key(adapter, [_file("b.py", "x = 1")]))
+        self.assertNotEqual(base, ReviewMemo.make_key(PathEchoAdapter(model="m2"), [_file("a.py", "x = 1")]))
+
+    def test_push_only_reviews_changed_pieces(self) -> None:
+        files = _prs()
+        limit = _chunked_limit(files)
+        first_adapter = PathEchoAdapter()
+        first = run_review(files, adapter_override=first_adapter, memo=self.memo, max_prompt_tokens=limit)
+
+        pushed = list(files)
+        pushed[7] = _file("src/m7.py", "    return token_7 if guard() else None")
+        second_adapter = PathEchoAdapter()
+        second = run_review(
+            pushed,
+            adapter_override=second_adapter,
+            memo=self.memo,
+            pr_title="New title",
+            max_prompt_tokens=limit,
+        )
+
+        self.assertEqual(len(first_adapter.calls), 30)
+        self.assertEqual(len(second_adapter.calls), 1)
+        self.assertIn("FILE: src/m7.py", second_adapter.calls[0])
+        self.assertEqual(self.memo.reused, 29)
+        self.assertEqual(first.count("Missing auth guard"), second.count("Missing auth guard"))
+
+    def test_failed_pieces_are_not_memoized(self) -> None:
+        class FailingAdapter(PathEchoAdapter):
+            def generate_review(self, prompt: str) -> str:
+                raise RuntimeError("simulated outage")
+
+        limit = _chunked_limit(_prs(3))
+        run_review(_prs(3), adapter_override=FailingAdapter(), memo=self.memo, max_prompt_tokens=limit)
+        adapter = PathEchoAdapter()
+        run_review(_prs(3), adapter_override=adapter, memo=self.memo, max_prompt_tokens=limit)
+
+        self.assertEqual(len(adapter.calls), 3)
+
+    def test_memo_keeps_full_review_and_fallback_mode(self) -> None:
+        adapter = PathEchoAdapter()
+
+        run_review(_prs(3), adapter_override=adapter, memo=self.memo)
+
+        # A diff that fits is still reviewed in one call.
+        self.assertEqual(len(adapter.calls), 1)
+        self.assertEqual((self.memo.reused, self.memo.reviewed), (0, 0))
+
+        class FailingAdapter(PathEchoAdapter):
+            def generate_review(self, prompt: str) -> str:
+                raise RuntimeError("simulated outage")
+
+        with self.assertRaises(RuntimeError):
+            run_review(_prs(3), adapter_override=FailingAdapter(), memo=self.memo, fallback_enabled=False)
+
+
+class CliMemoTest(unittest.TestCase):
+    def test_memo_dir_reports_reuse(self) -> None:
+        raw = "".join(
+            f"diff --git a/src/{name}.py b/src/{name}.py\n@@ -1,1 +1,2 @@\n def {name}():\n+    return 1\n"
+            for name in ("a", "b", "c")
+        )
+        limit = str(_chunked_limit(cli.load_diff_text(raw)))
+        argv = ["--input-format", "raw", "--max-prompt-tokens", limit]
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = []
+            for _ in range(2):
+                stderr = io.StringIO()
+                with patch("sys.stdin", io.StringIO(raw)):
+                    with redirect_stdout(io.StringIO()), redirect_stderr(stderr):
+                        self.assertEqual(cli.main(argv + ["--memo-dir", tmp]), 0)
+                outputs.append(stderr.getvalue())
+
+        self.assertIn("Review memo: 0 piece(s) reused, 3 reviewed", outputs[0])
+        self.assertIn("Review memo: 3 piece(s) reused, 0 reviewed", outputs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
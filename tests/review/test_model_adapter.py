@@ -3,6 +3,7 @@ import unittest
 from unittest.mock import patch
 
 from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review.adapter_registry import invalidate_adapters
 from core.review.adapters.fake import FakeModelAdapter
 from core.review.pipeline import get_adapter, run_review
 
@@ -17,6 +18,11 @@ class FakeAdapterContractTest(unittest.TestCase):
 
 
 class PipelineSmokeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Adapters built from patched env must not leak into other tests.
+        invalidate_adapters()
+        self.addCleanup(invalidate_adapters)
+
     def test_get_adapter_returns_fake(self) -> None:
         adapter = get_adapter("fake")
         self.assertEqual(adapter.name, "fake")
@@ -87,6 +87,33 @@ class OllamaAdapterConfigTest(unittest.TestCase):
             with self.assertRaises(AdapterConfigError):
                 OllamaModelAdapter.from_env()
 
+    def test_from_env_reads_max_prompt_tokens(self) -> None:
+        with patch.dict(
+            os.environ,
+            {
+                "OLLAMA_BASE_URL": "http://localhost:11434",
+                "OLLAMA_MODEL": "qwen3:32b",
+                "OLLAMA_MAX_PROMPT_TOKENS": "8192",
+            },
+            clear=True,
+        ):
+            adapter = OllamaModelAdapter.from_env()
+
+        self.assertEqual(adapter.max_prompt_tokens, 8192)
+
+    def test_from_env_max_prompt_tokens_must_be_positive(self) -> None:
+        with patch.dict(
+            os.environ,
+            {
+                "OLLAMA_BASE_URL": "http://localhost:11434",
+                "OLLAMA_MODEL": "qwen3:32b",
+                "OLLAMA_MAX_PROMPT_TOKENS": "0",
+            },
+            clear=True,
+        ):
+            with self.assertRaises(AdapterConfigError):
+                OllamaModelAdapter.from_env()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from core.review.adapters.http_pool import reset_http_pool
+from core.review.adapters.ollama_adapter import (
+    AdapterConfigError,
+    AdapterRuntimeError,
+    OllamaModelAdapter,
+)
+from core.review.adapters.openai_compat_adapter import AdapterConfigError as CompatConfigError
+from core.review.adapters.openai_compat_adapter import OpenAICompatModelAdapter
+
+REVIEW = (
+    "### Summary\n"
+    "Adds token refresh.\n\n"
+    "### Findings\n"
+    "- Missing auth guard before token use.\n"
+)
+RAMBLE = "\n### Closing thoughts\nI hope this review helps. " + "More musing. " * 40
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        del format, args
+
+    def do_POST(self) -> None:
+        server = self.server
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        server.payloads.append(payload)
+        if not payload.get("stream"):
+            text = "".join(event.get("response", "") for event in server.events)
+            body = json.dumps({"response": text, "done": True}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in server.events:
+                line = json.dumps(event).encode("utf-8") + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                with server.lock:
+                    server.sent += 1
+                time.sleep(server.event_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            with server.lock:
+                server.aborted = True
+            self.close_connection = True
+
+
+def _events(text: str, size: int = 8, done: bool = True) -> list:
+    events = [{"response": text[idx : idx + size], "done": False} for idx in range(0, len(text), size)]
+    if done:
+        events.append({"response": "", "done": True})
+    return events
+
+
+class _OllamaServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_http_pool()
+        self.addCleanup(reset_http_pool)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.payloads = []
+        self.server.events = []
+        self.server.sent = 0
+        self.server.aborted = False
+        self.server.event_delay = 0.005
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+class OllamaStreamingTest(_OllamaServerTestCase):
+    def test_stops_reading_once_findings_are_complete(self) -> None:
+        self.server.events = _events(REVIEW + RAMBLE)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        output = adapter.generate_review("prompt")
+
+        self.assertEqual(output, REVIEW.strip())
+        self.assertTrue(self.server.payloads[0]["stream"])
+        self.assertLess(self.server.sent, len(self.server.events))
+
+    def test_max_output_chars_caps_the_stream(self) -> None:
+        self.server.events = _events(REVIEW + RAMBLE, done=False)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True, max_output_chars=30)
+
+        output = adapter.generate_review("prompt")
+
+        self.assertEqual(output, REVIEW[:30].strip())
+        self.assertLess(self.server.sent, len(self.server.events))
+
+    def test_timeout_bounds_a_slow_but_steady_stream(self) -> None:
+        self.server.events = _events("Still thinking about it. " * 8, size=5, done=False)
+        self.server.event_delay = 0.1
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", timeout_seconds=1, stream=True)
+
+        calls = (
+            lambda: adapter.generate_review("prompt"),
+            lambda: asyncio.run(adapter.agenerate_review("prompt")),
+        )
+        for call in calls:
+            started = time.monotonic()
+            with self.assertRaises(AdapterRuntimeError) as ctx:
+                call()
+            self.assertLess(time.monotonic() - started, 2.0)
+            self.assertIsInstance(ctx.exception.__cause__, TimeoutError)
+
+    def test_done_event_ends_short_stream(self) -> None:
+        self.server.events = _events("### Findings\n- SQL injection risk in query builder.")
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        output = adapter.generate_review("prompt")
+
+        self.assertEqual(output, "### Findings\n- SQL injection risk in query builder.")
+
+    def test_error_event_raises(self) -> None:
+        self.server.events = [{"error": "model not found"}]
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+
+    def test_compat_ollama_fallback_streams_when_enabled(self) -> None:
+        self.server.events = _events(REVIEW + RAMBLE)
+        adapter = OpenAICompatModelAdapter(base_url=self.base_url + "/v1", model="m")
+
+        with patch.dict(os.environ, {"OLLAMA_STREAM": "1"}, clear=True):
+            output = adapter._generate_with_ollama("prompt")
+
+        self.assertEqual(output, REVIEW.strip())
+        self.assertTrue(self.server.payloads[0]["stream"])
+
+
+class OllamaAsyncTest(_OllamaServerTestCase):
+    def test_agenerate_review_without_streaming(self) -> None:
+        self.server.events = _events(REVIEW)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m")
+
+        output = asyncio.run(adapter.agenerate_review("prompt"))
+
+        self.assertEqual(output, REVIEW.strip())
+        self.assertFalse(self.server.payloads[0]["stream"])
+
+    def test_agenerate_review_stops_stream_early(self) -> None:
+        self.server.events = _events(REVIEW + RAMBLE)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        output = asyncio.run(adapter.agenerate_review("prompt"))
+
+        self.assertEqual(output, REVIEW.strip())
+        self.assertLess(self.server.sent, len(self.server.events))
+
+    def test_agenerate_review_raises_on_stream_error(self) -> None:
+        self.server.events = [{"error": "model not found"}]
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        with self.assertRaises(AdapterRuntimeError):
+            asyncio.run(adapter.agenerate_review("prompt"))
+
+    def test_agenerate_reviews_run_concurrently(self) -> None:
+        self.server.events = _events(REVIEW, size=4)
+        adapter = OllamaModelAdapter(base_url=self.base_url, model="m", stream=True)
+
+        async def review_all():
+            return await asyncio.gather(*(adapter.agenerate_review(f"prompt {idx}") for idx in range(4)))
+
+        started = time.monotonic()
+        outputs = asyncio.run(review_all())
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(outputs, [REVIEW.strip()] * 4)
+        # Each stream takes ~len(events) * 5ms; four sequential streams would take 4x that.
+        self.assertLess(elapsed, len(self.server.events) * 0.005 * 3)
+
+
+class OllamaStreamConfigTest(unittest.TestCase):
+    def test_from_env_reads_stream_settings(self) -> None:
+        with patch.dict(
+            os.environ,
+            {
+                "OLLAMA_BASE_URL": "http://localhost:11434",
+                "OLLAMA_MODEL": "qwen3:32b",
+                "OLLAMA_STREAM": "true",
+                "OLLAMA_MAX_OUTPUT_CHARS": "4000",
+            },
+            clear=True,
+        ):
+            adapter = OllamaModelAdapter.from_env()
+
+        self.assertTrue(adapter.stream)
+        self.assertEqual(adapter.max_output_chars, 4000)
+
+    def test_from_env_rejects_invalid_max_output_chars(self) -> None:
+        for raw in ("abc", "0"):
+            with patch.dict(
+                os.environ,
+                {
+                    "OLLAMA_BASE_URL": "http://localhost:11434",
+                    "OLLAMA_MODEL": "qwen3:32b",
+                    "OLLAMA_MAX_OUTPUT_CHARS": raw,
+                },
+                clear=True,
+            ):
+                with self.assertRaises(AdapterConfigError):
+                    OllamaModelAdapter.from_env()
+
+    def test_compat_fallback_rejects_invalid_max_output_chars(self) -> None:
+        env = {
+            "OPENAI_COMPAT_BASE_URL": "http://localhost:8000/v1",
+            "OPENAI_COMPAT_MODEL": "m",
+            "OPENAI_COMPAT_ENABLE_OLLAMA_FALLBACK": "1",
+            "OLLAMA_MAX_OUTPUT_CHARS": "abc",
+        }
+        with patch.dict(os.environ, env, clear=True):
+            with self.assertRaisesRegex(CompatConfigError, "OLLAMA_MAX_OUTPUT_CHARS must be an integer"):
+                OpenAICompatModelAdapter.from_env()
+            adapter = OpenAICompatModelAdapter(base_url="http://localhost:8000/v1", model="m")
+            with self.assertRaises(AdapterConfigError):
+                adapter._generate_with_ollama("prompt")
+
+
+if __name__ == "__main__":
+    unittest.main()
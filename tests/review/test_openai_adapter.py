@@ -1,3 +1,4 @@
+import asyncio
 import builtins
 import os
 import unittest
@@ -29,6 +30,11 @@ class _FakeClient:
         self.responses = responses_api
 
 
+class _FakeAsyncResponsesApi(_FakeResponsesApi):
+    async def create(self, **kwargs):
+        return super().create(**kwargs)
+
+
 class OpenAIAdapterConfigTest(unittest.TestCase):
     def test_from_env_requires_api_key(self) -> None:
         with patch.dict(os.environ, {}, clear=True):
@@ -144,5 +150,35 @@ class OpenAIAdapterRuntimeTest(unittest.TestCase):
         self.assertIn("openai package is not installed", str(ctx.exception))
 
 
+class OpenAIAdapterAsyncTest(unittest.TestCase):
+    def test_agenerate_review_uses_async_client(self) -> None:
+        responses_api = _FakeAsyncResponsesApi(
+            response_to_return=SimpleNamespace(output_text="## AI Review\n\n### Summary\nok")
+        )
+        adapter = OpenAIModelAdapter(
+            api_key="test-key",
+            model="gpt-test",
+            max_output_tokens=321,
+            async_client=_FakeClient(responses_api),
+        )
+
+        output = asyncio.run(adapter.agenerate_review("prompt text"))
+
+        self.assertIn("## AI Review", output)
+        self.assertEqual(responses_api.last_kwargs["max_output_tokens"], 321)
+        self.assertEqual(responses_api.last_kwargs["input"][0]["content"][0]["text"], "prompt text")
+
+    def test_agenerate_review_wraps_api_errors(self) -> None:
+        responses_api = _FakeAsyncResponsesApi(error_to_raise=RuntimeError("boom"))
+        adapter = OpenAIModelAdapter(
+            api_key="test-key",
+            model="gpt-test",
+            async_client=_FakeClient(responses_api),
+        )
+
+        with self.assertRaises(AdapterRuntimeError):
+            asyncio.run(adapter.agenerate_review("prompt text"))
+
+
 if __name__ == "__main__":
     unittest.main()
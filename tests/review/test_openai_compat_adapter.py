@@ -1,9 +1,10 @@
+import asyncio
 import os
 import unittest
 from types import SimpleNamespace
 from urllib.error import URLError
 from urllib.parse import urlparse
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from core.review.adapters.openai_compat_adapter import (
     AdapterConfigError,
@@ -30,6 +31,11 @@ class _FakeClient:
         self.responses = responses_api
 
 
+class _FakeAsyncResponsesApi(_FakeResponsesApi):
+    async def create(self, **kwargs):
+        return super().create(**kwargs)
+
+
 class _FakeOpenAIAPIError(Exception):
     pass
 
@@ -37,21 +43,6 @@ class _FakeOpenAIAPIError(Exception):
 _FakeOpenAIAPIError.__module__ = "openai"
 
 
-class _FakeHttpResponse:
-    def __init__(self, body: str):
-        self._body = body
-
-    def read(self):
-        return self._body.encode("utf-8")
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        del exc_type, exc, tb
-        return False
-
-
 class OpenAICompatAdapterConfigTest(unittest.TestCase):
     def test_from_env_requires_base_url(self) -> None:
         with patch.dict(
@@ -272,17 +263,16 @@ class OpenAICompatAdapterRuntimeTest(unittest.TestCase):
 
         with patch.dict(os.environ, {"OPENAI_COMPAT_ENABLE_OLLAMA_FALLBACK": "1"}, clear=False):
             with patch(
-                "core.review.adapters.openai_compat_adapter.urllib.request.urlopen",
-                return_value=_FakeHttpResponse('{"response":"fallback hello"}'),
-            ) as urlopen_mock:
+                "core.review.adapters.openai_compat_adapter.post_json",
+                return_value={"response": "fallback hello"},
+            ) as post_json_mock:
                 output = adapter.generate_review("prompt text")
 
         self.assertEqual(output, "fallback hello")
-        request = urlopen_mock.call_args.args[0]
-        self.assertEqual(urlparse(request.full_url).path, "/api/generate")
-        body = request.data.decode("utf-8")
-        self.assertIn('"model": "qwen3:32b"', body)
-        self.assertIn('"prompt": "prompt text"', body)
+        url, payload = post_json_mock.call_args.args
+        self.assertEqual(urlparse(url).path, "/api/generate")
+        self.assertEqual(payload["model"], "qwen3:32b")
+        self.assertEqual(payload["prompt"], "prompt text")
 
     def test_generate_review_fallback_wraps_timeout_error(self) -> None:
         responses_api = _FakeResponsesApi(response_to_return=SimpleNamespace(output_text=""))
@@ -294,7 +284,7 @@ class OpenAICompatAdapterRuntimeTest(unittest.TestCase):
 
         with patch.dict(os.environ, {"OPENAI_COMPAT_ENABLE_OLLAMA_FALLBACK": "1"}, clear=False):
             with patch(
-                "core.review.adapters.openai_compat_adapter.urllib.request.urlopen",
+                "core.review.adapters.openai_compat_adapter.post_json",
                 side_effect=TimeoutError("timed out"),
             ):
                 with self.assertRaises(AdapterRuntimeError) as ctx:
@@ -321,7 +311,7 @@ class OpenAICompatAdapterRuntimeTest(unittest.TestCase):
             clear=False,
         ):
             with patch(
-                "core.review.adapters.openai_compat_adapter.urllib.request.urlopen",
+                "core.review.adapters.openai_compat_adapter.post_json",
                 side_effect=URLError(leaked),
             ):
                 with self.assertRaises(AdapterRuntimeError) as ctx:
@@ -336,5 +326,54 @@ class OpenAICompatAdapterRuntimeTest(unittest.TestCase):
         self.assertIn("Bearer ***", message)
 
 
+class OpenAICompatAdapterAsyncTest(unittest.TestCase):
+    def test_agenerate_review_uses_async_client(self) -> None:
+        responses_api = _FakeAsyncResponsesApi(response_to_return=SimpleNamespace(output_text="async ok"))
+        adapter = OpenAICompatModelAdapter(
+            base_url="http://localhost:11434/v1",
+            model="qwen2.5-coder",
+            async_client=_FakeClient(responses_api),
+        )
+
+        output = asyncio.run(adapter.agenerate_review("prompt text"))
+
+        self.assertEqual(output, "async ok")
+        self.assertEqual(responses_api.last_kwargs["model"], "qwen2.5-coder")
+
+    def test_agenerate_review_redacts_wrapped_errors(self) -> None:
+        responses_api = _FakeAsyncResponsesApi(error_to_raise=_FakeOpenAIAPIError("bad api_key=test-key"))
+        adapter = OpenAICompatModelAdapter(
+            base_url="http://localhost:11434/v1",
+            model="qwen2.5-coder",
+            api_key="test-key",
+            async_client=_FakeClient(responses_api),
+        )
+
+        with self.assertRaises(AdapterRuntimeError) as ctx:
+            asyncio.run(adapter.agenerate_review("prompt text"))
+
+        self.assertNotIn("test-key", str(ctx.exception))
+
+    def test_agenerate_review_empty_response_uses_async_ollama_fallback(self) -> None:
+        responses_api = _FakeAsyncResponsesApi(response_to_return=SimpleNamespace(output_text=""))
+        adapter = OpenAICompatModelAdapter(
+            base_url="http://localhost:11434/v1",
+            model="qwen3:32b",
+            async_client=_FakeClient(responses_api),
+        )
+
+        with patch.dict(os.environ, {"OPENAI_COMPAT_ENABLE_OLLAMA_FALLBACK": "1"}, clear=False):
+            with patch(
+                "core.review.adapters.async_http.apost_json",
+                new=AsyncMock(return_value={"response": "fallback hello"}),
+            ) as apost_json_mock:
+                output = asyncio.run(adapter.agenerate_review("prompt text"))
+
+        self.assertEqual(output, "fallback hello")
+        url, payload = apost_json_mock.call_args.args
+        self.assertEqual(urlparse(url).path, "/api/generate")
+        self.assertEqual(payload["prompt"], "prompt text")
+
+
 if __name__ == "__main__":
     unittest.main()
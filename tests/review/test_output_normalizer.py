@@ -1,6 +1,6 @@
 ﻿import unittest
 
-from core.review.output_normalizer import normalize_review_markdown
+from core.review.output_normalizer import StreamingReviewAccumulator, normalize_review_markdown
 
 
 class OutputNormalizerTest(unittest.TestCase):
@@ -55,5 +55,99 @@ class OutputNormalizerTest(unittest.TestCase):
         )
 
 
+class StreamingReviewAccumulatorTest(unittest.TestCase):
+    REVIEW = (
+        "## AI Review\n\n"
+        "### Summary\n"
+        "Adds token refresh.\n\n"
+        "### Findings\n"
+        "- Missing auth guard before token use.\n"
+        "  Continuation of the same finding.\n"
+        "- SQL injection risk in query builder.\n"
+    )
+
+    def _feed(self, accumulator: StreamingReviewAccumulator, text: str, size: int = 5) -> int:
+        for idx in range(0, len(text), size):
+            if accumulator.feed(text[idx : idx + size]):
+                return idx
+        return -1
+
+    def test_stops_on_next_heading(self) -> None:
+        for tail in ("### Notes\nExtra.\n", "\n## Next steps\nExtra.\n"):
+            accumulator = StreamingReviewAccumulator()
+
+            stopped_at = self._feed(accumulator, self.REVIEW + tail + "x" * 500)
+
+            self.assertEqual(accumulator.stop_reason, "findings_complete")
+            self.assertLess(stopped_at, len(self.REVIEW) + len(tail))
+            self.assertEqual(accumulator.text().rstrip(), self.REVIEW.rstrip())
+
+    def test_findings_heading_is_case_and_level_tolerant(self) -> None:
+        for heading in ("## Findings", "### findings:", "#### **FINDINGS**"):
+            with self.subTest(heading=heading):
+                accumulator = StreamingReviewAccumulator()
+                review = f"{heading}\n- SQL injection risk.\n"
+
+                self._feed(accumulator, review + "# Appendix\nMore.\n")
+
+                self.assertEqual(accumulator.stop_reason, "findings_complete")
+                self.assertEqual(accumulator.text(), review)
+
+    def test_deeper_headings_inside_findings_do_not_stop(self) -> None:
+        accumulator = StreamingReviewAccumulator()
+        review = "## Findings\n### High severity\n- SQL injection risk.\n"
+
+        self._feed(accumulator, review)
+
+        self.assertFalse(accumulator.done)
+        self.assertEqual(accumulator.text(), review)
+
+    def test_wrapped_and_multi_paragraph_findings_are_kept(self) -> None:
+        review = (
+            "### Findings\n"
+            "- Missing auth guard before token use; the refresh handler\n"
+            "reads the token before checking the session.\n"
+            "\n"
+            "This also affects the logout path, which reuses the handler.\n"
+            "\n"
+            "*Severity*: high\n"
+            "- SQL injection risk in query builder.\n"
+            "\n"
+            "Overall the change looks reasonable once these are fixed.\n"
+        )
+        accumulator = StreamingReviewAccumulator()
+
+        self._feed(accumulator, review)
+
+        self.assertFalse(accumulator.done)
+        self.assertEqual(accumulator.text(), review)
+
+    def test_stops_after_no_issues_bullet(self) -> None:
+        accumulator = StreamingReviewAccumulator()
+
+        self._feed(accumulator, "### Summary\nOk.\n\n### Findings\n- No issues found.\nThinking more...")
+
+        self.assertTrue(accumulator.done)
+        self.assertTrue(accumulator.text().endswith("- No issues found.\n"))
+
+    def test_indented_continuation_does_not_stop(self) -> None:
+        accumulator = StreamingReviewAccumulator()
+
+        self._feed(accumulator, self.REVIEW)
+
+        self.assertFalse(accumulator.done)
+        self.assertEqual(accumulator.text(), self.REVIEW)
+
+    def test_max_chars_budget(self) -> None:
+        accumulator = StreamingReviewAccumulator(max_chars=40)
+
+        self._feed(accumulator, self.REVIEW, size=7)
+
+        self.assertEqual(accumulator.stop_reason, "max_chars")
+        self.assertEqual(accumulator.text(), self.REVIEW[:40])
+        self.assertTrue(accumulator.feed("more"))
+        self.assertEqual(accumulator.text(), self.REVIEW[:40])
+
+
 if __name__ == "__main__":
     unittest.main()
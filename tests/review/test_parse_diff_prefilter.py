@@ -0,0 +1,74 @@
+import unittest
+
+from core.diff.filters import filter_diff_files, is_ignored_path
+from core.diff.parse_diff import iter_parse_diff, parse_diff
+
+RAW = (
+    "diff --git a/package-lock.json b/package-lock.json\n"
+    "index 111..222 100644\n"
+    "@@ -1,2 +1,2 @@\n"
+    "-  \"version\": \"1.0.0\",\n"
+    "+  \"version\": \"1.0.1\",\n"
+    "+diff --git a/not/a/header b/not/a/header\n"
+    "diff --git a/src/app.py b/src/app.py\n"
+    "@@ -1,1 +1,2 @@\n"
+    " def hello():\n"
+    "+    return 'hi'\n"
+    "diff --git a/vendor/lib.py b/vendor/lib.py\n"
+    "@@ -1,1 +1,1 @@\n"
+    "+x = 1\n"
+)
+
+
+class _CountingLine(bytes):
+    """Byte line that records whether the parser decoded it."""
+
+    decoded = []
+
+    def decode(self, *args, **kwargs):
+        _CountingLine.decoded.append(bytes(self))
+        return super().decode(*args, **kwargs)
+
+
+class ParsePrefilterTest(unittest.TestCase):
+    def test_ignored_path_predicate_skips_ignored_files(self) -> None:
+        files = parse_diff(RAW, ignore_path=is_ignored_path)
+
+        self.assertEqual([f.path for f in files], ["src/app.py"])
+        self.assertEqual(len(files[0].hunks[0].changes), 2)
+
+    def test_matches_post_parse_filtering(self) -> None:
+        self.assertEqual(parse_diff(RAW, ignore_path=is_ignored_path), filter_diff_files(parse_diff(RAW)))
+
+    def test_default_keeps_every_file(self) -> None:
+        expected = ["package-lock.json", "src/app.py", "vendor/lib.py"]
+
+        self.assertEqual([f.path for f in parse_diff(RAW)], expected)
+        self.assertEqual([f.path for f in iter_parse_diff(RAW.splitlines())], expected)
+        self.assertEqual(parse_diff(RAW), parse_diff(RAW, ignore_path=None))
+
+    def test_custom_predicate(self) -> None:
+        files = parse_diff(RAW, ignore_path=lambda path: path.endswith(".py"))
+
+        self.assertEqual([f.path for f in files], ["package-lock.json"])
+
+    def test_ignored_file_lines_are_never_decoded(self) -> None:
+        _CountingLine.decoded = []
+        lines = [_CountingLine(line.encode("utf-8")) for line in RAW.splitlines()]
+
+        files = list(iter_parse_diff(lines, compact=True, ignore_path=is_ignored_path))
+
+        self.assertEqual([f.path for f in files], ["src/app.py"])
+        self.assertEqual(
+            _CountingLine.decoded,
+            [
+                b"diff --git a/package-lock.json b/package-lock.json",
+                b"diff --git a/src/app.py b/src/app.py",
+                b"@@ -1,1 +1,2 @@",
+                b"diff --git a/vendor/lib.py b/vendor/lib.py",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import json
+import unittest
+from pathlib import Path
+
+from core.diff import cli as diff_cli
+from core.diff.filters import filter_diff_files
+from core.diff.parse_diff import iter_parse_diff, parse_diff
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class IterParseDiffTest(unittest.TestCase):
+    def _raw(self, name: str) -> str:
+        return (FIXTURES / name).read_text(encoding="utf-8-sig")
+
+    def test_text_stream_matches_parse_diff(self) -> None:
+        raw = self._raw("raw_large.diff")
+
+        streamed = list(iter_parse_diff(io.StringIO(raw)))
+
+        self.assertEqual(streamed, parse_diff(raw))
+
+    def test_binary_stream_matches_parse_diff(self) -> None:
+        raw = self._raw("raw_small.diff")
+
+        streamed = list(iter_parse_diff(io.BytesIO(raw.encode("utf-8"))))
+
+        self.assertEqual(streamed, parse_diff(raw))
+
+    def test_crlf_line_endings_are_stripped(self) -> None:
+        raw = "diff --git a/a.py b/a.py\r\n@@ -1,1 +1,2 @@\r\n x = 1\r\n+y = 2\r\n"
+
+        files = list(iter_parse_diff(io.BytesIO(raw.encode("utf-8"))))
+
+        self.assertEqual([c.content for c in files[0].hunks[0].changes], ["x = 1", "y = 2"])
+
+    def test_files_are_yielded_before_stream_is_exhausted(self) -> None:
+        consumed = []
+
+        def lines():
+            for line in [
+                "diff --git a/a.py b/a.py\n",
+                "@@ -1,1 +1,1 @@\n",
+                "+a\n",
+                "diff --git a/b.py b/b.py\n",
+                "@@ -1,1 +1,1 @@\n",
+                "+b\n",
+            ]:
+                consumed.append(line)
+                yield line
+
+        files = iter_parse_diff(lines())
+        first = next(files)
+
+        self.assertEqual(first.path, "a.py")
+        self.assertEqual(len(consumed), 4)
+        self.assertEqual([f.path for f in files], ["b.py"])
+
+    def test_empty_stream_yields_nothing(self) -> None:
+        self.assertEqual(list(iter_parse_diff(io.StringIO(""))), [])
+
+
+class DiffCliJsonTest(unittest.TestCase):
+    def test_streamed_json_matches_json_dumps(self) -> None:
+        raw = (FIXTURES / "raw_large.diff").read_text(encoding="utf-8-sig")
+        files = filter_diff_files(parse_diff(raw))
+        out = io.StringIO()
+
+        diff_cli._write_json_array(iter(files), out)
+
+        expected = json.dumps([diff_cli._file_to_json(f) for f in files], indent=2) + "\n"
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_streamed_json_for_no_files(self) -> None:
+        out = io.StringIO()
+
+        diff_cli._write_json_array([], out)
+
+        self.assertEqual(json.loads(out.getvalue()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
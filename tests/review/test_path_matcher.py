@@ -0,0 +1,150 @@
+import fnmatch
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from core.diff.filters import (
+    IGNORE_PATTERNS,
+    PathMatcher,
+    get_path_matcher,
+    is_ignored_path,
+    parse_gitattributes,
+)
+from core.review import cli
+
+
+class PathMatcherTest(unittest.TestCase):
+    def test_default_rules(self) -> None:
+        ignored = [
+            "package-lock.json",
+            "yarn.lock",
+            "poetry.lock",
+            "node_modules/left-pad/index.js",
+            "vendor/github.com/x/y.go",
+            "dist/app.js",
+            "build/out/main.o",
+            "static/app.min.js",
+            "static/site.min.css",
+        ]
+        kept = ["src/app.py", "vendors.py", "src/vendor/x.py", "distance.py", "app.js"]
+
+        for path in ignored:
+            self.assertTrue(is_ignored_path(path), path)
+        for path in kept:
+            self.assertFalse(is_ignored_path(path), path)
+
+    def test_glob_patterns_match_fnmatch(self) -> None:
+        patterns = ["*.pb.go", "src/*_generated.py", "docs/?.md", "[ab]*.txt"]
+        paths = [
+            "x.pb.go",
+            "a/b/x.pb.go",
+            "src/models_generated.py",
+            "src/deep/models_generated.py",
+            "docs/a.md",
+            "docs/ab.md",
+            "a.txt",
+            "c.txt",
+            "src/app.py",
+        ]
+        matcher = PathMatcher(patterns)
+
+        for path in paths:
+            expected = any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+            self.assertEqual(matcher.matches(path), expected, path)
+
+    def test_directory_patterns_use_segment_prefixes(self) -> None:
+        matcher = PathMatcher(["third_party/", "gen/proto/**"])
+
+        self.assertTrue(matcher("third_party/lib/a.c"))
+        self.assertTrue(matcher("gen/proto/a.pb.go"))
+        self.assertFalse(matcher("gen/protocol.py"))
+        self.assertFalse(matcher("third_party"))
+
+    def test_classify_preserves_order(self) -> None:
+        matcher = PathMatcher(IGNORE_PATTERNS)
+
+        result = matcher.classify(["src/a.py", "yarn.lock", "dist/x.js", "README.md"])
+
+        self.assertEqual(result, [False, True, True, False])
+
+    def test_get_path_matcher_reuses_compiled_matcher(self) -> None:
+        first = get_path_matcher(["*.lock", "gen/*"])
+        second = get_path_matcher(["*.lock", "gen/*"])
+
+        self.assertIs(first, second)
+
+    def test_empty_patterns_match_nothing(self) -> None:
+        matcher = PathMatcher(["", ""])
+
+        self.assertFalse(matcher("anything.py"))
+
+
+class GitattributesTest(unittest.TestCase):
+    TEXT = (
+        "# generated code\n"
+        "*.pb.go linguist-generated=true\n"
+        "/gen/** -diff\n"
+        "Cargo.lock binary\n"
+        "docs/**/api.md linguist-generated\n"
+        "*.sh text eol=lf\n"
+        "*.md linguist-generated=false\n"
+    )
+
+    def test_only_generated_and_no_diff_entries_are_used(self) -> None:
+        patterns = parse_gitattributes(self.TEXT)
+
+        self.assertNotIn("*.sh", patterns)
+        self.assertNotIn("*.md", patterns)
+
+    def test_gitattributes_path_semantics(self) -> None:
+        matcher = PathMatcher.from_gitattributes(self.TEXT)
+
+        self.assertTrue(matcher("api/v1/service.pb.go"))
+        self.assertTrue(matcher("gen/models.py"))
+        self.assertFalse(matcher("src/gen/models.py"))
+        self.assertTrue(matcher("Cargo.lock"))
+        self.assertTrue(matcher("crates/core/Cargo.lock"))
+        self.assertTrue(matcher("docs/api.md"))
+        self.assertTrue(matcher("docs/v2/api.md"))
+        self.assertTrue(matcher("yarn.lock"))
+        self.assertFalse(matcher("src/main.rs"))
+
+    def test_cli_applies_gitattributes_and_extra_patterns(self) -> None:
+        raw_diff = (
+            "diff --git a/api/service.pb.go b/api/service.pb.go\n"
+            "@@ -1,1 +1,1 @@\n"
+            "+package api\n"
+            "diff --git a/fixtures/data.json b/fixtures/data.json\n"
+            "@@ -1,1 +1,1 @@\n"
+            "+{}\n"
+            "diff --git a/src/app.py b/src/app.py\n"
+            "@@ -1,1 +1,2 @@\n"
+            " def hello():\n"
+            "+    return 'hi'\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            attributes = Path(tmp) / ".gitattributes"
+            attributes.write_text("*.pb.go linguist-generated\n", encoding="utf-8")
+            stdout = io.StringIO()
+            with patch("sys.stdin", io.StringIO(raw_diff)):
+                with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+                    code = cli.main(
+                        [
+                            "--input-format",
+                            "raw",
+                            "--gitattributes",
+                            str(attributes),
+                            "--ignore-pattern",
+                            "fixtures/*",
+                        ]
+                    )
+
+        self.assertEqual(code, 0)
+        self.assertIn("Changed 1 file: `src/app.py`.", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review.adapters.errors import is_context_length_error
+from core.review.pipeline import run_review
+from core.review.preflight import (
+    DEFAULT_SAFETY_RATIO,
+    PREFLIGHT_STATS,
+    PreflightDecision,
+    PreflightStats,
+    adapter_prompt_limit,
+    predict_full_review,
+)
+from core.review.prompt_builder import build_review_prompt
+from core.review.tokens import CHARS_PER_TOKEN, estimate_prompt_tokens, estimate_tokens
+
+
+@dataclass
+class RecordingAdapter:
+    """Succeeds on every call and records the prompts it saw."""
+
+    max_prompt_tokens: Optional[int] = None
+    fail_first: bool = False
+    first_error: str = "simulated context overflow"
+    name: str = "recording"
+    calls: List[str] = field(default_factory=list)
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        if self.fail_first and len(self.calls) == 1:
+            raise RuntimeError(self.first_error)
+        return (
+            "## AI Review\n\n"
+            "### Summary\n"
+            "Reviewed.\n\n"
+            "### Findings\n"
+            "- Missing auth guard before token use.\n"
+        )
+
+
+def _files(count: int = 3, lines: int = 20) -> List[DiffFile]:
+    return [
+        DiffFile(
+            path=f"src/f{idx}.py",
+            hunks=[
+                DiffHunk(
+                    old_start=1,
+                    old_length=0,
+                    new_start=1,
+                    new_length=lines,
+                    changes=[Change(ChangeType.ADD, f"value_{i} = compute({i})") for i in range(lines)],
+                )
+            ],
+        )
+        for idx in range(count)
+    ]
+
+
+class TokenEstimateTest(unittest.TestCase):
+    def test_estimate_tokens_rounds_up(self) -> None:
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("a"), 1)
+        self.assertEqual(estimate_tokens("a" * CHARS_PER_TOKEN * 3), 3)
+
+    def test_prompt_estimate_is_upper_bound_of_built_prompt(self) -> None:
+        files = _files()
+        prompt = build_review_prompt(files, repository="org/repo", pr_title="Title")
+
+        estimated = estimate_prompt_tokens(files, repository="org/repo", pr_title="Title")
+
+        self.assertGreaterEqual(estimated, estimate_tokens(prompt))
+        self.assertLess(estimated, estimate_tokens(prompt) * 1.5)
+
+
+class PredictFullReviewTest(unittest.TestCase):
+    def test_unknown_limit_always_fits(self) -> None:
+        decision = predict_full_review(_files(), max_prompt_tokens=None)
+
+        self.assertTrue(decision.fits)
+        self.assertFalse(decision.limit_known)
+        self.assertIsNone(decision.estimated_tokens)
+
+    def test_limit_applies_safety_ratio(self) -> None:
+        estimated = estimate_prompt_tokens(_files())
+
+        self.assertTrue(predict_full_review(_files(), max_prompt_tokens=estimated * 2).fits)
+        self.assertFalse(predict_full_review(_files(), max_prompt_tokens=estimated).fits)
+
+    def test_context_length_errors_are_recognised(self) -> None:
+        overflow = [
+            RuntimeError("This model's maximum context length is 8192 tokens."),
+            RuntimeError("error code: context_length_exceeded"),
+            RuntimeError("prompt is too long: 210000 tokens > 200000 maximum"),
+        ]
+        for exc in overflow:
+            with self.subTest(exc=str(exc)):
+                self.assertTrue(is_context_length_error(exc))
+        self.assertFalse(is_context_length_error(ConnectionResetError("connection reset by peer")))
+
+    def test_adapter_prompt_limit(self) -> None:
+        self.assertIsNone(adapter_prompt_limit(RecordingAdapter()))
+        self.assertEqual(adapter_prompt_limit(RecordingAdapter(max_prompt_tokens=100)), 100)
+
+
+class PreflightStatsTest(unittest.TestCase):
+    def test_snapshot_counts_and_accuracy(self) -> None:
+        stats = PreflightStats()
+        fit = PreflightDecision(estimated_tokens=10, max_prompt_tokens=100, fits=True)
+        overflow = PreflightDecision(estimated_tokens=500, max_prompt_tokens=100, fits=False)
+
+        stats.record(fit, full_review_succeeded=True)
+        stats.record(fit, full_review_succeeded=False)
+        stats.record(overflow, full_review_succeeded=None)
+        stats.record(overflow, full_review_succeeded=False)
+        stats.record(fit, full_review_succeeded=None)
+        stats.record(
+            PreflightDecision(estimated_tokens=10, max_prompt_tokens=None, fits=True),
+            full_review_succeeded=True,
+        )
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["predicted_fit_succeeded"], 1)
+        self.assertEqual(snapshot["predicted_fit_failed"], 1)
+        self.assertEqual(snapshot["predicted_overflow"], 2)
+        self.assertEqual(snapshot["predicted_overflow_failed"], 1)
+        self.assertAlmostEqual(snapshot["accuracy"], 2 / 3)
+
+    def test_empty_snapshot_has_no_accuracy(self) -> None:
+        self.assertIsNone(PreflightStats().snapshot()["accuracy"])
+
+
+class PipelinePreflightTest(unittest.TestCase):
+    def setUp(self) -> None:
+        PREFLIGHT_STATS.reset()
+        self.addCleanup(PREFLIGHT_STATS.reset)
+
+    def test_predicted_overflow_skips_full_review(self) -> None:
+        files = _files()
+        limit = estimate_prompt_tokens(files)
+        adapter = RecordingAdapter(max_prompt_tokens=limit)
+
+        output = run_review(files, adapter_override=adapter)
+
+        self.assertEqual(len(adapter.calls), 2)
+        self.assertEqual(sum(call.count("FILE: ") for call in adapter.calls), 3)
+        self.assertTrue(all(estimate_tokens(call) <= limit for call in adapter.calls))
+        self.assertIn("### Findings", output)
+        self.assertEqual(PREFLIGHT_STATS.snapshot()["predicted_overflow"], 1)
+
+    def test_run_review_limit_overrides_adapter(self) -> None:
+        files = _files()
+        adapter = RecordingAdapter()
+
+        one_file_limit = int(estimate_prompt_tokens(files[:1]) / DEFAULT_SAFETY_RATIO) + 1
+
+        run_review(files, adapter_override=adapter, max_prompt_tokens=one_file_limit)
+
+        self.assertEqual(len(adapter.calls), 3)
+
+    def test_limit_below_prompt_header_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_review(_files(), adapter_override=RecordingAdapter(), max_prompt_tokens=10)
+
+    def test_predicted_fit_records_outcome(self) -> None:
+        files = _files()
+        adapter = RecordingAdapter(max_prompt_tokens=1_000_000, fail_first=True)
+
+        run_review(files, adapter_override=adapter)
+
+        self.assertEqual(adapter.calls[0].count("FILE: "), 3)
+        self.assertEqual(PREFLIGHT_STATS.snapshot()["predicted_fit_failed"], 1)
+
+    def test_unrelated_failure_does_not_score_the_prediction(self) -> None:
+        adapter = RecordingAdapter(
+            max_prompt_tokens=1_000_000, fail_first=True, first_error="connection reset by peer"
+        )
+
+        run_review(_files(), adapter_override=adapter)
+
+        snapshot = PREFLIGHT_STATS.snapshot()
+        self.assertEqual(snapshot["predicted_fit_failed"], 0)
+        self.assertIsNone(snapshot["accuracy"])
+
+    def test_fallback_disabled_still_attempts_full_review(self) -> None:
+        adapter = RecordingAdapter(max_prompt_tokens=10)
+
+        run_review(_files(), adapter_override=adapter, fallback_enabled=False)
+
+        self.assertEqual(len(adapter.calls), 1)
+        self.assertEqual(PREFLIGHT_STATS.snapshot()["predicted_overflow_succeeded"], 1)
+
+    def test_unknown_limit_keeps_full_review_first(self) -> None:
+        adapter = RecordingAdapter()
+
+        run_review(_files(), adapter_override=adapter)
+
+        self.assertEqual(len(adapter.calls), 1)
+        self.assertEqual(PREFLIGHT_STATS.snapshot()["predicted_overflow"], 0)
+
+    def test_invalid_limit_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_review(_files(), adapter_override=RecordingAdapter(), max_prompt_tokens=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+import asyncio
+import io
+import os
+import threading
+import time
+import unittest
+import urllib.error
+from email.message import Message
+from unittest.mock import patch
+
+from core.review.adapter_registry import get_adapter, invalidate_adapters
+from core.review.adapters.fake import FakeModelAdapter
+from core.review.adapters.ollama_adapter import AdapterRuntimeError
+from core.review.adapters.errors import is_rate_limit_error, retry_after_seconds
+from core.review.adapters.rate_limit import AdapterRateLimiter, RateLimitedModelAdapter, TokenBucket
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _rate_limited_error(retry_after: str = "") -> AdapterRuntimeError:
+    headers = Message()
+    if retry_after:
+        headers["Retry-After"] = retry_after
+    cause = urllib.error.HTTPError("http://llm", 429, "Too Many Requests", headers, io.BytesIO(b""))
+    try:
+        raise AdapterRuntimeError("request failed") from cause
+    except AdapterRuntimeError as exc:
+        return exc
+
+
+class _FlakyAdapter:
+    name = "flaky"
+    model = "m1"
+
+    def __init__(self, errors) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "## AI Review\n"
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_reserve_returns_wait_once_bucket_is_empty(self) -> None:
+        clock = _FakeClock()
+        bucket = TokenBucket(2, clock=clock)
+
+        self.assertEqual([bucket.reserve(1), bucket.reserve(1)], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(1), 30.0)
+        clock.now = 90.0
+        self.assertEqual(bucket.reserve(1), 0.0)
+
+    def test_oversized_request_waits_for_a_full_bucket_only(self) -> None:
+        bucket = TokenBucket(100, clock=_FakeClock())
+        bucket.reserve(100)
+
+        self.assertAlmostEqual(bucket.reserve(10_000), 60.0)
+
+
+class RateLimitedModelAdapterTest(unittest.TestCase):
+    def _wrap(self, inner, **kwargs):
+        clock = _FakeClock()
+        limiter = AdapterRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+        return RateLimitedModelAdapter(inner, limiter), clock
+
+    def test_requests_per_minute_spaces_calls(self) -> None:
+        adapter, clock = self._wrap(FakeModelAdapter(), requests_per_minute=2)
+
+        for _ in range(4):
+            adapter.generate_review("prompt")
+
+        self.assertEqual(clock.sleeps, [30.0, 30.0])
+
+    def test_tokens_per_minute_accounts_for_prompt_and_output(self) -> None:
+        adapter, clock = self._wrap(FakeModelAdapter(), tokens_per_minute=100)
+
+        adapter.generate_review("x" * 200)
+        adapter.generate_review("x" * 200)
+
+        # Two 50-token prompts fit the bucket; only the charged output forces a wait.
+        self.assertEqual(len(clock.sleeps), 1)
+        self.assertGreater(clock.sleeps[0], 0.0)
+
+    def test_rate_limited_prompt_is_requeued_after_retry_after(self) -> None:
+        inner = _FlakyAdapter([_rate_limited_error("7")])
+        adapter, clock = self._wrap(inner, requests_per_minute=600)
+
+        self.assertEqual(adapter.generate_review("prompt"), "## AI Review\n")
+        self.assertEqual(inner.calls, 2)
+        self.assertEqual(clock.sleeps, [7.0])
+        self.assertEqual(adapter.limiter.snapshot()["rate_limited"], 1)
+
+    def test_gives_up_after_max_requeues(self) -> None:
+        inner = _FlakyAdapter([_rate_limited_error() for _ in range(3)])
+        adapter, _ = self._wrap(inner, max_concurrency=1, max_requeues=2)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+        self.assertEqual(inner.calls, 3)
+
+    def test_other_errors_are_not_retried(self) -> None:
+        inner = _FlakyAdapter([AdapterRuntimeError("boom")])
+        adapter, _ = self._wrap(inner, requests_per_minute=10)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+        self.assertEqual(inner.calls, 1)
+
+    def test_attributes_are_read_from_wrapped_adapter(self) -> None:
+        adapter, _ = self._wrap(_FlakyAdapter([]), requests_per_minute=10)
+
+        self.assertEqual(adapter.name, "flaky")
+        self.assertEqual(adapter.model, "m1")
+
+    def test_concurrency_is_capped_across_threads(self) -> None:
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        class _SlowAdapter:
+            name = "slow"
+
+            def generate_review(self, prompt: str) -> str:
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+                return "ok"
+
+        adapter = RateLimitedModelAdapter(_SlowAdapter(), AdapterRateLimiter(max_concurrency=2))
+        threads = [threading.Thread(target=adapter.generate_review, args=("p",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(peak), 6)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_async_requeue_and_concurrency(self) -> None:
+        active = []
+        peak = []
+
+        class _AsyncAdapter:
+            name = "async"
+
+            def __init__(self) -> None:
+                self.errors = [_rate_limited_error("0")]
+
+            def generate_review(self, prompt: str) -> str:
+                raise AssertionError("sync path should not be used")
+
+            async def agenerate_review(self, prompt: str) -> str:
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+                if self.errors:
+                    raise self.errors.pop(0)
+                return prompt
+
+        adapter = RateLimitedModelAdapter(_AsyncAdapter(), AdapterRateLimiter(max_concurrency=2))
+
+        async def run():
+            return await asyncio.gather(*(adapter.agenerate_review(f"p{i}") for i in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [f"p{i}" for i in range(5)])
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(adapter.limiter.rate_limited, 1)
+
+
+class RateLimitErrorTest(unittest.TestCase):
+    def test_detects_status_and_retry_after_through_cause_chain(self) -> None:
+        exc = _rate_limited_error("3")
+
+        self.assertTrue(is_rate_limit_error(exc))
+        self.assertEqual(retry_after_seconds(exc), 3.0)
+        self.assertFalse(is_rate_limit_error(AdapterRuntimeError("boom")))
+
+    def test_detects_sdk_rate_limit_errors_by_name(self) -> None:
+        class RateLimitError(Exception):
+            pass
+
+        self.assertTrue(is_rate_limit_error(RateLimitError("slow down")))
+
+
+class RateLimitEnvTest(unittest.TestCase):
+    def setUp(self) -> None:
+        invalidate_adapters()
+        self.addCleanup(invalidate_adapters)
+
+    def test_registry_wraps_adapter_when_limits_are_set(self) -> None:
+        env = {
+            "OLLAMA_BASE_URL": "http://127.0.0.1:11434",
+            "OLLAMA_MODEL": "llama3",
+            "OLLAMA_RPM": "30",
+            "OLLAMA_MAX_CONCURRENCY": "2",
+        }
+        with patch.dict(os.environ, env, clear=False):
+            adapter = get_adapter("ollama")
+
+        # The default circuit breaker and retry policy wrap the limiter.
+        self.assertIsInstance(adapter.inner.inner, RateLimitedModelAdapter)
+        self.assertEqual(adapter.model, "llama3")
+        self.assertEqual(adapter.limiter.requests_per_minute, 30)
+        self.assertIsNone(adapter.limiter.tokens_per_minute)
+        self.assertEqual(adapter.limiter.max_concurrency, 2)
+
+    def test_unset_limits_leave_adapter_unwrapped(self) -> None:
+        self.assertIsNone(AdapterRateLimiter.from_env("PR_REVIEW_TEST_UNSET"))
+
+    def test_invalid_limits_are_rejected(self) -> None:
+        for value in ("fast", "0"):
+            with self.subTest(value=value):
+                with patch.dict(os.environ, {"PR_REVIEW_TEST_TPM": value}):
+                    with self.assertRaises(ValueError):
+                        AdapterRateLimiter.from_env("PR_REVIEW_TEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.diff.compact import CompactChanges
+from core.diff.filters import filter_diff_files
+from core.diff.parse_diff import iter_parse_diff, parse_diff
+from core.diff.read_diff import DiffReadError, map_diff_file
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class MapDiffFileTest(unittest.TestCase):
+    def _write(self, data: bytes) -> str:
+        handle = tempfile.NamedTemporaryFile(suffix=".diff", delete=False)
+        with handle:
+            handle.write(data)
+        self.addCleanup(Path(handle.name).unlink)
+        return handle.name
+
+    def test_yields_raw_byte_lines(self) -> None:
+        path = self._write(b"diff --git a/a.py b/a.py\n@@ -1 +1 @@\n+x\n")
+
+        with map_diff_file(path) as lines:
+            collected = list(lines)
+
+        self.assertEqual(collected, [b"diff --git a/a.py b/a.py\n", b"@@ -1 +1 @@\n", b"+x\n"])
+
+    def test_skips_utf8_bom(self) -> None:
+        path = str(FIXTURES / "raw_small.diff")
+
+        with map_diff_file(path) as lines:
+            files = list(iter_parse_diff(lines))
+
+        self.assertEqual([f.path for f in files], ["src/app.py"])
+
+    def test_empty_file_yields_no_lines(self) -> None:
+        path = self._write(b"")
+
+        with map_diff_file(path) as lines:
+            self.assertEqual(list(lines), [])
+
+    def test_missing_file_raises_read_error(self) -> None:
+        with self.assertRaises(DiffReadError):
+            with map_diff_file(str(FIXTURES / "does-not-exist.diff")):
+                pass
+
+    def test_compact_parse_keeps_content_undecoded(self) -> None:
+        raw = (FIXTURES / "raw_large.diff").read_text(encoding="utf-8-sig")
+        path = self._write(raw.encode("utf-8"))
+
+        with map_diff_file(path) as lines:
+            files = list(iter_parse_diff(lines, compact=True))
+
+        changes = files[0].hunks[0].changes
+        self.assertIsInstance(changes, CompactChanges)
+        self.assertIsInstance(changes._content, bytes)
+        self.assertEqual(files, parse_diff(raw))
+
+    def test_invalid_utf8_is_replaced_on_access(self) -> None:
+        path = self._write(
+            b"diff --git a/yarn.lock b/yarn.lock\n@@ -1 +1 @@\n+\xff\xfe\n"
+            b"diff --git a/src/a.py b/src/a.py\n@@ -1 +1 @@\n+caf\xc3\xa9\n"
+        )
+
+        with map_diff_file(path) as lines:
+            files = filter_diff_files(iter_parse_diff(lines, compact=True))
+
+        self.assertEqual([f.path for f in files], ["src/a.py"])
+        self.assertEqual(files[0].hunks[0].changes[0].content, "café")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import asyncio
+import io
+import os
+import socket
+import unittest
+import urllib.error
+from email.message import Message
+from unittest.mock import patch
+
+from core.review.adapters.errors import is_transient_error
+from core.review.adapters.fake import FakeModelAdapter
+from core.review.adapters.openai_compat_adapter import AdapterRuntimeError
+from core.review.adapters.rate_limit import AdapterRateLimiter, RateLimitedModelAdapter
+from core.review.adapters.retry import RetryingModelAdapter, RetryPolicy, with_retry
+
+
+def _http_failure(status: int, retry_after: str = "") -> AdapterRuntimeError:
+    headers = Message()
+    if retry_after:
+        headers["Retry-After"] = retry_after
+    cause = urllib.error.HTTPError("http://llm", status, "failed", headers, io.BytesIO(b""))
+    try:
+        raise AdapterRuntimeError(f"request failed: HTTP {status}") from cause
+    except AdapterRuntimeError as exc:
+        return exc
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _ScriptedAdapter:
+    name = "scripted"
+    model = "m1"
+
+    def __init__(self, errors) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate_review(self, prompt: str) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "## AI Review\n"
+
+
+class RetryingModelAdapterTest(unittest.TestCase):
+    def _wrap(self, inner, **policy):
+        clock = _FakeClock()
+        adapter = RetryingModelAdapter(
+            inner, RetryPolicy(**policy), clock=clock, sleep=clock.sleep, rng=lambda: 1.0
+        )
+        return adapter, clock
+
+    def test_transient_failures_are_retried_with_backoff(self) -> None:
+        inner = _ScriptedAdapter([_http_failure(502), TimeoutError("read timed out")])
+        adapter, clock = self._wrap(inner)
+
+        self.assertEqual(adapter.generate_review("prompt"), "## AI Review\n")
+        self.assertEqual(inner.calls, 3)
+        self.assertEqual(clock.sleeps, [0.5, 1.0])
+        self.assertEqual(adapter.snapshot()["retries"], 2)
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(base_delay_seconds=1.0, max_delay_seconds=4.0)
+
+        self.assertEqual(policy.backoff(10, rng=lambda: 1.0), 4.0)
+        self.assertEqual(policy.backoff(2, rng=lambda: 0.25), 0.5)
+
+    def test_retry_after_overrides_backoff(self) -> None:
+        inner = _ScriptedAdapter([_http_failure(503, retry_after="7")])
+        adapter, clock = self._wrap(inner)
+
+        adapter.generate_review("prompt")
+
+        self.assertEqual(clock.sleeps, [7.0])
+
+    def test_permanent_failures_are_not_retried(self) -> None:
+        for error in (_http_failure(400), AdapterRuntimeError("Prompt must not be empty.")):
+            with self.subTest(error=str(error)):
+                inner = _ScriptedAdapter([error])
+                adapter, _ = self._wrap(inner)
+
+                with self.assertRaises(AdapterRuntimeError):
+                    adapter.generate_review("prompt")
+                self.assertEqual(inner.calls, 1)
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        inner = _ScriptedAdapter([_http_failure(502) for _ in range(5)])
+        adapter, _ = self._wrap(inner, max_attempts=3)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+        self.assertEqual(inner.calls, 3)
+        self.assertEqual(adapter.snapshot(), {"max_attempts": 3, "retries": 2, "gave_up": 1})
+
+    def test_deadline_stops_retries_that_would_overrun(self) -> None:
+        inner = _ScriptedAdapter([_http_failure(429, retry_after="30"), _http_failure(502)])
+        adapter, clock = self._wrap(inner, max_attempts=5, deadline_seconds=10.0)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(clock.sleeps, [])
+
+    def test_rate_limits_are_left_to_an_inner_rate_limiter(self) -> None:
+        inner = _ScriptedAdapter([_http_failure(429), _http_failure(502)])
+        limited = RateLimitedModelAdapter(inner, AdapterRateLimiter(max_requeues=0))
+        adapter, clock = self._wrap(limited)
+
+        with self.assertRaises(AdapterRuntimeError):
+            adapter.generate_review("prompt")
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual(clock.sleeps, [])
+
+        # Other transient failures are still retried, and without a limiter 429s are too.
+        self.assertEqual(adapter.generate_review("prompt"), "## AI Review\n")
+        self.assertEqual(inner.calls, 3)
+        unlimited, _ = self._wrap(_ScriptedAdapter([_http_failure(429)]))
+        self.assertEqual(unlimited.generate_review("prompt"), "## AI Review\n")
+
+    def test_attributes_are_read_from_wrapped_adapter(self) -> None:
+        adapter, _ = self._wrap(_ScriptedAdapter([]))
+
+        self.assertEqual((adapter.name, adapter.model), ("scripted", "m1"))
+
+    def test_async_retries_and_deadline(self) -> None:
+        class _AsyncAdapter:
+            name = "async"
+
+            def __init__(self, delays) -> None:
+                self.delays = list(delays)
+                self.calls = 0
+
+            def generate_review(self, prompt: str) -> str:
+                raise AssertionError("sync path should not be used")
+
+            async def agenerate_review(self, prompt: str) -> str:
+                self.calls += 1
+                delay = self.delays.pop(0)
+                if delay is None:
+                    raise ConnectionResetError("reset by peer")
+                await asyncio.sleep(delay)
+                return prompt
+
+        policy = RetryPolicy(base_delay_seconds=0.0, max_delay_seconds=0.0, deadline_seconds=0.2)
+        flaky = _AsyncAdapter([None, 0.0])
+        self.assertEqual(asyncio.run(RetryingModelAdapter(flaky, policy).agenerate_review("p")), "p")
+        self.assertEqual(flaky.calls, 2)
+
+        hung = _AsyncAdapter([5.0, 5.0])
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(RetryingModelAdapter(hung, policy).agenerate_review("p"))
+        self.assertEqual(hung.calls, 1)
+
+
+class TransientErrorTest(unittest.TestCase):
+    def test_classification(self) -> None:
+        class APITimeoutError(Exception):
+            pass
+
+        transient = [
+            _http_failure(429),
+            _http_failure(504),
+            TimeoutError(),
+            ConnectionRefusedError(),
+            urllib.error.URLError(socket.timeout("timed out")),
+            APITimeoutError(),
+        ]
+        permanent = [
+            _http_failure(401),
+            _http_failure(404),
+            _http_failure(409),
+            ValueError("bad"),
+            AdapterRuntimeError("no text"),
+        ]
+        for exc in transient:
+            with self.subTest(exc=repr(exc)):
+                self.assertTrue(is_transient_error(exc))
+        for exc in permanent:
+            with self.subTest(exc=repr(exc)):
+                self.assertFalse(is_transient_error(exc))
+
+
+class RetryPolicyEnvTest(unittest.TestCase):
+    def test_reads_policy_from_env(self) -> None:
+        env = {"PR_REVIEW_TEST_MAX_ATTEMPTS": "5", "PR_REVIEW_TEST_RETRY_DEADLINE_SECONDS": "90"}
+        with patch.dict(os.environ, env):
+            policy = RetryPolicy.from_env("PR_REVIEW_TEST")
+
+        self.assertEqual((policy.max_attempts, policy.deadline_seconds), (5, 90.0))
+
+    def test_defaults_and_single_attempt_opt_out(self) -> None:
+        adapter = FakeModelAdapter()
+
+        self.assertIsInstance(with_retry(adapter, "PR_REVIEW_TEST_UNSET"), RetryingModelAdapter)
+        with patch.dict(os.environ, {"PR_REVIEW_TEST_MAX_ATTEMPTS": "1"}):
+            self.assertIs(with_retry(adapter, "PR_REVIEW_TEST"), adapter)
+
+    def test_invalid_env_is_rejected(self) -> None:
+        for name, value in (("MAX_ATTEMPTS", "0"), ("MAX_ATTEMPTS", "x"), ("RETRY_DEADLINE_SECONDS", "-1")):
+            with self.subTest(name=name, value=value):
+                with patch.dict(os.environ, {f"PR_REVIEW_TEST_{name}": value}):
+                    with self.assertRaises(ValueError):
+                        RetryPolicy.from_env("PR_REVIEW_TEST")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import http.client
+import io
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from core.review import cli, client
+from core.review.adapter_registry import ADAPTER_REGISTRY
+from core.review.adapters.fake import FakeModelAdapter
+from core.review.adapters.retry import RetryingModelAdapter, RetryPolicy
+from core.review.client import ReviewServerError, request_server, submit_review
+from core.review.jobs import ReviewJob, ReviewJobRunner
+from core.review.server import create_server
+
+FIXTURE = Path(__file__).parent / "fixtures" / "raw_small.diff"
+RAW_DIFF = FIXTURE.read_text(encoding="utf-8")
+
+
+class ReviewJobTest(unittest.TestCase):
+    def test_from_dict_applies_defaults(self) -> None:
+        job = ReviewJob.from_dict({"diff": RAW_DIFF, "pr_title": "Add hello"})
+
+        self.assertEqual(job.adapter, "fake")
+        self.assertEqual(job.pr_title, "Add hello")
+        self.assertIsNone(job.max_prompt_tokens)
+        self.assertEqual(ReviewJob.from_dict({"diff": RAW_DIFF, "deadline_seconds": 30}).deadline_seconds, 30)
+
+    def test_from_dict_rejects_invalid_jobs(self) -> None:
+        invalid = [
+            [],
+            {},
+            {"diff": "   "},
+            {"diff": RAW_DIFF, "unexpected": 1},
+            {"diff": RAW_DIFF, "max_concurrency": True},
+            {"diff": RAW_DIFF, "max_concurrency": 0},
+            {"diff": RAW_DIFF, "pr_title": 3},
+            {"diff": RAW_DIFF, "input_format": "xml"},
+            {"diff": RAW_DIFF, "chunk_planner": "random"},
+            {"diff": RAW_DIFF, "deadline_seconds": 0},
+            {"diff": RAW_DIFF, "chunk_order": "size"},
+            {"diff": RAW_DIFF, "deadline_seconds": True},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    ReviewJob.from_dict(data)
+
+
+class _ServerTestCase(unittest.TestCase):
+    def _start(self, **kwargs) -> ReviewJobRunner:
+        runner = ReviewJobRunner(workers=2)
+        server = create_server(runner, port=0, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(runner.close)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.server = server
+        return runner
+
+
+class ReviewServerHttpTest(_ServerTestCase):
+    def setUp(self) -> None:
+        self.runner = self._start()
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def test_review_matches_cli_output(self) -> None:
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            cli.main(["--from-file", str(FIXTURE), "--pr-title", "Add hello"])
+
+        markdown = submit_review({"diff": RAW_DIFF, "pr_title": "Add hello"}, url=self.url)
+
+        self.assertEqual(markdown, stdout.getvalue())
+
+    def test_health_and_metrics(self) -> None:
+        submit_review({"diff": RAW_DIFF}, url=self.url)
+
+        self.assertEqual(request_server("GET", "/health", url=self.url), {"status": "ok"})
+        metrics = request_server("GET", "/metrics", url=self.url)
+        self.assertEqual(metrics["jobs"]["completed"], 1)
+        self.assertEqual(metrics["jobs"]["in_flight"], 0)
+
+    def test_invalid_jobs_are_rejected_with_400(self) -> None:
+        jobs = [{"diff": RAW_DIFF, "adapter": "does-not-exist"}, {"diff": "[not json"}, {"pr_title": "x"}]
+        for job in jobs:
+            with self.subTest(job=job):
+                with self.assertRaises(ReviewServerError) as ctx:
+                    submit_review(job, url=self.url)
+                self.assertEqual(ctx.exception.status, 400)
+
+    def test_adapter_stays_warm_across_jobs(self) -> None:
+        built = []
+
+        def factory():
+            built.append(FakeModelAdapter(name="warm"))
+            return built[-1]
+
+        with patch.dict(ADAPTER_REGISTRY._factories, {"warm": factory}):
+            self.addCleanup(ADAPTER_REGISTRY.invalidate, "warm")
+            for _ in range(3):
+                submit_review({"diff": RAW_DIFF, "adapter": "warm"}, url=self.url)
+
+        self.assertEqual(len(built), 1)
+
+    def test_metrics_report_adapter_wrapper_counters(self) -> None:
+        def factory():
+            return RetryingModelAdapter(FakeModelAdapter(name="layered"), RetryPolicy())
+
+        with patch.dict(ADAPTER_REGISTRY._factories, {"layered": factory}):
+            self.addCleanup(ADAPTER_REGISTRY.invalidate, "layered")
+            submit_review({"diff": RAW_DIFF, "adapter": "layered"}, url=self.url)
+            metrics = request_server("GET", "/metrics", url=self.url)
+
+        self.assertEqual(metrics["adapters"]["layered"]["retry"]["retries"], 0)
+        self.assertNotIn("fake", metrics["adapters"])
+
+    def _raw_post(self, headers) -> int:
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        self.addCleanup(conn.close)
+        body = json.dumps({"diff": RAW_DIFF}).encode("utf-8")
+        conn.putrequest("POST", "/review", skip_host=True)
+        for name, value in {"Content-Length": str(len(body)), **headers}.items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        return conn.getresponse().status
+
+    def test_jobs_must_be_json(self) -> None:
+        host = "127.0.0.1:{}".format(self.server.server_address[1])
+
+        self.assertEqual(self._raw_post({"Host": host, "Content-Type": "text/plain"}), 415)
+        self.assertEqual(self._raw_post({"Host": host}), 415)
+        with_charset = {"Host": host, "Content-Type": "application/json; charset=utf-8"}
+        self.assertEqual(self._raw_post(with_charset), 200)
+
+    def test_non_loopback_host_header_is_rejected(self) -> None:
+        for host in ("evil.example:8765", "127.0.0.1.evil.example", ""):
+            with self.subTest(host=host):
+                self.assertEqual(self._raw_post({"Host": host, "Content-Type": "application/json"}), 403)
+        self.assertEqual(self._raw_post({"Host": "localhost", "Content-Type": "application/json"}), 200)
+
+    def test_non_loopback_host_is_refused(self) -> None:
+        with self.assertRaises(ValueError):
+            create_server(self.runner, host="0.0.0.0", port=0)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "UNIX sockets only")
+class ReviewServerUnixSocketTest(_ServerTestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, "review.sock")
+        self._start(socket_path=self.socket_path)
+
+    def test_socket_is_private_to_owner(self) -> None:
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_client_cli_submits_over_socket(self) -> None:
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            code = client.main(["--socket", self.socket_path, "--from-file", str(FIXTURE)])
+
+        self.assertEqual(code, 0)
+        self.assertIn("## AI Review", stdout.getvalue())
+        self.assertIn("`src/app.py`", stdout.getvalue())
+
+
+class ClientErrorTest(unittest.TestCase):
+    def test_unreachable_server_is_recoverable(self) -> None:
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            code = client.main(["--server", "http://127.0.0.1:9", "--from-file", str(FIXTURE)])
+
+        self.assertEqual(code, cli.EXIT_RECOVERABLE)
+        self.assertIn("review server unavailable", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import time
+import unittest
+from typing import List
+
+from core.diff.types import Change, ChangeType, DiffFile, DiffHunk
+from core.review.pipeline import plan_fallback_chunks
+from core.review.risk import (
+    LOW_RISK_PATH_FACTOR,
+    SENSITIVE_PATH_FACTOR,
+    HunkScores,
+    detect_language,
+    order_chunks_by_risk,
+    order_files_by_risk,
+    path_factor,
+    score_chunk,
+    score_file,
+    score_hunk,
+)
+
+
+def _hunk(added: List[str], removed: int = 0) -> DiffHunk:
+    changes = [Change(ChangeType.REMOVE, f"old {idx}") for idx in range(removed)]
+    changes += [Change(ChangeType.ADD, line) for line in added]
+    return DiffHunk(old_start=1, old_length=removed, new_start=1, new_length=len(added), changes=changes)
+
+
+def _file(path: str, added: List[str], removed: int = 0) -> DiffFile:
+    return DiffFile(path=path, hunks=[_hunk(added, removed)])
+
+
+def _plan(files: List[DiffFile], max_changes_per_chunk: int) -> List[List[DiffFile]]:
+    planned = plan_fallback_chunks(
+        files,
+        chunk_planner="greedy",
+        chunk_order="risk",
+        prompt_limit=None,
+        max_changes_per_chunk=max_changes_per_chunk,
+        repository="acme/repo",
+        base_ref="main",
+        head_ref="feature",
+        pr_title="",
+        pr_body="",
+    )
+    return [chunk for _, chunk in planned]
+
+
+class RiskScoreTest(unittest.TestCase):
+    def test_path_heuristics(self) -> None:
+        self.assertEqual(path_factor("src/auth/login.py"), SENSITIVE_PATH_FACTOR)
+        self.assertEqual(path_factor(".github/workflows/ci.yml"), SENSITIVE_PATH_FACTOR)
+        self.assertEqual(path_factor("tests/review/test_cli.py"), LOW_RISK_PATH_FACTOR)
+        self.assertEqual(path_factor("docs/guide.md"), LOW_RISK_PATH_FACTOR)
+        self.assertEqual(path_factor("src/core/review/pipeline.py"), 1.0)
+        self.assertEqual(path_factor("src/oauth/client.py"), SENSITIVE_PATH_FACTOR)
+        # "author" is not "auth".
+        self.assertEqual(path_factor("src/authors.py"), 1.0)
+
+    def test_language_from_extension_or_name(self) -> None:
+        self.assertEqual(detect_language("src/app.py"), "python")
+        self.assertEqual(detect_language("deploy/Dockerfile"), "dockerfile")
+        self.assertEqual(detect_language("package-lock.json"), "lockfile")
+        self.assertIsNone(detect_language("LICENSE"))
+
+    def test_risky_keywords_in_added_lines_raise_the_score(self) -> None:
+        plain = score_hunk(_hunk(["    return total"]), path="src/app.py")
+        risky_lines = (
+            "    password = request.form['password']",
+            "    subprocess.run(cmd, shell=True)",
+            "    cursor.execute('DELETE FROM users WHERE id = ' + user_id)",
+        )
+        for line in risky_lines:
+            with self.subTest(line=line):
+                self.assertGreater(score_hunk(_hunk([line]), path="src/app.py"), plain)
+        # Identifiers that merely contain a keyword do not count.
+        self.assertEqual(score_hunk(_hunk(["    executor = pool"]), path="src/app.py"), plain)
+
+    def test_churn_raises_the_score(self) -> None:
+        small = score_hunk(_hunk(["x = 1"]), path="src/app.py")
+        large = score_hunk(_hunk(["x = 1"] * 20, removed=20), path="src/app.py")
+
+        self.assertGreater(large, small)
+
+    def test_auth_code_outranks_tests_and_docs(self) -> None:
+        files = [
+            _file("docs/usage.md", ["Set the password in the config."]),
+            _file("tests/test_login.py", ["    assert login(user, password)"]),
+            _file("src/util.py", ["    return value"]),
+            _file("src/auth/session.py", ["    if not check_password(user, password):"]),
+        ]
+
+        ordered = [file_obj.path for file_obj in order_files_by_risk(files)]
+
+        self.assertEqual(ordered[0], "src/auth/session.py")
+        self.assertLess(ordered.index("src/util.py"), ordered.index("docs/usage.md"))
+
+    def test_ties_keep_input_order(self) -> None:
+        chunks = [[_file(f"src/m{idx}.py", ["x = 1"])] for idx in range(5)]
+
+        self.assertEqual(order_chunks_by_risk(chunks), chunks)
+
+    def test_chunks_are_scored_by_their_own_hunks(self) -> None:
+        util = _file("src/util.py", ["    return value"])
+        session = _file("src/session.py", ["    if not check_password(user, password):"])
+        scores = HunkScores()
+        chunks = [[util], [session]]
+
+        self.assertEqual(score_chunk(chunks[1], scores), score_file(session))
+        self.assertEqual(order_chunks_by_risk(chunks, scores), [chunks[1], chunks[0]])
+
+    def test_risky_piece_of_a_split_file_is_reviewed_first(self) -> None:
+        plain = [
+            DiffHunk(
+                old_start=idx * 10 + 1,
+                old_length=0,
+                new_start=idx * 10 + 1,
+                new_length=3,
+                changes=[Change(ChangeType.ADD, f"    total_{idx} += {line}") for line in range(3)],
+            )
+            for idx in range(4)
+        ]
+        risky = DiffHunk(
+            old_start=100,
+            old_length=0,
+            new_start=100,
+            new_length=1,
+            changes=[Change(ChangeType.ADD, "    subprocess.run(cmd, shell=True)")],
+        )
+        files = [DiffFile(path="src/app.py", hunks=plain + [risky])]
+
+        chunks = _plan(files, max_changes_per_chunk=3)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertIs(chunks[0][0].hunks[-1], risky)
+        first, rest = score_chunk(chunks[0]), [score_chunk(chunk) for chunk in chunks[1:]]
+        self.assertGreater(first, max(rest))
+
+    def test_large_diff_is_planned_quickly(self) -> None:
+        # Distinct identifiers on every line, as in real diffs, so the token cache cannot help.
+        lines = [
+            "    password_{idx}_{line} = request.args['pw_{line}']",
+            "    result_{idx}_{line} = compute_{line}(arg_{idx}, value_{line})",
+            "    cursor_{idx}.execute('SELECT * FROM users WHERE id=' + uid_{line})",
+            "    return value_{idx}_{line}",
+        ]
+        # 1000 files of five 20-line hunks; every file is split across chunks.
+        files = [
+            DiffFile(
+                path=f"src/pkg{idx}/module.py",
+                hunks=[
+                    _hunk([lines[line % 4].format(idx=idx, line=line) for line in range(start, start + 20)])
+                    for start in range(0, 100, 20)
+                ],
+            )
+            for idx in range(1000)
+        ]
+
+        started = time.perf_counter()
+        chunks = _plan(files, max_changes_per_chunk=40)
+        elapsed = time.perf_counter() - started
+
+        # 100k added lines, each hunk scored once.
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(len(chunks), 3000)
+        self.assertEqual(score_file(files[0]), score_file(files[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()